@@ -0,0 +1,40 @@
+import argparse
+import time
+from pydantic_core import to_json
+from src.utils.data_factory import generate_pet, generate_pets
+
+
+def timed(label: str, func) -> float:
+    started = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - started
+    print(f"  {label:<45} {seconds:8.3f} s")
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-pet factory vs columnar generate_pets")
+    parser.add_argument("--size", type=int, default=1_000_000, help="Pets in the columnar dataset")
+    parser.add_argument("--sample", type=int, default=100_000, help="Pets for the per-pet baseline and materialization")
+    args = parser.parse_args()
+
+    print(f"generate_pet x {args.sample}:")
+    baseline = timed("build validated Pets", lambda: [generate_pet() for _ in range(args.sample)])
+    timed("build + to_json each", lambda: [to_json(generate_pet()) for _ in range(args.sample)])
+
+    print(f"generate_pets({args.size}):")
+    pets = None
+
+    def build():
+        nonlocal pets
+        pets = generate_pets(args.size, seed=1)
+
+    columns = timed("build columns", build)
+    timed("JSON array bytes", pets.to_json)
+    materialize = timed(f"materialize first {args.sample} Pets", lambda: pets[:args.sample])
+    print(f"Per-pet cost: generate_pet {baseline / args.sample * 1e6:.1f} us, "
+          f"columns {columns / args.size * 1e6:.2f} us, materialized {materialize / args.sample * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import json
+import timeit
+from pydantic_core import to_json
+from src.http.codec import available_codecs, get_codec
+from src.models.pet import Pet, Category, Tag
+from src.utils.data_factory import generate_pet
+
+
+def build_payload(size: int) -> list[Pet]:
+    return [
+        generate_pet(
+            pet_id=pet_id,
+            status="available",
+            category=Category(id=pet_id % 10, name="Dogs"),
+            tags=[Tag(id=1, name="friendly"), Tag(id=2, name="cute")]
+        )
+        for pet_id in range(1, size + 1)
+    ]
+
+
+def bench(label: str, func, number: int) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    print(f"  {label:<40} {seconds * 1000:10.3f} ms")
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON codec micro-benchmark on find_by_status sized payloads")
+    parser.add_argument("--size", type=int, default=20000, help="Number of pets in the payload")
+    parser.add_argument("--number", type=int, default=5, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    pets = build_payload(args.size)
+    dicts = [pet.model_dump() for pet in pets]
+    body = json.dumps(dicts).encode("utf-8")
+    print(f"Payload: {args.size} pets, {len(body) / 1024:.0f} KiB")
+
+    print("Encode single pet body (request path):")
+    pet = pets[0]
+    bench("json.dumps(pet.model_dump())", lambda: json.dumps(pet.model_dump()).encode(), args.number * 1000)
+    bench("pydantic_core.to_json(pet)", lambda: to_json(pet), args.number * 1000)
+
+    results = {}
+    for name in available_codecs():
+        codec = get_codec(name)
+        print(f"{name}:")
+        encode = bench("encode list", lambda: codec.dumps(dicts), args.number)
+        decode = bench("decode list", lambda: codec.loads(memoryview(body)), args.number)
+        results[name] = (encode, decode)
+
+    baseline_encode, baseline_decode = results["json"]
+    print("Speed-up vs stdlib json:")
+    for name, (encode, decode) in results.items():
+        print(f"  {name:<10} encode x{baseline_encode / encode:5.2f}  decode x{baseline_decode / decode:5.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import List
+from src.contracts.validators import type_adapter
+from src.models.pet import Pet
+from src.models.pet_batch import PetBatch
+from src.utils.data_factory import generate_pets
+
+
+def measured(label: str, func):
+    # Bytes still allocated once func returns, i.e. what holding its result costs.
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"  {label:<40} {size / 2 ** 20:8.1f} MiB {seconds:8.3f} s")
+    return result, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory held by list[Pet] vs PetBatch for a large result set")
+    parser.add_argument("--size", type=int, default=100_000, help="Pets in the result set")
+    args = parser.parse_args()
+
+    # Same shape as a findByStatus response: Pets with categories, tags and photo URLs.
+    body = generate_pets(args.size, seed=1, start_id=1).to_json()
+    print(f"{args.size} pets:")
+    pets, list_size = measured("list[Pet] (validate_json)", lambda: type_adapter(List[Pet]).validate_json(body))
+    batch, batch_size = measured("PetBatch.from_pets", lambda: PetBatch.from_pets(pets))
+    print(f"  PetBatch columns {batch.column_bytes / len(batch):.1f} B/pet, "
+          f"list[Pet] {list_size / len(pets):.0f} B/pet, x{list_size / batch_size:.1f} smaller")
+
+    print("filters:")
+    started = time.perf_counter()
+    sold = batch.with_status("sold")
+    print(f"  {'PetBatch.with_status':<40} {time.perf_counter() - started:8.3f} s ({len(sold)} pets)")
+    started = time.perf_counter()
+    sold = [pet for pet in pets if pet.status == "sold"]
+    print(f"  {'list comprehension':<40} {time.perf_counter() - started:8.3f} s ({len(sold)} pets)")
+    started = time.perf_counter()
+    cute = batch.with_tag("cute")
+    print(f"  {'PetBatch.with_tag':<40} {time.perf_counter() - started:8.3f} s ({len(cute)} pets)")
+    started = time.perf_counter()
+    cute = [pet for pet in pets if any(tag.name == "cute" for tag in pet.tags or ())]
+    print(f"  {'list comprehension':<40} {time.perf_counter() - started:8.3f} s ({len(cute)} pets)")
+
+    del pets
+    measured("PetBatch.to_pets", batch.to_pets)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import timeit
+from src.api.pet_api import PetApi
+from src.http.client import HttpClient
+from src.http.transport import TRANSPORTS, WSGITransport, create_transport
+from src.server.petstore_app import PetstoreApp
+from src.server.petstore_server import LocalPetstore
+from src.utils.data_factory import generate_pet
+
+
+def bench(label: str, func, number: int) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    print(f"  {label:<40} {seconds * 1_000_000:10.1f} us")
+    return seconds
+
+
+def run(label: str, client: HttpClient, number: int, payload_size: int) -> float:
+    with client:
+        api = PetApi(client)
+        pet = api.create_pet(generate_pet(pet_id=1, status="available"))
+        print(f"{label}:")
+        get = bench("get_pet", lambda: api.get_pet(pet.id), number)
+        bench(f"find_by_status ({payload_size} pets)", lambda: api.find_by_status("sold"), max(1, number // 20))
+        return get
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PetApi round-trip per transport against the local Petstore stand-in")
+    parser.add_argument("--number", type=int, default=500, help="get_pet calls per measurement")
+    parser.add_argument("--payload-size", type=int, default=1000, help="Pets returned by findByStatus")
+    args = parser.parse_args()
+
+    results = {}
+    with LocalPetstore(payload_size=args.payload_size) as server:
+        for name in TRANSPORTS:
+            try:
+                transport = create_transport(name)
+            except ImportError as e:
+                print(f"{name}: skipped ({e})")
+                continue
+            results[name] = run(name, HttpClient(server.base_url, transport=transport), args.number, args.payload_size)
+
+    app = PetstoreApp(payload_size=args.payload_size)
+    results["wsgi"] = run("wsgi (in-process)", HttpClient("http://petstore.local/v2", transport=WSGITransport(app)), args.number, args.payload_size)
+
+    baseline = results["requests"]
+    print("get_pet speed-up vs requests:")
+    for name, seconds in results.items():
+        print(f"  {name:<10} x{baseline / seconds:5.2f}")
+
+
+if __name__ == "__main__":
+    main()
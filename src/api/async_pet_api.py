@@ -0,0 +1,34 @@
+from typing import List, Union
+from pydantic_core import to_json
+from src.api.pet_api import BasePetApi
+from src.config.settings import settings
+from src.contracts.modes import ValidationMode
+from src.http.async_client import AsyncHttpClient
+from src.models.pet import Pet
+from src.models.api_response import ApiResponse
+
+
+class AsyncPetApi(BasePetApi):
+    def __init__(self, client: AsyncHttpClient = None, validation: Union[str, ValidationMode] = None):
+        self.client = client or AsyncHttpClient()
+        self.validation = ValidationMode.parse(validation or settings.validation_mode)
+
+    async def create_pet(self, pet: Pet) -> Pet:
+        response = await self.client.request("POST", "/pet", content=to_json(pet))
+        return self._parse_pet(response)
+
+    async def get_pet(self, pet_id: int) -> Pet:
+        response = await self.client.request("GET", f"/pet/{pet_id}")
+        return self._parse_get_pet(response, pet_id)
+
+    async def update_pet(self, pet: Pet) -> Pet:
+        response = await self.client.request("PUT", "/pet", content=to_json(pet))
+        return self._parse_pet(response)
+
+    async def delete_pet(self, pet_id: int) -> ApiResponse:
+        response = await self.client.request("DELETE", f"/pet/{pet_id}")
+        return self._parse_delete_pet(response, pet_id)
+
+    async def find_by_status(self, status: str) -> List[Pet]:
+        response = await self.client.request("GET", "/pet/findByStatus", params={"status": status})
+        return self._parse_pet_list(response)
@@ -0,0 +1,70 @@
+from typing import FrozenSet, List, Optional, Tuple, Union
+from src.api.cache import TTLCache, MISSING
+from src.api.pet_api import PetApi
+from src.config.settings import settings
+from src.contracts.modes import ValidationMode
+from src.http.client import HttpClient
+from src.models.pet import Pet
+from src.models.api_response import ApiResponse
+
+
+class CachedPetApi(PetApi):
+    def __init__(
+        self,
+        client: HttpClient = None,
+        cache: TTLCache = None,
+        bypass: bool = None,
+        validation: Union[str, ValidationMode] = None
+    ):
+        super().__init__(client, validation)
+        self.cache = cache or TTLCache()
+        self.bypass = settings.cache_bypass if bypass is None else bypass
+
+    def get_pet(self, pet_id: int) -> Pet:
+        if self.bypass:
+            return super().get_pet(pet_id)
+        key = ("pet", pet_id)
+        pet = self.cache.get(key)
+        if pet is MISSING:
+            pet = super().get_pet(pet_id)
+            self.cache.set(key, pet)
+        return pet
+
+    def find_by_status(self, status: str) -> List[Pet]:
+        if self.bypass:
+            return super().find_by_status(status)
+        key = ("status", status)
+        entry: Tuple[Tuple[Pet, ...], FrozenSet[int]] = self.cache.get(key)
+        if entry is MISSING:
+            pets = tuple(super().find_by_status(status))
+            entry = (pets, frozenset(pet.id for pet in pets))
+            self.cache.set(key, entry)
+        return list(entry[0])
+
+    def create_pet(self, pet: Pet) -> Pet:
+        try:
+            return super().create_pet(pet)
+        finally:
+            self._invalidate(pet.id, pet.status)
+
+    def update_pet(self, pet: Pet) -> Pet:
+        try:
+            return super().update_pet(pet)
+        finally:
+            self._invalidate(pet.id, pet.status)
+
+    def delete_pet(self, pet_id: int) -> ApiResponse:
+        try:
+            return super().delete_pet(pet_id)
+        finally:
+            self._invalidate(pet_id)
+
+    def _invalidate(self, pet_id: int, status: Optional[str] = None) -> None:
+        statuses = {status}
+        previous = self.cache.peek(("pet", pet_id))
+        if previous is not MISSING:
+            statuses.add(previous.status)
+        self.cache.invalidate(("pet", pet_id))
+        self.cache.invalidate_where(
+            lambda key, value: key[0] == "status" and (key[1] in statuses or pet_id in value[1])
+        )
@@ -1,65 +1,117 @@
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, List, TypeVar, Union
 from pydantic import ValidationError
+from pydantic_core import to_json
+from src.config.settings import settings
 from src.http.client import HttpClient
+from src.http.json_stream import iter_json_array, JsonStreamError
 from src.http.response import ResponseContext
-from src.contracts.validators import parse_json_as, ContractViolationError
+from src.contracts.modes import FULL, FULL_VALIDATION, ValidationMode, ValidationRecord
+from src.contracts.validators import (
+    check_json_content_type, parse_json_as, type_adapter, compiled_validator, is_json_error, record_validation, group_item_errors,
+    scan_item_ids, summarize_item_errors, ContractViolationError, ItemError
+)
+from src.metrics.instrumentation import instrument_pet_api
 from src.models.pet import Pet
 from src.models.api_response import ApiResponse
 from src.models.errors import ErrorResponse
 
+T = TypeVar("T")
+R = TypeVar("R")
 
-class PetApi:
-    def __init__(self, client: HttpClient = None):
-        self.client = client or HttpClient()
+MAX_REPORTED_ITEMS = 10
 
-    def create_pet(self, pet: Pet) -> Pet:
-        response = self.client.request("POST", "/pet", json=pet.model_dump())
+
+class BasePetApi:
+    validation: ValidationMode = FULL_VALIDATION
+
+    def _parse_pet(self, response: ResponseContext) -> Pet:
         if response.status_code != 200:
             self._handle_error_response(response)
-        return parse_json_as(Pet, response)
+        return parse_json_as(Pet, response, self.validation)
 
-    def get_pet(self, pet_id: int) -> Pet:
-        response = self.client.request("GET", f"/pet/{pet_id}")
+    def _parse_get_pet(self, response: ResponseContext, pet_id: int) -> Pet:
         if response.status_code == 404:
             raise PetNotFoundError(f"Pet with id {pet_id} not found", response)
-        if response.status_code != 200:
-            self._handle_error_response(response)
-        return parse_json_as(Pet, response)
-
-    def update_pet(self, pet: Pet) -> Pet:
-        response = self.client.request("PUT", "/pet", json=pet.model_dump())
-        if response.status_code != 200:
-            self._handle_error_response(response)
-        return parse_json_as(Pet, response)
+        return self._parse_pet(response)
 
-    def delete_pet(self, pet_id: int) -> ApiResponse:
-        response = self.client.request("DELETE", f"/pet/{pet_id}")
+    def _parse_delete_pet(self, response: ResponseContext, pet_id: int) -> ApiResponse:
         if response.status_code not in (200, 404):
             self._handle_error_response(response)
         if response.status_code == 404:
             try:
-                return parse_json_as(ApiResponse, response)
+                return parse_json_as(ApiResponse, response, self.validation)
             except ContractViolationError:
                 raise PetNotFoundError(f"Pet with id {pet_id} not found", response)
-        return parse_json_as(ApiResponse, response)
+        return parse_json_as(ApiResponse, response, self.validation)
 
-    def find_by_status(self, status: str) -> List[Pet]:
-        response = self.client.request("GET", "/pet/findByStatus", params={"status": status})
+    def _parse_pet_list(self, response: ResponseContext) -> List[Pet]:
         if response.status_code != 200:
             self._handle_error_response(response)
-        data = response.json()
-        if not isinstance(data, list):
-            raise ContractViolationError(
-                f"Expected list of pets, got: {type(data)}",
-                response=response
-            )
+        check_json_content_type(response)
+        started = perf_counter()
+        try:
+            if self.validation.kind == FULL:
+                return self._validate_pet_list(response)
+            return self._check_pet_list(response)
+        finally:
+            record_validation(response, started)
+
+    def _validate_pet_list(self, response: ResponseContext) -> List[Pet]:
         try:
-            return [Pet.model_validate(item) for item in data]
+            pets = type_adapter(List[Pet]).validate_json(response.body)
         except ValidationError as e:
-            raise ContractViolationError(
-                f"Contract violation: One or more pets in list failed validation: {e.errors()}",
-                response=response
-            ) from e
+            errors = e.errors(include_url=False)
+            if is_json_error(e):
+                raise ValueError(f"Failed to parse JSON response: {errors[0]['msg']}") from e
+            if errors[0]["loc"] == ():
+                raise ContractViolationError(
+                    f"Expected list of pets, got: {type(errors[0]['input'])}",
+                    response=response
+                ) from e
+            # The errors come from this one pass; only the ids for the report are read back from the body.
+            ids = scan_item_ids(response.body)
+            raise self._list_violation(response, group_item_errors(errors, ids), len(ids)) from e
+        response.validation = ValidationRecord(str(self.validation), len(pets), len(pets))
+        return pets
+
+    def _check_pet_list(self, response: ResponseContext) -> List[Pet]:
+        items = self._pet_items(response)
+        plan = self.validation.plan(len(items))
+        response.validation = ValidationRecord(str(self.validation), sum(plan), len(items))
+        validator = compiled_validator(Pet)
+        pets, item_errors = [], []
+        for index, (item, checked) in enumerate(zip(items, plan)):
+            if checked:
+                try:
+                    pets.append(validator.adapter.validate_python(item))
+                except ValidationError as e:
+                    item_errors.append(ItemError(index, item.get("id") if isinstance(item, dict) else None, e.errors(include_url=False)))
+            elif isinstance(item, dict):
+                pets.append(validator.construct(item))
+            else:
+                item_errors.append(ItemError(index, None, [{"type": "model_type", "loc": (), "msg": "Input should be an object", "input": item}]))
+        if item_errors:
+            raise self._list_violation(response, item_errors, len(items))
+        return pets
+
+    def _pet_items(self, response: ResponseContext) -> list:
+        items = response.json()
+        if not isinstance(items, list):
+            raise ContractViolationError(f"Expected list of pets, got: {type(items)}", response=response)
+        return items
+
+    def _list_violation(self, response: ResponseContext, item_errors: List[ItemError], total: int) -> ContractViolationError:
+        shown = "; ".join(f"index {item.index} (id {item.id}): {item.errors}" for item in item_errors[:MAX_REPORTED_ITEMS])
+        hidden = len(item_errors) - MAX_REPORTED_ITEMS
+        return ContractViolationError(
+            f"Contract violation: One or more pets in list failed validation: {len(item_errors)} of {total} invalid, "
+            f"error types: {summarize_item_errors(item_errors)}; {shown}"
+            + (f"; {hidden} more in item_errors" if hidden > 0 else ""),
+            response=response,
+            item_errors=item_errors
+        )
 
     def _handle_error_response(self, response: ResponseContext):
         try:
@@ -76,6 +128,100 @@ class PetApi:
             )
 
 
+class PetApi(BasePetApi):
+    def __init__(self, client: HttpClient = None, validation: Union[str, ValidationMode] = None):
+        self.client = client or HttpClient()
+        self.validation = ValidationMode.parse(validation or settings.validation_mode)
+        if settings.metrics_enabled:
+            instrument_pet_api(self)
+
+    def create_pet(self, pet: Pet) -> Pet:
+        response = self.client.request("POST", "/pet", content=to_json(pet))
+        return self._parse_pet(response)
+
+    def get_pet(self, pet_id: int) -> Pet:
+        response = self.client.request("GET", f"/pet/{pet_id}")
+        return self._parse_get_pet(response, pet_id)
+
+    def update_pet(self, pet: Pet) -> Pet:
+        response = self.client.request("PUT", "/pet", content=to_json(pet))
+        return self._parse_pet(response)
+
+    def delete_pet(self, pet_id: int) -> ApiResponse:
+        response = self.client.request("DELETE", f"/pet/{pet_id}")
+        return self._parse_delete_pet(response, pet_id)
+
+    def find_by_status(self, status: str) -> List[Pet]:
+        response = self.client.request("GET", "/pet/findByStatus", params={"status": status})
+        return self._parse_pet_list(response)
+
+    def iter_by_status(self, status: str, chunk_size: int = None) -> Iterator[Pet]:
+        with self.client.stream("GET", "/pet/findByStatus", params={"status": status}, chunk_size=chunk_size) as stream:
+            if stream.status_code != 200:
+                self._handle_error_response(stream.read())
+            check_json_content_type(stream.context())
+            validator = compiled_validator(Pet)
+            mode, plan = str(self.validation), self.validation.iter_plan()
+            checked = total = 0
+            spent = 0.0
+            stream.validation = ValidationRecord(mode, 0, 0)
+            try:
+                for index, (item, check) in enumerate(zip(iter_json_array(stream.iter_bytes()), plan)):
+                    started = perf_counter()
+                    try:
+                        if check or not isinstance(item, dict):
+                            pet = validator.adapter.validate_python(item)
+                        else:
+                            pet = validator.construct(item)
+                    except ValidationError as e:
+                        raise ContractViolationError(
+                            f"Contract violation: Pet at index {index} failed validation: {e.errors()}",
+                            response=stream.context(self.client.codec.dumps(item))
+                        ) from e
+                    finally:
+                        spent += perf_counter() - started
+                        checked += check
+                        total += 1
+                        stream.validation = ValidationRecord(mode, checked, total)
+                    yield pet
+            except JsonStreamError as e:
+                raise ContractViolationError(
+                    f"Expected list of pets, got unparseable stream: {e}",
+                    response=stream.context()
+                ) from e
+            finally:
+                # Like find_by_status: the record covers what was consumed, also when the caller stopped early.
+                stream.timings.validation = spent
+                stream.emit("parsed")
+
+    def create_pets(self, pets: Iterable[Pet], concurrency: int = None) -> List[Union[Pet, Exception]]:
+        return self._run_bulk(self.create_pet, pets, concurrency)
+
+    def get_pets(self, pet_ids: Iterable[int], concurrency: int = None) -> List[Union[Pet, Exception]]:
+        return self._run_bulk(self.get_pet, pet_ids, concurrency)
+
+    def update_pets(self, pets: Iterable[Pet], concurrency: int = None) -> List[Union[Pet, Exception]]:
+        return self._run_bulk(self.update_pet, pets, concurrency)
+
+    def delete_pets(self, pet_ids: Iterable[int], concurrency: int = None) -> List[Union[ApiResponse, Exception]]:
+        return self._run_bulk(self.delete_pet, pet_ids, concurrency)
+
+    def _run_bulk(self, operation: Callable[[T], R], items: Iterable[T], concurrency: int = None) -> List[Union[R, Exception]]:
+        items = list(items)
+        if not items:
+            return []
+
+        def call(item: T) -> Union[R, Exception]:
+            try:
+                return operation(item)
+            except Exception as e:
+                return e
+
+        workers = min(concurrency or settings.bulk_concurrency, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(call, items))
+
+
 class PetNotFoundError(Exception):
     def __init__(self, message: str, response: ResponseContext):
         super().__init__(message)
@@ -87,4 +233,3 @@ class ApiError(Exception):
         super().__init__(message)
         self.response = response
         self.error_response = error_response
-
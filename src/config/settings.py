@@ -1,12 +1,45 @@
-from dataclasses import dataclass
+import os
+import tempfile
+from dataclasses import dataclass, field
 
 
 @dataclass
 class Settings:
-    base_url: str = "https://petstore.swagger.io/v2"
+    base_url: str = field(default_factory=lambda: os.environ.get("PETSTORE_BASE_URL", "https://petstore.swagger.io/v2"))
     timeout: int = 10
+    transport: str = "requests"
     max_body_length: int = 1000
+    validation_mode: str = "full"
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keepalive_timeout: float = 30.0
+    async_max_connections: int = 100
+    bulk_concurrency: int = 8
+    # Off by default so tests see the server's first answer; opt in with Settings or HttpClient(retry_policy=...).
+    max_retries: int = 0
+    retry_backoff_factor: float = 0.2
+    retry_backoff_max: float = 10.0
+    retry_jitter: float = 0.5
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+    json_codec: str = "auto"
+    stream_chunk_size: int = 65536
+    cache_maxsize: int = 1024
+    cache_ttl: float = 30.0
+    cache_bypass: bool = False
+    cassette_path: str = "cassettes/petstore.cassette"
+    cassette_mode: str = "off"
+    single_flight: bool = False
+    rate_limits: dict = field(default_factory=dict)
+    rate_limit_burst: int = 10
+    rate_limit_blocking: bool = True
+    rate_limit_dir: str = field(default_factory=lambda: os.environ.get("PETSTORE_RATE_LIMIT_DIR"))
+    metrics_enabled: bool = False
+    cleanup_dir: str = field(
+        default_factory=lambda: os.environ.get("PETSTORE_CLEANUP_DIR", os.path.join(tempfile.gettempdir(), "petstore-cleanup"))
+    )
+    cleanup_concurrency: int = 16
 
 
 settings = Settings()
-
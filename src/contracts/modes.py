@@ -0,0 +1,84 @@
+import random
+import re
+from itertools import chain, count, repeat
+from typing import Iterator, List, NamedTuple, Union
+
+FULL = "full"
+SAMPLED = "sampled"
+FIRST_N = "first-N"
+STRUCTURAL = "off-but-structural"
+
+_SAMPLED = re.compile(r"sampled\(\s*([0-9]*\.?[0-9]+)\s*\)")
+_FIRST_N = re.compile(r"first-([0-9]+)")
+
+
+class ValidationRecord(NamedTuple):
+    # Objects fully validated out of the objects in one response; the rest only had their shape checked.
+    mode: str
+    checked: int
+    total: int
+
+
+class ValidationMode:
+    def __init__(self, kind: str = FULL, rate: float = 1.0, limit: int = 0, seed: int = None):
+        if kind not in (FULL, SAMPLED, FIRST_N, STRUCTURAL):
+            raise ValueError(f"Unknown validation mode: {kind}")
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sampling rate must be between 0 and 1, got {rate}")
+        if limit < 0:
+            raise ValueError(f"first-N limit must not be negative, got {limit}")
+        self.kind = kind
+        self.rate = rate
+        self.limit = limit
+        self._random = random.Random(seed)
+
+    @classmethod
+    def parse(cls, spec: Union[str, "ValidationMode"]) -> "ValidationMode":
+        if isinstance(spec, ValidationMode):
+            return spec
+        spec = spec.strip()
+        if spec in (FULL, STRUCTURAL):
+            return cls(spec)
+        match = _SAMPLED.fullmatch(spec)
+        if match:
+            return cls(SAMPLED, rate=float(match.group(1)))
+        match = _FIRST_N.fullmatch(spec)
+        if match:
+            return cls(FIRST_N, limit=int(match.group(1)))
+        raise ValueError(f"Unknown validation mode: {spec}, expected full, sampled(rate), first-N or off-but-structural")
+
+    def plan(self, count: int) -> List[bool]:
+        # Which of the `count` objects of one response get full validation; first-N counts per response.
+        if self.kind == FULL:
+            return [True] * count
+        if self.kind == STRUCTURAL:
+            return [False] * count
+        if self.kind == SAMPLED:
+            draw, rate = self._random.random, self.rate
+            return [draw() < rate for _ in range(count)]
+        take = min(count, self.limit)
+        return [True] * take + [False] * (count - take)
+
+    def iter_plan(self) -> Iterator[bool]:
+        # plan() for a streamed response whose length is not known up front.
+        if self.kind == FULL:
+            return repeat(True)
+        if self.kind == STRUCTURAL:
+            return repeat(False)
+        if self.kind == SAMPLED:
+            draw, rate = self._random.random, self.rate
+            return (draw() < rate for _ in count())
+        return chain(repeat(True, self.limit), repeat(False))
+
+    def __str__(self) -> str:
+        if self.kind == SAMPLED:
+            return f"sampled({self.rate:g})"
+        if self.kind == FIRST_N:
+            return f"first-{self.limit}"
+        return self.kind
+
+    def __repr__(self) -> str:
+        return f"ValidationMode({str(self)!r})"
+
+
+FULL_VALIDATION = ValidationMode()
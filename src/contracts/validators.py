@@ -1,12 +1,101 @@
-from typing import TypeVar, Type
-from pydantic import ValidationError
+from collections import Counter
+from functools import lru_cache
+from time import perf_counter
+from typing import Annotated, Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, TypeVar, Type, Union, get_args, get_origin
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from src.contracts.modes import FULL_VALIDATION, ValidationMode, ValidationRecord
 from src.http.response import ResponseContext
 from src.config.settings import settings
 
 T = TypeVar("T")
 
 
-def parse_json_as(model_class: Type[T], response: ResponseContext) -> T:
+@lru_cache(maxsize=None)
+def type_adapter(model_type: Any) -> TypeAdapter:
+    return TypeAdapter(model_type)
+
+
+def _nested_model(annotation: Any) -> Optional[Tuple[Type[BaseModel], bool]]:
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        annotation = args[0]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    if get_origin(annotation) is list:
+        (item,) = get_args(annotation) or (None,)
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return item, True
+    return None
+
+
+class CompiledValidator:
+    def __init__(self, model_class: Type[BaseModel]):
+        self.model_class = model_class
+        # Building a TypeAdapter compiles the pydantic-core schema, so it happens once per model.
+        self.adapter = type_adapter(model_class)
+        self.list_adapter = type_adapter(List[model_class])
+        self._nested: Dict[str, Tuple[Type[BaseModel], bool]] = {}
+        for name, field in model_class.model_fields.items():
+            nested = _nested_model(field.annotation)
+            if nested is not None:
+                self._nested[name] = nested
+
+    def construct(self, data: dict) -> BaseModel:
+        # Builds the model and its nested models from trusted data without validating field values.
+        if self._nested:
+            data = dict(data)
+            for name, (model_class, many) in self._nested.items():
+                value = data.get(name)
+                if many and isinstance(value, list):
+                    nested = compiled_validator(model_class)
+                    data[name] = [nested.construct(item) if isinstance(item, dict) else item for item in value]
+                elif not many and isinstance(value, dict):
+                    data[name] = compiled_validator(model_class).construct(value)
+        return self.model_class.model_construct(**data)
+
+
+@lru_cache(maxsize=None)
+def compiled_validator(model_class: Type[BaseModel]) -> CompiledValidator:
+    return CompiledValidator(model_class)
+
+
+class ItemError(NamedTuple):
+    index: int
+    id: Any
+    errors: List[dict]
+
+
+def group_item_errors(errors: Sequence[dict], ids: Sequence[Any], offset: int = 0) -> List[ItemError]:
+    # Errors from validating a list carry the item index first in their loc; regroup them per item.
+    grouped: Dict[int, List[dict]] = {}
+    for error in errors:
+        index, *loc = error["loc"]
+        grouped.setdefault(index, []).append({**error, "loc": tuple(loc)})
+    return [ItemError(offset + index, ids[index], item_errors) for index, item_errors in sorted(grouped.items())]
+
+
+class _ItemId(BaseModel):
+    id: Any = None
+
+
+def scan_item_ids(body: bytes) -> List[Any]:
+    # Ids of a JSON list without decoding the rest of each item, for reporting a list that failed validation.
+    items = type_adapter(List[Annotated[Union[_ItemId, Any], Field(union_mode="left_to_right")]]).validate_json(body)
+    return [item.id if isinstance(item, _ItemId) else None for item in items]
+
+
+def summarize_item_errors(item_errors: Sequence[ItemError]) -> Dict[str, int]:
+    return dict(Counter(error["type"] for item in item_errors for error in item.errors).most_common())
+
+
+def is_json_error(error: ValidationError) -> bool:
+    return any(item["type"] in ("json_invalid", "json_type") for item in error.errors())
+
+
+def check_json_content_type(response: ResponseContext) -> None:
+    # Applies in every validation mode: skipping the model checks does not make an HTML error page a pet.
     content_type = response.headers.get("Content-Type", "").lower()
     if "application/json" not in content_type and response.status_code != 204:
         raise ContractViolationError(
@@ -14,17 +103,24 @@ def parse_json_as(model_class: Type[T], response: ResponseContext) -> T:
             response=response
         )
 
-    try:
-        data = response.json()
-    except ValueError as e:
-        raise ContractViolationError(
-            f"Failed to parse response as JSON: {e}",
-            response=response
-        ) from e
 
+def parse_json_as(model_class: Type[T], response: ResponseContext, mode: ValidationMode = None) -> T:
+    check_json_content_type(response)
+    mode = mode or FULL_VALIDATION
+    (checked,) = mode.plan(1)
+    response.validation = ValidationRecord(str(mode), int(checked), 1)
+    started = perf_counter()
     try:
-        return model_class.model_validate(data)
+        if not checked:
+            return _construct(model_class, response)
+        result = type_adapter(model_class).validate_json(response.body)
     except ValidationError as e:
+        if is_json_error(e):
+            raise ContractViolationError(
+                f"Failed to parse response as JSON: {e.errors()[0]['msg']}",
+                response=response
+            ) from e
+
         body_preview = response.text[:settings.max_body_length]
         if len(response.text) > settings.max_body_length:
             body_preview += "... (truncated)"
@@ -37,10 +133,29 @@ def parse_json_as(model_class: Type[T], response: ResponseContext) -> T:
             f"  Validation errors: {e.errors()}"
         )
         raise ContractViolationError(error_msg, response=response) from e
+    finally:
+        record_validation(response, started)
+    return result
+
+
+def _construct(model_class: Type[T], response: ResponseContext) -> T:
+    try:
+        data = response.json()
+    except ValueError as e:
+        raise ContractViolationError(str(e), response=response) from e
+    if not isinstance(data, dict):
+        raise ContractViolationError(f"Expected {model_class.__name__} object, got: {type(data)}", response=response)
+    return compiled_validator(model_class).construct(data)
+
+
+def record_validation(response: ResponseContext, started: float) -> None:
+    response.timings.validation = perf_counter() - started
+    response.emit("parsed")
 
 
 class ContractViolationError(Exception):
-    def __init__(self, message: str, response: ResponseContext):
+    def __init__(self, message: str, response: ResponseContext, item_errors: List[ItemError] = None):
         super().__init__(message)
         self.response = response
-
+        self.item_errors = item_errors or []
+        self.summary = summarize_item_errors(self.item_errors)
@@ -0,0 +1,111 @@
+from typing import Any, Optional
+from src.config.settings import settings
+from src.http.codec import JsonCodec, get_codec
+from src.http.response import ResponseContext
+from src.http.single_flight import AsyncSingleFlight, flight_key
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+class AsyncHttpClient:
+    def __init__(
+        self,
+        base_url: str = None,
+        timeout: int = None,
+        max_connections: int = None,
+        pool_maxsize: int = None,
+        keepalive_timeout: float = None,
+        codec: JsonCodec = None,
+        single_flight: bool = None
+    ):
+        if httpx is None:
+            raise ImportError('AsyncHttpClient requires httpx: pip install -e ".[async]"')
+        self.base_url = base_url or settings.base_url
+        self.timeout = timeout or settings.timeout
+        self.max_connections = max_connections or settings.async_max_connections
+        self.pool_maxsize = pool_maxsize or settings.pool_maxsize
+        self.keepalive_timeout = keepalive_timeout or settings.keepalive_timeout
+        self.codec = codec or get_codec()
+        if settings.single_flight if single_flight is None else single_flight:
+            self.single_flight: Optional[AsyncSingleFlight] = AsyncSingleFlight()
+        else:
+            self.single_flight = None
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.pool_maxsize,
+                    keepalive_expiry=self.keepalive_timeout
+                )
+            )
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Any] = None,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        content: Optional[bytes] = None,
+        **kwargs
+    ) -> ResponseContext:
+        method = method.upper()
+        url = f"{self.base_url}{path}"
+        if json is not None:
+            content = self.codec.dumps(json)
+        if self.single_flight is not None and content is None and not kwargs:
+            key = flight_key(method, url, params, headers)
+            if key is not None:
+                return await self.single_flight.do(key, lambda: self._request(method, url, params, headers, content))
+        return await self._request(method, url, params, headers, content, **kwargs)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict],
+        headers: Optional[dict],
+        content: Optional[bytes],
+        **kwargs
+    ) -> ResponseContext:
+        default_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if headers:
+            default_headers.update(headers)
+
+        response = await self.client.request(
+            method=method,
+            url=url,
+            content=content,
+            params=params,
+            headers=default_headers,
+            **kwargs
+        )
+
+        return ResponseContext(
+            method=method,
+            url=url,
+            status_code=response.status_code,
+            headers=response.headers,
+            content=response.content,
+            elapsed=response.elapsed.total_seconds()
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+from src.http.response import Hooks, ResponseContext
+
+MAGIC = b"PSCAS01\n"
+RECORD_HEADER = struct.Struct(">32sII")
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMissError(LookupError):
+    def __init__(self, message: str, method: str, path: str):
+        super().__init__(message)
+        self.method = method
+        self.path = path
+
+
+def normalize_params(params: Optional[Mapping]) -> str:
+    if not params:
+        return ""
+    pairs = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        pairs.extend((str(key), str(item)) for item in values if item is not None)
+    return urlencode(sorted(pairs))
+
+
+def normalize_body(content: Optional[bytes]) -> bytes:
+    if not content:
+        return b""
+    try:
+        return json.dumps(json.loads(content), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except ValueError:
+        return bytes(content)
+
+
+def match_key(method: str, path: str, params: Optional[Mapping] = None, content: Optional[bytes] = None) -> bytes:
+    digest = hashlib.sha256()
+    digest.update(method.upper().encode("ascii"))
+    digest.update(b"\n" + path.split("?", 1)[0].encode("utf-8"))
+    digest.update(b"\n" + normalize_params(params).encode("utf-8"))
+    digest.update(b"\n" + normalize_body(content))
+    return digest.digest()
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str = REPLAY):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self._index: Dict[bytes, List[Tuple[int, int, int, int]]] = {}
+        self._cursors: Dict[bytes, int] = {}
+        self._lock = threading.Lock()
+        self._mmap: Optional[mmap.mmap] = None
+        self._file = None
+        if mode == REPLAY:
+            self._load()
+        else:
+            self._start_recording()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._index.values())
+
+    def _load(self) -> None:
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= len(MAGIC):
+                return
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a cassette file: {self.path}")
+
+        offset = len(MAGIC)
+        size = len(self._mmap)
+        while offset + RECORD_HEADER.size <= size:
+            key, meta_len, body_len = RECORD_HEADER.unpack_from(self._mmap, offset)
+            meta_offset = offset + RECORD_HEADER.size
+            end = meta_offset + meta_len + body_len
+            if end > size:
+                # Torn write at the tail of an interrupted recording.
+                break
+            self._index.setdefault(key, []).append((meta_offset, meta_len, meta_offset + meta_len, body_len))
+            offset = end
+
+    def _start_recording(self) -> None:
+        # Recording overwrites the cassette: a session's exchanges are appended to a fresh file, never to an
+        # older recording, whose stale exchanges would otherwise be replayed first.
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC)
+        self._file.flush()
+
+    def record(
+        self,
+        path: str,
+        params: Optional[Mapping],
+        content: Optional[bytes],
+        response: ResponseContext
+    ) -> None:
+        meta = json.dumps({
+            "method": response.method,
+            "url": response.url,
+            "path": path,
+            "params": normalize_params(params),
+            "status_code": response.status_code,
+            "headers": list(response.headers.items()),
+            "elapsed": response.elapsed,
+        }).encode("utf-8")
+        body = response.content
+        key = match_key(response.method, path, params, content)
+        record = b"".join((RECORD_HEADER.pack(key, len(meta), body.nbytes), meta, body))
+        with self._lock:
+            self._file.write(record)
+            self._file.flush()
+
+    def replay(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Mapping] = None,
+        content: Optional[bytes] = None,
+        hooks: Optional[Hooks] = None
+    ) -> ResponseContext:
+        key = match_key(method, path, params, content)
+        with self._lock:
+            entries = self._index.get(key)
+            if not entries:
+                raise CassetteMissError(
+                    f"No recorded exchange for {method.upper()} {path} in {self.path}",
+                    method=method,
+                    path=path
+                )
+            # Repeated identical requests replay in recorded order, then stick to the last answer.
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+        meta_offset, meta_len, body_offset, body_len = entries[min(cursor, len(entries) - 1)]
+        meta = json.loads(self._mmap[meta_offset:meta_offset + meta_len])
+        return ResponseContext(
+            method=meta["method"],
+            url=meta["url"],
+            status_code=meta["status_code"],
+            headers=dict(meta["headers"]),
+            content=memoryview(self._mmap)[body_offset:body_offset + body_len],
+            elapsed=0.0,
+            hooks=hooks
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            # Replayed responses may still reference the map; it is released once they are gone.
+            self._mmap = None
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+_shared: Dict[Tuple[str, str], Cassette] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_cassette(path: str, mode: str) -> Cassette:
+    key = (os.path.abspath(path), mode)
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = Cassette(path, mode)
+        return _shared[key]
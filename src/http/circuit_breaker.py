@@ -0,0 +1,105 @@
+import threading
+import time
+from typing import Dict, FrozenSet
+from src.config.settings import settings
+from src.http.retry import RETRYABLE_STATUSES
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# The statuses a retry treats as transient; the breaker counts the same ones so retry and breaker agree.
+FAILURE_STATUSES = RETRYABLE_STATUSES
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, message: str, endpoint: str, retry_in: float):
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int = None,
+        reset_timeout: float = None,
+        failure_statuses: FrozenSet[int] = FAILURE_STATUSES
+    ):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold or settings.circuit_failure_threshold
+        self.reset_timeout = reset_timeout or settings.circuit_reset_timeout
+        self.failure_statuses = failure_statuses
+        self.failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def before_request(self) -> None:
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            retry_in = self.reset_timeout - (time.monotonic() - self._opened_at)
+            if self._state == OPEN and retry_in <= 0:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError(
+                f"Circuit open for {self.endpoint}: failing fast after {self.failures} consecutive failures",
+                endpoint=self.endpoint,
+                retry_in=max(0.0, retry_in)
+            )
+
+    def record_status(self, status_code: int) -> None:
+        if status_code in self.failure_statuses:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._state = CLOSED
+            self._probe_in_flight = False
+
+    def record_abort(self) -> None:
+        # The request ended without telling us anything about the endpoint; let another one probe it.
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class CircuitBreakerRegistry:
+    def __init__(self, failure_threshold: int = None, reset_timeout: float = None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    endpoint,
+                    CircuitBreaker(endpoint, self.failure_threshold, self.reset_timeout)
+                )
+        return breaker
@@ -1,44 +1,273 @@
-from typing import Optional
-import requests
+import time
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, Tuple
 from src.config.settings import settings
-from src.http.response import ResponseContext
+from src.http.cassette import Cassette, REPLAY, shared_cassette
+from src.http.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from src.http.endpoints import endpoint_key
+from src.http.codec import JsonCodec, get_codec
+from src.http.response import ResponseContext, StreamingResponse
+from src.http.rate_limit import RateLimiterRegistry
+from src.http.retry import RetryPolicy
+from src.http.single_flight import SingleFlight, flight_key
+from src.http.timing import RequestTimings, collect
+from src.http.transport import TRANSIENT_ERRORS, Transport, TransportResponse, create_transport
+from src.metrics.instrumentation import instrument_client
+
+HOOK_EVENTS = ("request", "response", "parsed", "error")
 
 
 class HttpClient:
-    def __init__(self, base_url: str = None, timeout: int = None):
+    def __init__(
+        self,
+        base_url: str = None,
+        timeout: int = None,
+        pool_connections: int = None,
+        pool_maxsize: int = None,
+        pool_block: bool = None,
+        keepalive_timeout: float = None,
+        retry_policy: RetryPolicy = None,
+        circuit_breakers: CircuitBreakerRegistry = None,
+        codec: JsonCodec = None,
+        cassette: Cassette = None,
+        single_flight: bool = None,
+        rate_limiters: RateLimiterRegistry = None,
+        transport: Transport = None
+    ):
         self.base_url = base_url or settings.base_url
         self.timeout = timeout or settings.timeout
+        self.pool_connections = pool_connections or settings.pool_connections
+        self.pool_maxsize = pool_maxsize or settings.pool_maxsize
+        self.pool_block = settings.pool_block if pool_block is None else pool_block
+        self.keepalive_timeout = keepalive_timeout or settings.keepalive_timeout
+        # A transport passed in may be shared with other clients; only the one created here is ours to close.
+        self._owns_transport = transport is None
+        self.transport = transport or create_transport(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breakers = circuit_breakers or CircuitBreakerRegistry()
+        self.rate_limiters = rate_limiters or RateLimiterRegistry()
+        self.codec = codec or get_codec()
+        self.cassette = cassette
+        if cassette is None and settings.cassette_mode != "off":
+            self.cassette = shared_cassette(settings.cassette_path, settings.cassette_mode)
+        if settings.single_flight if single_flight is None else single_flight:
+            self.single_flight: Optional[SingleFlight] = SingleFlight()
+        else:
+            self.single_flight = None
+        self.hooks = {event: [] for event in HOOK_EVENTS}
+        if settings.metrics_enabled:
+            instrument_client(self)
+
+    def add_hook(self, event: str, callback: Callable[..., None]) -> None:
+        if event not in self.hooks:
+            raise ValueError(f"Unknown hook event '{event}', expected one of {', '.join(HOOK_EVENTS)}")
+        self.hooks[event].append(callback)
+
+    def remove_hook(self, event: str, callback: Callable[..., None]) -> None:
+        self.hooks[event].remove(callback)
 
     def request(
         self,
         method: str,
         path: str,
-        json: Optional[dict] = None,
+        json: Optional[Any] = None,
         params: Optional[dict] = None,
         headers: Optional[dict] = None,
+        content: Optional[bytes] = None,
         **kwargs
     ) -> ResponseContext:
+        method = method.upper()
         url = f"{self.base_url}{path}"
-        default_headers = {"Content-Type": "application/json", "Accept": "application/json"}
-        if headers:
-            default_headers.update(headers)
+        if json is not None:
+            content = self.codec.dumps(json)
+        if self.single_flight is not None and content is None and not kwargs:
+            key = flight_key(method, url, params, headers)
+            if key is not None:
+                # Concurrent identical reads share one exchange and the same ResponseContext.
+                return self.single_flight.do(key, lambda: self._request(method, path, url, params, headers, content))
+        return self._request(method, path, url, params, headers, content, **kwargs)
 
-        response = requests.request(
-            method=method.upper(),
-            url=url,
-            json=json,
-            params=params,
-            headers=default_headers,
-            timeout=self.timeout,
-            **kwargs
-        )
+    def _request(
+        self,
+        method: str,
+        path: str,
+        url: str,
+        params: Optional[dict],
+        headers: Optional[dict],
+        content: Optional[bytes],
+        **kwargs
+    ) -> ResponseContext:
+        for callback in self.hooks["request"]:
+            callback(method, url)
+        try:
+            # Every "request" event is answered by "response" or "error", replay misses included.
+            if self.cassette is not None and self.cassette.mode == REPLAY:
+                result = self.cassette.replay(method, path, params, content, hooks=self.hooks)
+            else:
+                result = self._receive(method, path, url, params, headers, content, **kwargs)
+                if self.cassette is not None:
+                    self.cassette.record(path, params, content, result)
+        except Exception as e:
+            self._emit_error(method, url, e)
+            raise
+        result.emit("response")
+        return result
+
+    def _emit_error(self, method: str, url: str, error: Exception) -> None:
+        for callback in self.hooks["error"]:
+            callback(method, url, error)
+
+    def _receive(
+        self,
+        method: str,
+        path: str,
+        url: str,
+        params: Optional[dict],
+        headers: Optional[dict],
+        content: Optional[bytes],
+        **kwargs
+    ) -> ResponseContext:
+        response, retries, breaker, timings, started = self._send(method, path, url, params, headers, content, **kwargs)
+        download_started = perf_counter()
+        body = response.read()
+        finished = perf_counter()
+        timings.download = finished - download_started
+        timings.total = finished - started
 
         return ResponseContext(
-            method=method.upper(),
+            method=method,
             url=url,
             status_code=response.status_code,
-            headers=dict(response.headers),
-            text=response.text,
-            elapsed=response.elapsed.total_seconds()
+            headers=response.headers,
+            content=body,
+            elapsed=response.elapsed,
+            retries=retries,
+            circuit_state=breaker.state,
+            timings=timings,
+            hooks=self.hooks
         )
 
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        chunk_size: int = None,
+        **kwargs
+    ) -> Iterator[StreamingResponse]:
+        method = method.upper()
+        url = f"{self.base_url}{path}"
+        chunk_size = chunk_size or settings.stream_chunk_size
+        if self.cassette is not None:
+            # Exchanges are recorded and replayed whole, so stream from the buffered body.
+            result = self.request(method, path, params=params, headers=headers, **kwargs)
+            body = result.content
+            yield StreamingResponse(
+                method=method,
+                url=result.url,
+                status_code=result.status_code,
+                headers=result.headers,
+                chunks=(body[i:i + chunk_size] for i in range(0, body.nbytes, chunk_size)),
+                elapsed=result.elapsed,
+                retries=result.retries,
+                circuit_state=result.circuit_state,
+                timings=result.timings,
+                hooks=self.hooks
+            )
+            return
+        for callback in self.hooks["request"]:
+            callback(method, url)
+        try:
+            response, retries, breaker, timings, _ = self._send(method, path, url, params, headers, None, **kwargs)
+        except Exception as e:
+            self._emit_error(method, url, e)
+            raise
+        try:
+            streaming = StreamingResponse(
+                method=method,
+                url=url,
+                status_code=response.status_code,
+                headers=response.headers,
+                chunks=response.iter_bytes(chunk_size),
+                elapsed=response.elapsed,
+                retries=retries,
+                circuit_state=breaker.state,
+                timings=timings,
+                hooks=self.hooks
+            )
+            # The body is still to come; "response" marks the headers, as elapsed does.
+            streaming.emit("response")
+            yield streaming
+        finally:
+            response.close()
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        url: str,
+        params: Optional[dict],
+        headers: Optional[dict],
+        content: Optional[bytes],
+        **kwargs
+    ) -> Tuple[TransportResponse, int, CircuitBreaker, RequestTimings, float]:
+        default_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if headers:
+            default_headers.update(headers)
+
+        endpoint = endpoint_key(method, path)
+        breaker = self.circuit_breakers.get(endpoint)
+        limiter = self.rate_limiters.get(endpoint)
+        attempt = 0
+        waited = None
+        while True:
+            # The token comes first: a fail-fast limiter raising after before_request() would strand a half-open probe.
+            if limiter is not None:
+                waited = (waited or 0.0) + limiter.acquire()
+            breaker.before_request()
+            timings = RequestTimings(rate_limit_wait=waited)
+            if self.transport.measures_connection:
+                # Pooled connections skip DNS, connect and TLS; new ones overwrite these zeros.
+                timings.dns = timings.connect = 0.0
+                timings.tls = 0.0 if url.startswith("https") else None
+            started = perf_counter()
+            try:
+                with collect(timings):
+                    response = self.transport.send(method, url, params, default_headers, content, self.timeout, **kwargs)
+                timings.ttfb = perf_counter() - started - (timings.dns or 0.0) - (timings.connect or 0.0) - (timings.tls or 0.0)
+            except TRANSIENT_ERRORS as e:
+                breaker.record_failure()
+                if not self.retry_policy.should_retry_error(method, e, attempt, request_sent=self.transport.was_sent(e)):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+            except BaseException:
+                breaker.record_abort()
+                raise
+            else:
+                breaker.record_status(response.status_code)
+                if not self.retry_policy.should_retry_status(method, response.status_code, attempt):
+                    return response, attempt, breaker, timings, started
+                delay = self.retry_policy.backoff(attempt, response.headers.get("Retry-After"))
+                response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self.rate_limiters.close()
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self) -> "HttpClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
@@ -0,0 +1,77 @@
+import json
+from functools import lru_cache
+from typing import Any, Union
+from src.config.settings import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+JsonInput = Union[bytes, bytearray, memoryview, str]
+
+
+class JsonCodec:
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: JsonInput) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: JsonInput) -> Any:
+        return orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    name = "ujson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: JsonInput) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return ujson.loads(data)
+
+
+CODECS = {
+    "orjson": (OrjsonCodec, orjson),
+    "ujson": (UjsonCodec, ujson),
+    "json": (JsonCodec, json),
+}
+
+
+def available_codecs() -> list[str]:
+    return [name for name, (_, module) in CODECS.items() if module is not None]
+
+
+@lru_cache(maxsize=None)
+def _make_codec(name: str) -> JsonCodec:
+    if name == "auto":
+        name = available_codecs()[0]
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec: {name}")
+    codec_class, module = CODECS[name]
+    if module is None:
+        raise ImportError(f"JSON codec '{name}' is not installed")
+    return codec_class()
+
+
+def get_codec(name: str = None) -> JsonCodec:
+    return _make_codec(name or settings.json_codec)
@@ -0,0 +1,12 @@
+import re
+
+_ID_SEGMENT = re.compile(r"/-?\d+(?=/|$)")
+
+
+def path_template(path: str) -> str:
+    path = path.split("?", 1)[0]
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def endpoint_key(method: str, path: str) -> str:
+    return f"{method.upper()} {path_template(path)}"
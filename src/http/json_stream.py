@@ -0,0 +1,76 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+_COMPACT_AT = 1 << 16
+
+
+class JsonStreamError(ValueError):
+    pass
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    started = False
+    after_value = False
+    pending_value = False
+    exhausted = False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+
+        if pos < len(buffer):
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise JsonStreamError(f"Expected JSON array, got {char!r} at offset {pos}")
+                started = True
+                pos += 1
+                continue
+            if char == "]":
+                if pending_value:
+                    raise JsonStreamError(f"Unexpected ']' after ',' at offset {pos}")
+                return
+            if char == ",":
+                if not after_value:
+                    raise JsonStreamError(f"Unexpected ',' at offset {pos}")
+                after_value = False
+                pending_value = True
+                pos += 1
+                continue
+            if after_value:
+                raise JsonStreamError(f"Expected ',' or ']', got {char!r} at offset {pos}")
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if exhausted:
+                    raise JsonStreamError(f"Malformed JSON array: {e}") from e
+            else:
+                # A value ending exactly at the buffer edge may be a truncated number or literal.
+                if end < len(buffer) or exhausted:
+                    pos = end
+                    after_value = True
+                    pending_value = False
+                    yield value
+                    continue
+
+        if exhausted:
+            raise JsonStreamError("Unexpected end of JSON array")
+        chunk = next(chunks, None)
+        try:
+            if chunk is None:
+                exhausted = True
+                buffer += text_decoder.decode(b"", final=True)
+            else:
+                if pos > _COMPACT_AT:
+                    buffer = buffer[pos:]
+                    pos = 0
+                buffer += text_decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            raise JsonStreamError(f"Invalid {encoding} in JSON stream: {e}") from e
@@ -0,0 +1,157 @@
+import os
+import re
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+from src.config.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+ANY_ENDPOINT = "*"
+
+# tokens, last refill as wall-clock seconds (monotonic clocks are not comparable across processes)
+BUCKET_STATE = struct.Struct("<dd")
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, message: str, endpoint: str, retry_in: float):
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    def __init__(self, endpoint: str, rate: float, burst: int = None, blocking: bool = None):
+        if rate <= 0:
+            raise ValueError(f"Rate limit for {endpoint} must be positive, got {rate}")
+        self.endpoint = endpoint
+        self.rate = rate
+        self.burst = burst or settings.rate_limit_burst
+        self.blocking = settings.rate_limit_blocking if blocking is None else blocking
+        self._tokens = float(self.burst)
+        self._updated = self._clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, block: bool = None, timeout: float = None) -> float:
+        block = self.blocking if block is None else block
+        with self._locked():
+            tokens, updated = self._load()
+            now = self._clock()
+            tokens = min(float(self.burst), tokens + max(0.0, now - updated) * self.rate)
+            wait = max(0.0, (1.0 - tokens) / self.rate)
+            granted = not wait or (block and (timeout is None or wait <= timeout))
+            # A granted token is taken up front, so later callers queue behind this one.
+            self._store(tokens - 1.0 if granted else tokens, now)
+        if not granted:
+            raise RateLimitExceeded(
+                f"Rate limit of {self.rate:g}/s for {self.endpoint} exceeded, next token in {wait:.3f}s",
+                self.endpoint,
+                wait
+            )
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def _clock(self) -> float:
+        return time.monotonic()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+    def _load(self) -> Tuple[float, float]:
+        return self._tokens, self._updated
+
+    def _store(self, tokens: float, updated: float) -> None:
+        self._tokens, self._updated = tokens, updated
+
+    def close(self) -> None:
+        pass
+
+
+class FileTokenBucket(TokenBucket):
+    # Bucket state lives in a small file, so every process opening the same path shares the limit.
+    def __init__(self, endpoint: str, rate: float, path: str, burst: int = None, blocking: bool = None):
+        if fcntl is None:
+            raise ImportError("FileTokenBucket requires fcntl, which is not available on this platform")
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        super().__init__(endpoint, rate, burst, blocking)
+
+    def _clock(self) -> float:
+        return time.time()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # flock is held per open file description, so threads sharing the descriptor still need the mutex.
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _load(self) -> Tuple[float, float]:
+        data = os.pread(self._fd, BUCKET_STATE.size, 0)
+        if len(data) < BUCKET_STATE.size:
+            return float(self.burst), self._clock()
+        return BUCKET_STATE.unpack(data)
+
+    def _store(self, tokens: float, updated: float) -> None:
+        os.pwrite(self._fd, BUCKET_STATE.pack(tokens, updated), 0)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class RateLimiterRegistry:
+    def __init__(
+        self,
+        limits: Mapping[str, float] = None,
+        burst: int = None,
+        blocking: bool = None,
+        directory: str = None
+    ):
+        # Keys are endpoint keys such as "GET /pet/{id}"; "*" is one bucket shared by all other endpoints.
+        self.limits = dict(settings.rate_limits if limits is None else limits)
+        self.burst = burst
+        self.blocking = blocking
+        self.directory = directory or settings.rate_limit_dir
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> Optional[TokenBucket]:
+        key = endpoint if endpoint in self.limits else ANY_ENDPOINT
+        if key not in self.limits:
+            return None
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = self._create(key)
+        return bucket
+
+    def _create(self, key: str) -> TokenBucket:
+        rate = self.limits[key]
+        if self.directory is None:
+            return TokenBucket(key, rate, self.burst, self.blocking)
+        name = re.sub(r"[^A-Za-z0-9]+", "_", key).strip("_") or "all"
+        return FileTokenBucket(key, rate, os.path.join(self.directory, f"{name}.bucket"), self.burst, self.blocking)
+
+    def close(self) -> None:
+        with self._lock:
+            buckets, self._buckets = list(self._buckets.values()), {}
+        for bucket in buckets:
+            bucket.close()
@@ -1,20 +1,173 @@
-from dataclasses import dataclass
-from typing import Optional
-import json
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+from requests.structures import CaseInsensitiveDict
+from src.http.codec import get_codec
+from src.http.timing import RequestTimings
+
+Hooks = Dict[str, List[Callable[..., None]]]
+
+_UNSET = object()
 
 
-@dataclass
 class ResponseContext:
-    method: str
-    url: str
-    status_code: int
-    headers: dict
-    text: str
-    elapsed: float
-
-    def json(self) -> dict:
-        try:
-            return json.loads(self.text)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse JSON response: {e}") from e
+    __slots__ = (
+        "method",
+        "url",
+        "status_code",
+        "headers",
+        "elapsed",
+        "retries",
+        "circuit_state",
+        "timings",
+        "validation",
+        "_hooks",
+        "_content",
+        "_text",
+        "_json",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        headers: Mapping[str, str],
+        text: Optional[str] = None,
+        elapsed: float = 0.0,
+        retries: int = 0,
+        circuit_state: Optional[str] = None,
+        content: Optional[bytes] = None,
+        timings: Optional[RequestTimings] = None,
+        hooks: Optional[Hooks] = None
+    ):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        # requests/httpx header mappings are already case-insensitive; only plain dicts get wrapped
+        self.headers = CaseInsensitiveDict(headers) if isinstance(headers, dict) else headers
+        self.elapsed = elapsed
+        self.retries = retries
+        self.circuit_state = circuit_state
+        self.timings = timings or RequestTimings()
+        # Set by contract validation to the ValidationRecord of what was actually checked.
+        self.validation = None
+        self._hooks = hooks
+        if content is None:
+            content = (text or "").encode("utf-8")
+        self._content = memoryview(content)
+        self._text = text
+        self._json = _UNSET
+
+    @property
+    def content(self) -> memoryview:
+        return self._content
+
+    @property
+    def body(self) -> bytes:
+        owner = self._content.obj
+        if isinstance(owner, bytes) and len(owner) == self._content.nbytes:
+            return owner
+        return self._content.tobytes()
+
+    @property
+    def encoding(self) -> str:
+        content_type = self.headers.get("Content-Type", "")
+        for param in content_type.split(";")[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "charset" and value:
+                return value.strip().strip('"')
+        return "utf-8"
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = str(self._content, self.encoding, errors="replace")
+        return self._text
+
+    def json(self) -> Any:
+        if self._json is _UNSET:
+            started = perf_counter()
+            try:
+                self._json = get_codec().loads(self._content)
+            except ValueError as e:
+                raise ValueError(f"Failed to parse JSON response: {e}") from e
+            self.timings.decode = perf_counter() - started
+        return self._json
+
+    def emit(self, event: str) -> None:
+        if self._hooks:
+            for callback in self._hooks.get(event, ()):
+                callback(self)
+
+    def __reduce__(self):
+        return (
+            ResponseContext,
+            (self.method, self.url, self.status_code, dict(self.headers), self._text,
+             self.elapsed, self.retries, self.circuit_state, bytes(self._content))
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ResponseContext(method={self.method!r}, url={self.url!r}, "
+            f"status_code={self.status_code}, elapsed={self.elapsed})"
+        )
+
+
+class StreamingResponse:
+    __slots__ = (
+        "method", "url", "status_code", "headers", "elapsed", "retries", "circuit_state", "timings", "validation",
+        "_hooks", "_chunks"
+    )
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        headers: Mapping[str, str],
+        chunks: Iterator[bytes],
+        elapsed: float = 0.0,
+        retries: int = 0,
+        circuit_state: Optional[str] = None,
+        timings: Optional[RequestTimings] = None,
+        hooks: Optional[Hooks] = None
+    ):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers) if isinstance(headers, dict) else headers
+        self.elapsed = elapsed
+        self.retries = retries
+        self.circuit_state = circuit_state
+        self.timings = timings or RequestTimings()
+        # ValidationRecord of the items consumed so far, set by the code parsing the stream.
+        self.validation = None
+        self._hooks = hooks
+        self._chunks = chunks
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        return self._chunks
+
+    def emit(self, event: str) -> None:
+        if self._hooks:
+            for callback in self._hooks.get(event, ()):
+                callback(self)
+
+    def read(self) -> ResponseContext:
+        return self.context(b"".join(self._chunks))
 
+    def context(self, content: bytes = b"") -> ResponseContext:
+        context = ResponseContext(
+            method=self.method,
+            url=self.url,
+            status_code=self.status_code,
+            headers=self.headers,
+            content=content,
+            elapsed=self.elapsed,
+            retries=self.retries,
+            circuit_state=self.circuit_state,
+            timings=self.timings,
+            hooks=self._hooks
+        )
+        context.validation = self.validation
+        return context
@@ -0,0 +1,67 @@
+import random
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import FrozenSet, Optional
+from src.config.settings import settings
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: Optional[int] = None
+    backoff_factor: Optional[float] = None
+    backoff_max: Optional[float] = None
+    jitter: Optional[float] = None
+    retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES
+    allowed_methods: FrozenSet[str] = IDEMPOTENT_METHODS
+    respect_retry_after: bool = True
+
+    def __post_init__(self):
+        if self.max_retries is None:
+            self.max_retries = settings.max_retries
+        if self.backoff_factor is None:
+            self.backoff_factor = settings.retry_backoff_factor
+        if self.backoff_max is None:
+            self.backoff_max = settings.retry_backoff_max
+        if self.jitter is None:
+            self.jitter = settings.retry_jitter
+
+    def should_retry_status(self, method: str, status_code: int, attempt: int) -> bool:
+        return (
+            attempt < self.max_retries
+            and status_code in self.retry_statuses
+            and method.upper() in self.allowed_methods
+        )
+
+    def should_retry_error(self, method: str, error: Exception, attempt: int, request_sent: bool = True) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        # A request that never reached the server is safe to resend whatever the method.
+        return not request_sent or method.upper() in self.allowed_methods
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and self.respect_retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
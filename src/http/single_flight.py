@@ -0,0 +1,77 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, Mapping, Optional, TypeVar
+from src.http.cassette import normalize_params
+
+T = TypeVar("T")
+
+SHARED_METHODS = frozenset({"GET", "HEAD"})
+
+
+def flight_key(method: str, url: str, params: Optional[Mapping] = None, headers: Optional[Mapping] = None) -> Optional[tuple]:
+    if method not in SHARED_METHODS:
+        return None
+    header_items = tuple(sorted((str(name).lower(), str(value)) for name, value in headers.items())) if headers else ()
+    return method, url, normalize_params(params), header_items
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.merged = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.merged += 1
+            else:
+                self._calls[key] = leader = Future()
+        if future is not None:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key)
+            leader.set_exception(e)
+            raise
+        # Late callers start a new flight instead of joining one that already has its answer.
+        self._finish(key)
+        leader.set_result(result)
+        return result
+
+    def _finish(self, key: Hashable) -> None:
+        with self._lock:
+            del self._calls[key]
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Future"] = {}
+        self.merged = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+        if future is not None:
+            self.merged += 1
+            # A cancelled follower must not cancel the shared call.
+            return await asyncio.shield(future)
+
+        self._calls[key] = leader = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            del self._calls[key]
+            leader.cancel()
+            raise
+        except BaseException as e:
+            del self._calls[key]
+            leader.set_exception(e)
+            leader.exception()  # Retrieved here so a call with no followers is not logged as unhandled.
+            raise
+        del self._calls[key]
+        leader.set_result(result)
+        return result
@@ -0,0 +1,110 @@
+import socket
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.connection import allowed_gai_family
+
+PHASES = ("dns", "connect", "tls", "ttfb", "download", "decode", "validation")
+
+
+class RequestTimings:
+    # Seconds per phase; None means the phase was not measured for this response.
+    # ttfb covers sending the request and waiting for the response headers.
+    # With single-pass validation, JSON parsing is counted under validation.
+    # rate_limit_wait is time queued on the client-side rate limiter and is not part of total.
+    __slots__ = PHASES + ("total", "rate_limit_wait")
+
+    def __init__(self, **phases: float):
+        for name in self.__slots__:
+            setattr(self, name, phases.get(name))
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        measured = ", ".join(f"{name}={value * 1000:.2f}ms" for name, value in self.as_dict().items() if value is not None)
+        return f"RequestTimings({measured})"
+
+
+_active = threading.local()
+
+
+@contextmanager
+def collect(timings: RequestTimings) -> Iterator[RequestTimings]:
+    previous = getattr(_active, "timings", None)
+    _active.timings = timings
+    try:
+        yield timings
+    finally:
+        _active.timings = previous
+
+
+def current() -> Optional[RequestTimings]:
+    return getattr(_active, "timings", None)
+
+
+class _TimedConnectionMixin:
+    def _new_conn(self) -> socket.socket:
+        timings = current()
+        if timings is None:
+            return super()._new_conn()
+        started = perf_counter()
+        host = self._dns_host
+        try:
+            infos = socket.getaddrinfo(host.strip("[]"), self.port, allowed_gai_family(), socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        except socket.gaierror:
+            # Let urllib3 raise its usual NameResolutionError.
+            addresses = [host]
+        resolved = perf_counter()
+        # Like urllib3's own resolution, every address is tried in turn, e.g. IPv4 after an unreachable IPv6 one.
+        try:
+            for index, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except ConnectTimeoutError:
+                    # Also the base of NewConnectionError (refused, unreachable).
+                    if index == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+        timings.dns = resolved - started
+        timings.connect = perf_counter() - resolved
+        return sock
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self) -> None:
+        timings = current()
+        started = perf_counter()
+        super().connect()
+        if timings is not None and timings.connect is not None:
+            timings.tls = perf_counter() - started - timings.dns - timings.connect
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
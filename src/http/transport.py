@@ -0,0 +1,465 @@
+import asyncio
+import io
+import sys
+import threading
+import time
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+import requests
+import urllib3
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import ConnectTimeoutError, HTTPError, NewConnectionError, ReadTimeoutError
+from src.config.settings import settings
+from src.http.cassette import normalize_params
+from src.http.timing import TimedHTTPAdapter, TimedHTTPConnectionPool, TimedHTTPSConnectionPool
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+# Every backend raises these for failures worth retrying, so retry and circuit logic stays backend-agnostic.
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+def with_query(url: str, params: Optional[Mapping]) -> str:
+    query = normalize_params(params)
+    if not query:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{query}"
+
+
+class TransportResponse:
+    def __init__(
+        self,
+        status_code: int,
+        headers: Mapping[str, str],
+        elapsed: float,
+        read: Callable[[], bytes],
+        iter_bytes: Callable[[int], Iterator[bytes]],
+        close: Callable[[], None] = None
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.elapsed = elapsed
+        self._read = read
+        self._iter_bytes = iter_bytes
+        self._close = close
+
+    def read(self) -> bytes:
+        return self._read()
+
+    def iter_bytes(self, chunk_size: int) -> Iterator[bytes]:
+        return self._iter_bytes(chunk_size)
+
+    def close(self) -> None:
+        if self._close is not None:
+            self._close()
+
+
+class Transport:
+    name = "transport"
+    # Whether DNS, connect and TLS phases are measured; in-process and httpx backends have none to report.
+    measures_connection = False
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping],
+        headers: Mapping[str, str],
+        content: Optional[bytes],
+        timeout: float,
+        **kwargs
+    ) -> TransportResponse:
+        raise NotImplementedError
+
+    def was_sent(self, error: Exception) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class _PooledTransport(Transport):
+    measures_connection = True
+
+    def __init__(
+        self,
+        pool_connections: int = None,
+        pool_maxsize: int = None,
+        pool_block: bool = None,
+        keepalive_timeout: float = None
+    ):
+        self.pool_connections = pool_connections or settings.pool_connections
+        self.pool_maxsize = pool_maxsize or settings.pool_maxsize
+        self.pool_block = settings.pool_block if pool_block is None else pool_block
+        self.keepalive_timeout = keepalive_timeout or settings.keepalive_timeout
+        self._pool = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._pool is None:
+                self._pool = self._create_pool()
+            elif now - self._last_used > self.keepalive_timeout:
+                # Every pooled connection has been idle past the keep-alive window,
+                # so the server has most likely dropped them already.
+                self._reset_pool(self._pool)
+            self._last_used = now
+            return self._pool
+
+    def _create_pool(self):
+        raise NotImplementedError
+
+    def _reset_pool(self, pool) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._reset_pool(self._pool)
+                self._pool = None
+
+
+class RequestsTransport(_PooledTransport):
+    name = "requests"
+
+    def _create_pool(self) -> requests.Session:
+        session = requests.Session()
+        adapter = TimedHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _reset_pool(self, session: requests.Session) -> None:
+        session.close()
+
+    @property
+    def session(self) -> requests.Session:
+        return self.pool
+
+    def send(self, method, url, params, headers, content, timeout, **kwargs) -> TransportResponse:
+        response = self.pool.request(
+            method=method,
+            url=url,
+            data=content,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+            stream=True,
+            **kwargs
+        )
+        return TransportResponse(
+            response.status_code,
+            response.headers,
+            response.elapsed.total_seconds(),
+            lambda: response.content,
+            response.iter_content,
+            response.close
+        )
+
+    def was_sent(self, error: Exception) -> bool:
+        if isinstance(error, requests.ConnectTimeout):
+            return False
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return not isinstance(reason, NewConnectionError)
+
+
+class Urllib3Transport(_PooledTransport):
+    name = "urllib3"
+
+    def _create_pool(self) -> urllib3.PoolManager:
+        manager = urllib3.PoolManager(
+            num_pools=self.pool_connections,
+            maxsize=self.pool_maxsize,
+            block=self.pool_block
+        )
+        manager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+        return manager
+
+    def _reset_pool(self, manager: urllib3.PoolManager) -> None:
+        manager.clear()
+
+    def send(self, method, url, params, headers, content, timeout, **kwargs) -> TransportResponse:
+        started = perf_counter()
+        try:
+            response = self.pool.request(
+                method,
+                with_query(url, params),
+                body=content,
+                headers=headers,
+                timeout=urllib3.Timeout(connect=timeout, read=timeout),
+                retries=False,
+                preload_content=False,
+                **kwargs
+            )
+        # NewConnectionError subclasses ConnectTimeoutError, so it is matched first.
+        except NewConnectionError as e:
+            raise requests.ConnectionError(e) from e
+        except ConnectTimeoutError as e:
+            raise requests.ConnectTimeout(e) from e
+        except ReadTimeoutError as e:
+            raise requests.ReadTimeout(e) from e
+        except HTTPError as e:
+            raise requests.ConnectionError(e) from e
+        elapsed = perf_counter() - started
+
+        def read() -> bytes:
+            try:
+                return response.read()
+            finally:
+                response.release_conn()
+
+        def close() -> None:
+            response.close()
+            response.release_conn()
+
+        return TransportResponse(response.status, response.headers, elapsed, read, response.stream, close)
+
+    def was_sent(self, error: Exception) -> bool:
+        return not isinstance(error.__cause__, (NewConnectionError, ConnectTimeoutError))
+
+
+class HttpxTransport(Transport):
+    name = "httpx"
+
+    def __init__(
+        self,
+        http2: bool = False,
+        pool_connections: int = None,
+        pool_maxsize: int = None,
+        pool_block: bool = None,
+        keepalive_timeout: float = None
+    ):
+        if httpx is None:
+            raise ImportError('HttpxTransport requires httpx: pip install -e ".[async]"')
+        pool_maxsize = pool_maxsize or settings.pool_maxsize
+        pool_block = settings.pool_block if pool_block is None else pool_block
+        self.http2 = http2
+        if http2:
+            self.name = "http2"
+        # http2=True needs the h2 package; httpx raises its own ImportError naming it.
+        self.client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=pool_maxsize if pool_block else None,
+                max_keepalive_connections=pool_maxsize,
+                keepalive_expiry=keepalive_timeout or settings.keepalive_timeout
+            )
+        )
+
+    def send(self, method, url, params, headers, content, timeout, **kwargs) -> TransportResponse:
+        started = perf_counter()
+        try:
+            request = self.client.build_request(
+                method,
+                url,
+                params=normalize_params(params),
+                headers=headers,
+                content=content,
+                timeout=timeout,
+                **kwargs
+            )
+            response = self.client.send(request, stream=True)
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(e) from e
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(e) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e) from e
+        elapsed = perf_counter() - started
+
+        def read() -> bytes:
+            try:
+                return response.read()
+            finally:
+                response.close()
+
+        return TransportResponse(response.status_code, response.headers, elapsed, read, response.iter_bytes, response.close)
+
+    def was_sent(self, error: Exception) -> bool:
+        return not isinstance(error.__cause__, (httpx.ConnectError, httpx.ConnectTimeout))
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def _rechunk(chunks: Iterable[bytes], chunk_size: int) -> Iterator[bytes]:
+    for chunk in chunks:
+        for start in range(0, len(chunk), chunk_size):
+            yield chunk[start:start + chunk_size]
+
+
+class WSGITransport(Transport):
+    # Calls a WSGI app such as PetstoreApp directly: no sockets, no serialization beyond the body itself.
+    name = "wsgi"
+
+    def __init__(self, app):
+        self.app = app
+
+    def send(self, method, url, params, headers, content, timeout, **kwargs) -> TransportResponse:
+        parts = urlsplit(url)
+        query = "&".join(filter(None, (parts.query, normalize_params(params))))
+        body = content or b""
+        environ = {
+            "REQUEST_METHOD": method,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": unquote(parts.path),
+            "QUERY_STRING": query,
+            "SERVER_NAME": parts.hostname or "localhost",
+            "SERVER_PORT": str(parts.port or (443 if parts.scheme == "https" else 80)),
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": parts.scheme or "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in headers.items():
+            key = name.upper().replace("-", "_")
+            if key == "CONTENT_TYPE":
+                environ[key] = value
+            elif key != "CONTENT_LENGTH":
+                environ[f"HTTP_{key}"] = value
+
+        started = perf_counter()
+        response_start = []
+
+        def start_response(status, response_headers, exc_info=None):
+            response_start[:] = [status, response_headers]
+
+        result = self.app(environ, start_response)
+        chunks = iter(result)
+        # start_response may be deferred until the first body chunk is produced.
+        first = next(chunks, b"")
+        elapsed = perf_counter() - started
+        status, response_headers = response_start
+
+        def body_chunks() -> Iterator[bytes]:
+            yield first
+            yield from chunks
+
+        return TransportResponse(
+            int(status.split(" ", 1)[0]),
+            CaseInsensitiveDict(response_headers),
+            elapsed,
+            lambda: b"".join(body_chunks()),
+            lambda chunk_size: _rechunk(body_chunks(), chunk_size),
+            getattr(result, "close", None)
+        )
+
+
+class ASGITransport(Transport):
+    # Runs an ASGI app on a private event loop thread so the blocking client can call it.
+    # The response body is buffered before it is returned.
+    name = "asgi"
+
+    def __init__(self, app):
+        self.app = app
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _run(self, coroutine):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="asgi-transport", daemon=True)
+                self._thread.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _call(self, scope: dict, body: bytes) -> Tuple[dict, List[bytes]]:
+        request_sent = False
+        start, chunks = {}, []
+
+        async def receive() -> dict:
+            nonlocal request_sent
+            if request_sent:
+                return {"type": "http.disconnect"}
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return start, chunks
+
+    def send(self, method, url, params, headers, content, timeout, **kwargs) -> TransportResponse:
+        parts = urlsplit(url)
+        query = "&".join(filter(None, (parts.query, normalize_params(params))))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": parts.scheme or "http",
+            "path": unquote(parts.path),
+            "raw_path": parts.path.encode("latin-1"),
+            "query_string": query.encode("latin-1"),
+            "root_path": "",
+            "headers": [(name.lower().encode("latin-1"), str(value).encode("latin-1")) for name, value in headers.items()],
+            "server": (parts.hostname or "localhost", parts.port or (443 if parts.scheme == "https" else 80)),
+            "client": ("127.0.0.1", 0),
+        }
+        started = perf_counter()
+        try:
+            start, chunks = self._run(asyncio.wait_for(self._call(scope, content or b""), timeout))
+        except asyncio.TimeoutError as e:
+            # Same exception as a slow server behind the network transports, so retry and breaker apply.
+            raise requests.ReadTimeout(f"ASGI app did not respond within {timeout}s") from e
+        elapsed = perf_counter() - started
+        headers = CaseInsensitiveDict(
+            (name.decode("latin-1"), value.decode("latin-1")) for name, value in start.get("headers", ())
+        )
+        return TransportResponse(
+            start["status"],
+            headers,
+            elapsed,
+            lambda: b"".join(chunks),
+            lambda chunk_size: _rechunk(chunks, chunk_size)
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = None
+
+
+TRANSPORTS = {
+    "requests": RequestsTransport,
+    "urllib3": Urllib3Transport,
+    "httpx": HttpxTransport,
+    "http2": lambda **options: HttpxTransport(http2=True, **options),
+}
+
+
+def create_transport(name: str = None, **options) -> Transport:
+    name = name or settings.transport
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown transport: {name}, expected one of {', '.join(TRANSPORTS)}")
+    return TRANSPORTS[name](**options)
@@ -0,0 +1,62 @@
+import argparse
+import json
+from src.api.pet_api import PetApi
+from src.config.settings import settings
+from src.http.client import HttpClient
+from src.http.transport import TRANSPORTS, create_transport
+from src.load.runner import LoadRunner, build_phases, format_report, parse_mix
+from src.metrics.registry import registry
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="andriadis-load",
+        description="Open-loop load generator for the Petstore API built on PetApi"
+    )
+    parser.add_argument("--base-url", default=None, help="Petstore base URL (defaults to settings.base_url)")
+    parser.add_argument("--rate", type=float, required=True, help="Target request rate in the steady phase, req/s")
+    parser.add_argument("--duration", type=float, default=60.0, help="Steady phase length, seconds")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Linear ramp from 0 to --rate, seconds")
+    parser.add_argument("--transport", choices=sorted(TRANSPORTS), default=None, help="HTTP backend (defaults to settings.transport)")
+    parser.add_argument("--workers", type=int, default=64, help="Concurrent worker threads")
+    parser.add_argument(
+        "--mix",
+        default="get=50,create=15,update=15,delete=10,find=10",
+        help="Weighted operation mix, e.g. get=50,create=15,update=15,delete=10,find=10"
+    )
+    parser.add_argument(
+        "--validation",
+        default=None,
+        help="Contract validation mode: full, sampled(rate), first-N or off-but-structural (defaults to settings.validation_mode)"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report as JSON to this file")
+    parser.add_argument("--no-cleanup", action="store_true", help="Keep pets created during the run")
+    parser.add_argument(
+        "--metrics-dir",
+        default=None,
+        help="Collect request metrics and write metrics.prom and metrics.json to this directory"
+    )
+    args = parser.parse_args(argv)
+    settings.metrics_enabled = args.metrics_dir is not None
+
+    mix = parse_mix(args.mix)
+    pool_maxsize = max(args.workers, settings.pool_maxsize)
+    transport = create_transport(args.transport, pool_maxsize=pool_maxsize)
+    with transport, HttpClient(base_url=args.base_url, pool_maxsize=pool_maxsize, transport=transport) as client:
+        runner = LoadRunner(PetApi(client, validation=args.validation), mix, workers=args.workers, seed=args.seed)
+        wall_time = runner.run(build_phases(args.rate, args.duration, args.ramp_up))
+        report = runner.report(wall_time)
+        if not args.no_cleanup:
+            report["cleaned_up"] = runner.cleanup()
+
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.metrics_dir:
+        registry.export(args.metrics_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import math
+import threading
+from typing import Dict, List
+
+
+# Log-linear histogram in the style of HdrHistogram: each power-of-two range of integer
+# values (microseconds here) is split into linear sub-buckets, keeping the relative error
+# within the requested significant figures across the whole trackable range.
+class Histogram:
+
+    def __init__(self, highest_trackable: int = 3_600_000_000, significant_figures: int = 3):
+        self.highest_trackable = highest_trackable
+        self.significant_figures = significant_figures
+        self._sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self._sub_bucket_half = 1 << (self._sub_bucket_bits - 1)
+        buckets = max(1, highest_trackable.bit_length() - self._sub_bucket_bits + 1)
+        self._counts = [0] * ((buckets + 1) * self._sub_bucket_half)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self._lock = threading.Lock()
+
+    def _index(self, value: int) -> int:
+        bucket = max(0, value.bit_length() - self._sub_bucket_bits)
+        return bucket * self._sub_bucket_half + (value >> bucket)
+
+    def _value_at(self, index: int) -> int:
+        bucket = max(0, (index >> (self._sub_bucket_bits - 1)) - 1)
+        sub_bucket = index - bucket * self._sub_bucket_half
+        lowest = sub_bucket << bucket
+        return lowest + ((1 << bucket) - 1) // 2
+
+    def record(self, value: int) -> None:
+        value = min(max(0, int(value)), self.highest_trackable)
+        index = self._index(value)
+        with self._lock:
+            self._counts[index] += 1
+            if self.count == 0 or value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+            self.count += 1
+            self.total += value
+
+    def merge(self, other: "Histogram") -> None:
+        if other._sub_bucket_bits != self._sub_bucket_bits or len(other._counts) != len(self._counts):
+            raise ValueError("Cannot merge histograms with different precision or range")
+        with self._lock:
+            for index, count in enumerate(other._counts):
+                if count:
+                    self._counts[index] += count
+            if other.count:
+                self.min = other.min if self.count == 0 else min(self.min, other.min)
+                self.max = max(self.max, other.max)
+            self.count += other.count
+            self.total += other.total
+
+    def percentile(self, percentile: float) -> int:
+        if self.count == 0:
+            return 0
+        target = max(1, math.ceil(self.count * percentile / 100.0))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return min(self._value_at(index), self.max)
+        return self.max
+
+    def percentiles(self, percentiles: List[float]) -> Dict[float, int]:
+        return {percentile: self.percentile(percentile) for percentile in percentiles}
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
@@ -0,0 +1,235 @@
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+from src.api.pet_api import PetApi
+from src.load.histogram import Histogram
+from src.models.pet import STATUSES
+from src.utils.data_factory import generate_pet
+
+OPERATIONS = ("create", "get", "update", "delete", "find")
+REPORT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+@dataclass
+class Phase:
+    name: str
+    duration: float
+    start_rate: float
+    end_rate: float
+
+
+
+def build_phases(rate: float, duration: float, ramp_up: float = 0.0) -> List[Phase]:
+    phases = []
+    if ramp_up > 0:
+        phases.append(Phase("ramp-up", ramp_up, 0.0, rate))
+    phases.append(Phase("steady", duration, rate, rate))
+    return phases
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}', expected one of {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("Operation mix needs at least one positive weight")
+    return mix
+
+
+def schedule(phases: List[Phase]) -> Iterator[float]:
+    # Intended send offsets are fixed up front and never wait on responses (open loop),
+    # so a slow server shows up as latency instead of silently lowering the request rate.
+    offset = 0.0
+    for phase in phases:
+        slope = (phase.end_rate - phase.start_rate) / phase.duration if phase.duration > 0 else 0.0
+        n = 0
+        while True:
+            # Time of the n-th request: solve start_rate * t + slope * t^2 / 2 = n.
+            if slope:
+                discriminant = phase.start_rate ** 2 + 2 * slope * n
+                if discriminant < 0:
+                    break
+                at = (math.sqrt(discriminant) - phase.start_rate) / slope
+            elif phase.start_rate > 0:
+                at = n / phase.start_rate
+            else:
+                break
+            if at >= phase.duration:
+                break
+            yield offset + at
+            n += 1
+        offset += phase.duration
+
+
+@dataclass
+class OperationStats:
+    latency: Histogram = field(default_factory=Histogram)
+    errors: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_error(self, name: str) -> None:
+        # Worker threads share the stats of an operation.
+        with self._lock:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+
+class NoLivePet(Exception):
+    pass
+
+
+class LivePets:
+    def __init__(self, seed: Optional[int] = None):
+        self._ids: List[int] = []
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+    def add(self, pet_id: int) -> None:
+        with self._lock:
+            self._ids.append(pet_id)
+
+    def pick(self) -> Optional[int]:
+        with self._lock:
+            return self._random.choice(self._ids) if self._ids else None
+
+    def take(self) -> Optional[int]:
+        with self._lock:
+            if not self._ids:
+                return None
+            index = self._random.randrange(len(self._ids))
+            self._ids[index], self._ids[-1] = self._ids[-1], self._ids[index]
+            return self._ids.pop()
+
+    def drain(self) -> List[int]:
+        with self._lock:
+            ids, self._ids = self._ids, []
+            return ids
+
+
+class LoadRunner:
+    def __init__(self, api: PetApi, mix: Dict[str, float], workers: int = 64, seed: Optional[int] = None):
+        self.api = api
+        self.mix = mix
+        self.workers = workers
+        self.stats = {name: OperationStats() for name in OPERATIONS}
+        self.live = LivePets(seed)
+        self.late_starts = 0
+        self._random = random.Random(seed)
+        self._operations: Dict[str, Callable[[], None]] = {
+            "create": self._create,
+            "get": self._get,
+            "update": self._update,
+            "delete": self._delete,
+            "find": self._find,
+        }
+
+    def run(self, phases: List[Phase]) -> float:
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="load") as executor:
+            for offset in schedule(phases):
+                intended = started + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -0.001:
+                    self.late_starts += 1
+                operation = self._random.choices(names, weights)[0]
+                executor.submit(self._execute, operation, intended)
+        return time.perf_counter() - started
+
+    def _execute(self, operation: str, intended: float) -> None:
+        try:
+            try:
+                self._operations[operation]()
+            except NoLivePet:
+                # Nothing to act on yet: the request becomes a create and counts as one, failures included.
+                operation = "create"
+                self._create()
+        except Exception as e:
+            self.stats[operation].record_error(type(e).__name__)
+        finally:
+            self.stats[operation].latency.record((time.perf_counter() - intended) * 1_000_000)
+
+    def _create(self) -> None:
+        pet = self.api.create_pet(generate_pet())
+        self.live.add(pet.id)
+
+    def _live_pet(self, take: bool = False) -> int:
+        pet_id = self.live.take() if take else self.live.pick()
+        if pet_id is None:
+            raise NoLivePet()
+        return pet_id
+
+    def _get(self) -> None:
+        self.api.get_pet(self._live_pet())
+
+    def _update(self) -> None:
+        self.api.update_pet(generate_pet(pet_id=self._live_pet()))
+
+    def _delete(self) -> None:
+        self.api.delete_pet(self._live_pet(take=True))
+
+    def _find(self) -> None:
+        self.api.find_by_status(self._random.choice(STATUSES))
+
+    def cleanup(self) -> int:
+        ids = self.live.drain()
+        self.api.delete_pets(ids, concurrency=self.workers)
+        return len(ids)
+
+    def report(self, wall_time: float) -> dict:
+        operations = {}
+        for name, stats in self.stats.items():
+            histogram = stats.latency
+            if histogram.count == 0:
+                continue
+            operations[name] = {
+                "count": histogram.count,
+                "errors": dict(stats.errors),
+                "throughput": histogram.count / wall_time,
+                "latency_ms": {
+                    **{f"p{percentile:g}": histogram.percentile(percentile) / 1000 for percentile in REPORT_PERCENTILES},
+                    "mean": histogram.mean / 1000,
+                    "max": histogram.max / 1000,
+                },
+            }
+        total = sum(operation["count"] for operation in operations.values())
+        return {
+            "wall_time": wall_time,
+            "requests": total,
+            "throughput": total / wall_time if wall_time else 0.0,
+            "late_starts": self.late_starts,
+            "validation": str(self.api.validation),
+            "operations": operations,
+        }
+
+
+def format_report(report: dict) -> str:
+    columns = ["p50", "p90", "p99", "p99.9", "max"]
+    lines = [
+        f"Requests: {report['requests']} in {report['wall_time']:.1f}s "
+        f"({report['throughput']:.1f} req/s, {report['late_starts']} late starts, validation: {report['validation']})",
+        f"{'operation':<10}{'count':>9}{'errors':>8}{'req/s':>9}" + "".join(f"{column + ' ms':>11}" for column in columns),
+    ]
+    for name, operation in report["operations"].items():
+        latency = operation["latency_ms"]
+        lines.append(
+            f"{name:<10}{operation['count']:>9}{sum(operation['errors'].values()):>8}{operation['throughput']:>9.1f}"
+            + "".join(f"{latency[column]:>11.2f}" for column in columns)
+        )
+        for error, count in sorted(operation["errors"].items()):
+            lines.append(f"{'':<10}  {error}: {count}")
+    return "\n".join(lines)
@@ -0,0 +1,120 @@
+from functools import wraps
+from time import perf_counter
+from urllib.parse import urlsplit
+from src.http.endpoints import path_template
+from src.http.response import ResponseContext
+from src.metrics.registry import MetricsRegistry, registry as default_registry
+
+PET_API_METHODS = ("create_pet", "get_pet", "update_pet", "delete_pet", "find_by_status")
+
+
+def _path(client, url: str) -> str:
+    if url.startswith(client.base_url):
+        url = url[len(client.base_url):]
+    else:
+        url = urlsplit(url).path
+    return path_template(url)
+
+
+def instrument_client(client, registry: MetricsRegistry = None) -> None:
+    registry = registry or default_registry
+    requests_total = registry.counter(
+        "petstore_http_requests_total", "HTTP responses by method, path template and status code",
+        ("method", "path", "status")
+    )
+    duration = registry.histogram(
+        "petstore_http_request_duration_seconds", "Time from sending a request to receiving its full body",
+        ("method", "path")
+    )
+    validation = registry.histogram(
+        "petstore_http_validation_duration_seconds", "Contract validation time per response",
+        ("method", "path")
+    )
+    validated = registry.counter(
+        "petstore_validation_objects_total", "Parsed objects by validation mode and whether they were fully validated",
+        ("method", "path", "mode", "checked")
+    )
+    rate_limit_wait = registry.histogram(
+        "petstore_http_rate_limit_wait_seconds", "Time queued on the client-side rate limiter before sending",
+        ("method", "path")
+    )
+    in_flight = registry.gauge(
+        "petstore_http_in_flight_requests", "Requests sent and not yet answered",
+        ("method", "path")
+    )
+    errors = registry.counter(
+        "petstore_errors_total", "Failed calls by method, path template, status and exception type",
+        ("method", "path", "status", "exception")
+    )
+
+    def on_request(method: str, url: str) -> None:
+        in_flight.inc(method=method, path=_path(client, url))
+
+    def on_response(response) -> None:
+        path = _path(client, response.url)
+        in_flight.dec(method=response.method, path=path)
+        requests_total.inc(method=response.method, path=path, status=response.status_code)
+        total = response.timings.total
+        duration.observe(response.elapsed if total is None else total, method=response.method, path=path)
+        if response.timings.rate_limit_wait is not None:
+            rate_limit_wait.observe(response.timings.rate_limit_wait, method=response.method, path=path)
+
+    def on_parsed(response) -> None:
+        path = _path(client, response.url)
+        if response.timings.validation is not None:
+            validation.observe(response.timings.validation, method=response.method, path=path)
+        record = response.validation
+        if record is not None:
+            if record.checked:
+                validated.inc(record.checked, method=response.method, path=path, mode=record.mode, checked="true")
+            if record.total > record.checked:
+                validated.inc(record.total - record.checked, method=response.method, path=path, mode=record.mode, checked="false")
+
+    def on_error(method: str, url: str, error: Exception) -> None:
+        path = _path(client, url)
+        in_flight.dec(method=method, path=path)
+        errors.inc(method=method, path=path, status="", exception=type(error).__name__)
+
+    client.add_hook("request", on_request)
+    client.add_hook("response", on_response)
+    client.add_hook("parsed", on_parsed)
+    client.add_hook("error", on_error)
+
+
+def instrument_pet_api(api, registry: MetricsRegistry = None) -> None:
+    registry = registry or default_registry
+    errors = registry.counter(
+        "petstore_errors_total", "Failed calls by method, path template, status and exception type",
+        ("method", "path", "status", "exception")
+    )
+    calls = registry.histogram(
+        "petstore_api_call_duration_seconds", "PetApi call time including validation, by operation and outcome",
+        ("operation", "outcome")
+    )
+
+    def wrap(name: str, method):
+        @wraps(method)
+        def observed(*args, **kwargs):
+            started = perf_counter()
+            outcome = "ok"
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                outcome = type(e).__name__
+                # ApiError, PetNotFoundError and ContractViolationError carry the offending response;
+                # transport failures are already counted by the client's error hook.
+                response = getattr(e, "response", None)
+                if isinstance(response, ResponseContext):
+                    errors.inc(
+                        method=response.method,
+                        path=_path(api.client, response.url),
+                        status=response.status_code,
+                        exception=outcome
+                    )
+                raise
+            finally:
+                calls.observe(perf_counter() - started, operation=name, outcome=outcome)
+        return observed
+
+    for name in PET_API_METHODS:
+        setattr(api, name, wrap(name, getattr(api, name)))
@@ -1,6 +1,9 @@
-from typing import Literal, Optional
+from typing import Literal, Optional, get_args
 from src.models.base import BaseStrictModel
 
+PetStatus = Literal["available", "pending", "sold"]
+STATUSES = get_args(PetStatus)
+
 
 class Category(BaseStrictModel):
     id: Optional[int] = None
@@ -18,5 +21,5 @@ class Pet(BaseStrictModel):
     name: str
     photoUrls: list[str]
     tags: Optional[list[Tag]] = None
-    status: Optional[Literal["available", "pending", "sold"]] = None
+    status: Optional[PetStatus] = None
 
@@ -0,0 +1,221 @@
+from array import array
+from collections.abc import Sequence
+from itertools import compress
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from pydantic_core import to_json
+from src.contracts.validators import type_adapter
+from src.models.pet import STATUSES, Pet
+
+# Interned status codes; the last one stands for a pet without status.
+STATUS_CODES = (*STATUSES, None)
+MATERIALIZE_CHUNK = 1024
+
+# Pet JSON laid out like pydantic_core.to_json(pet), filled from pre-rendered fragments. generate_pets uses it too.
+PET_JSON = b'{"id":%d,"category":%s,"name":%s,"photoUrls":[%s],"tags":%s,"status":%s}'
+STATUS_JSON = [to_json(status) for status in STATUS_CODES]
+
+NamedRef = Tuple[Optional[int], Optional[str]]
+
+
+def _intern(table: List, index: Dict, value) -> int:
+    code = index.get(value)
+    if code is None:
+        code = index[value] = len(table)
+        table.append(value)
+    return code
+
+
+def named_json(item: NamedRef) -> bytes:
+    return to_json({"id": item[0], "name": item[1]})
+
+
+def _matches(item: NamedRef, wanted: Union[int, str]) -> bool:
+    # ints select by id, strings by name
+    return item[0 if isinstance(wanted, int) else 1] == wanted
+
+
+class PetBatch(Sequence):
+    # Pets stored column by column, a few bytes per pet instead of a Pet with nested models and lists.
+    # Strings, categories and tags live once in shared tables and rows refer to them by index. Photo URLs and
+    # tags are flat columns that rows slice by start and count, so subsets only copy the fixed-width columns
+    # and share the flat ones. Pet objects are only built on access.
+    def __init__(
+        self,
+        ids: array,
+        names: array,
+        statuses: array,
+        categories: array,
+        photo_starts: array,
+        photo_counts: array,
+        tag_starts: array,
+        tag_counts: array,
+        has_tags: array,
+        source_rows: array,
+        photos: array,
+        tags: array,
+        tag_rows: array,
+        name_table: List[str],
+        url_table: List[str],
+        category_table: List[Optional[NamedRef]],
+        tag_table: List[NamedRef]
+    ):
+        self.ids = ids
+        self.names = names
+        self.statuses = statuses
+        self.categories = categories
+        self.photo_starts = photo_starts
+        self.photo_counts = photo_counts
+        self.tag_starts = tag_starts
+        self.tag_counts = tag_counts
+        self.has_tags = has_tags
+        # Row of each pet in the batch the flat columns were built for; tag_rows refers to those rows.
+        self.source_rows = source_rows
+        self.photos = photos
+        self.tags = tags
+        self.tag_rows = tag_rows
+        self.name_table = name_table
+        self.url_table = url_table
+        self.category_table = category_table
+        self.tag_table = tag_table
+        self._json_tables = None
+
+    @classmethod
+    def from_pets(cls, pets: Iterable[Pet]) -> "PetBatch":
+        ids, names, statuses, categories = array("q"), array("I"), array("B"), array("I")
+        photo_starts, photo_counts, photos = array("I"), array("I"), array("I")
+        tag_starts, tag_counts, has_tags, tags, tag_rows = array("I"), array("I"), array("B"), array("I"), array("I")
+        name_table, url_table, category_table, tag_table = [], [], [None], []
+        name_index, url_index, category_index, tag_index = {}, {}, {None: 0}, {}
+        status_codes = {status: code for code, status in enumerate(STATUS_CODES)}
+
+        for row, pet in enumerate(pets):
+            ids.append(pet.id)
+            names.append(_intern(name_table, name_index, pet.name))
+            statuses.append(status_codes[pet.status])
+            category = pet.category
+            categories.append(_intern(
+                category_table, category_index, None if category is None else (category.id, category.name)
+            ))
+            photo_starts.append(len(photos))
+            photos.extend([_intern(url_table, url_index, url) for url in pet.photoUrls])
+            photo_counts.append(len(pet.photoUrls))
+            tag_starts.append(len(tags))
+            has_tags.append(pet.tags is not None)
+            for tag in pet.tags or ():
+                tags.append(_intern(tag_table, tag_index, (tag.id, tag.name)))
+                tag_rows.append(row)
+            tag_counts.append(len(tags) - tag_starts[-1])
+
+        return cls(
+            ids, names, statuses, categories, photo_starts, photo_counts, tag_starts, tag_counts, has_tags,
+            array("I", range(len(ids))), photos, tags, tag_rows, name_table, url_table, category_table, tag_table
+        )
+
+    def to_pets(self) -> List[Pet]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Pet, List[Pet]]:
+        if isinstance(index, slice):
+            return self._materialize(range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("pet index out of range")
+        return type_adapter(Pet).validate_json(self._row_json(index))
+
+    def __iter__(self) -> Iterator[Pet]:
+        for start in range(0, len(self), MATERIALIZE_CHUNK):
+            yield from self._materialize(range(start, min(start + MATERIALIZE_CHUNK, len(self))))
+
+    def _materialize(self, rows: Iterable[int]) -> List[Pet]:
+        # Same route as PetColumns: one JSON array validated by pydantic-core beats model_construct per pet.
+        return type_adapter(List[Pet]).validate_json(b"[" + b",".join(map(self._row_json, rows)) + b"]")
+
+    def _row_json(self, row: int) -> bytes:
+        if self._json_tables is None:
+            # Fragments are rendered once per table entry, not once per pet.
+            self._json_tables = (
+                [to_json(name) for name in self.name_table],
+                [to_json(url) for url in self.url_table],
+                [b"null" if item is None else named_json(item) for item in self.category_table],
+                [named_json(item) for item in self.tag_table]
+            )
+        names, urls, categories, tags = self._json_tables
+        start = self.photo_starts[row]
+        photos = self.photos[start:start + self.photo_counts[row]]
+        if self.has_tags[row]:
+            start = self.tag_starts[row]
+            tags_json = b"[" + b",".join(tags[tag] for tag in self.tags[start:start + self.tag_counts[row]]) + b"]"
+        else:
+            tags_json = b"null"
+        return PET_JSON % (
+            self.ids[row],
+            categories[self.categories[row]],
+            names[self.names[row]],
+            b",".join(urls[photo] for photo in photos),
+            tags_json,
+            STATUS_JSON[self.statuses[row]]
+        )
+
+    def take(self, rows: Iterable[int]) -> "PetBatch":
+        # New batch with the given rows; flat columns and tables are shared, not copied.
+        rows = list(rows)
+        if len(rows) == 1:
+            pick = lambda column: (column[rows[0]],)
+        elif rows:
+            pick = itemgetter(*rows)
+        else:
+            pick = lambda column: ()
+        return PetBatch(
+            *(array(column.typecode, pick(column)) for column in self._row_columns()),
+            self.photos, self.tags, self.tag_rows, self.name_table, self.url_table, self.category_table, self.tag_table
+        )
+
+    def _row_columns(self) -> Tuple[array, ...]:
+        return (
+            self.ids, self.names, self.statuses, self.categories, self.photo_starts, self.photo_counts,
+            self.tag_starts, self.tag_counts, self.has_tags, self.source_rows
+        )
+
+    # Filters scan whole columns with C-level iterators (bytes.translate, map, compress) and return a new batch.
+
+    def with_status(self, *statuses: Optional[str]) -> "PetBatch":
+        wanted = {STATUS_CODES.index(status) for status in statuses}
+        mask = self.statuses.tobytes().translate(bytes(code in wanted for code in range(256)))
+        return self.take(compress(range(len(self)), mask))
+
+    def in_category(self, *categories: Union[int, str]) -> "PetBatch":
+        wanted = {
+            code for code, item in enumerate(self.category_table)
+            if item is not None and any(_matches(item, category) for category in categories)
+        }
+        return self.take(compress(range(len(self)), map(wanted.__contains__, self.categories)))
+
+    def with_tag(self, *tags: Union[int, str]) -> "PetBatch":
+        wanted = {code for code, item in enumerate(self.tag_table) if any(_matches(item, tag) for tag in tags)}
+        matched = set(compress(self.tag_rows, map(wanted.__contains__, self.tags)))
+        return self.take(compress(range(len(self)), map(matched.__contains__, self.source_rows)))
+
+    def filter(
+        self,
+        status: Optional[str] = None,
+        tag: Union[int, str, None] = None,
+        category: Union[int, str, None] = None
+    ) -> "PetBatch":
+        batch = self
+        if status is not None:
+            batch = batch.with_status(status)
+        if category is not None:
+            batch = batch.in_category(category)
+        if tag is not None:
+            batch = batch.with_tag(tag)
+        return batch
+
+    @property
+    def column_bytes(self) -> int:
+        # Array storage, including flat columns shared with other batches; the tables come on top.
+        return sum(column.itemsize * len(column) for column in (*self._row_columns(), self.photos, self.tags, self.tag_rows))
@@ -0,0 +1,331 @@
+import contextlib
+import io
+import os
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+import pytest
+# Mirrors pytest 8.1+ internals: the exported pytest.FixtureDef (cached_result, _finalizers), SetupState.stack
+# entries of (finalizers, (exc, tb)), runner._update_current_test_var and the logging/warnings item wrappers
+# below, last checked against pytest 9.1. pyproject.toml requires pytest>=8.1 for them.
+from _pytest import runner
+from _pytest.logging import LogCaptureHandler, caplog_handler_key, caplog_records_key, catching_logs
+from _pytest.outcomes import TEST_OUTCOME
+from _pytest.warnings import catch_warnings_for_item
+
+if sys.version_info < (3, 11):
+    from exceptiongroup import BaseExceptionGroup
+
+try:
+    from pytest_timeout import _get_item_settings
+except ImportError:
+    _get_item_settings = None
+
+SERIAL_MARKER = "serial"
+# Fixtures that patch or capture process-wide state; a test using one cannot share the process with others.
+PROCESS_STATE_FIXTURES = frozenset({
+    "monkeypatch", "capsys", "capsysbinary", "capfd", "capfdbinary", "caplog", "recwarn"
+})
+
+
+def runs_serially(item: pytest.Item) -> bool:
+    if item.get_closest_marker(SERIAL_MARKER) is not None:
+        return True
+    fixturenames = getattr(item, "fixturenames", ())
+    if PROCESS_STATE_FIXTURES.intersection(fixturenames):
+        return True
+    # A parametrized module or session fixture is rebuilt per parameter, under the feet of tests still using it.
+    return any(fixturedef.params is not None for fixturedef in _shared_fixturedefs(item))
+
+
+def _shared_fixturedefs(item: pytest.Item) -> List:
+    fixtureinfo = getattr(item, "_fixtureinfo", None)
+    if fixtureinfo is None:
+        return []
+    return [defs[-1] for defs in fixtureinfo.name2fixturedefs.values() if defs and defs[-1].scope != "function"]
+
+
+class ConcurrentSetupState:
+    # Drop-in for pytest's SetupState when several items run at once. pytest keeps one stack of collectors
+    # and tears a collector down as soon as the next item leaves it; here collectors are reference-counted
+    # over the session's items and torn down after the last item that needs them, whichever thread that is.
+    def __init__(self, items: List[pytest.Item]):
+        self.stack: Dict = {}
+        self._users = Counter(node for item in items for node in item.listchain()[:-1])
+        self._lock = threading.RLock()
+        # Module and session fixtures are cached on their definition without locking, so items that need
+        # one are set up one at a time; their test bodies still overlap.
+        self._fixture_lock = threading.RLock()
+        self._local = threading.local()
+
+    def is_node_active(self, node) -> bool:
+        return node in self.stack
+
+    def setup(self, item: pytest.Item) -> None:
+        self._local.item = item
+        with self._lock:
+            for collector in item.listchain()[:-1]:
+                entry = self.stack.get(collector)
+                if entry is None:
+                    self.stack[collector] = ([collector.teardown], None)
+                    try:
+                        collector.setup()
+                    except TEST_OUTCOME as exc:
+                        self.stack[collector] = (self.stack[collector][0], (exc, exc.__traceback__))
+                        raise
+                elif entry[1]:
+                    raise entry[1][0].with_traceback(entry[1][1])
+            self.stack[item] = ([item.teardown], None)
+        lock = self._fixture_lock if _shared_fixturedefs(item) else contextlib.nullcontext()
+        with lock:
+            item.setup()
+
+    def addfinalizer(self, finalizer, node) -> None:
+        assert callable(finalizer)
+        with self._lock:
+            assert node in self.stack, (node, self.stack)
+            self.stack[node][0].append(finalizer)
+
+    def teardown_exact(self, nextitem: Optional[pytest.Item]) -> None:
+        # nextitem is meaningless when items overlap: the thread's own item is torn down, plus the
+        # collectors it was the last user of. Without a current item (session end) everything left goes.
+        item = getattr(self._local, "item", None)
+        self._local.item = None
+        exceptions: List[BaseException] = []
+        if item is None:
+            with self._lock:
+                while self.stack:
+                    node, (finalizers, _) = self.stack.popitem()
+                    self._finalize(node, finalizers, exceptions)
+        else:
+            finalizers = self.stack.pop(item, ([], None))[0]
+            self._finalize(item, finalizers, exceptions)
+            with self._lock:
+                for collector in reversed(item.listchain()[:-1]):
+                    self._users[collector] -= 1
+                    if self._users[collector] <= 0 and collector in self.stack:
+                        self._finalize(collector, self.stack.pop(collector)[0], exceptions)
+        if len(exceptions) == 1:
+            raise exceptions[0]
+        if exceptions:
+            raise BaseExceptionGroup("errors during test teardown", exceptions[::-1])
+
+    @staticmethod
+    def _finalize(node, finalizers: List, exceptions: List[BaseException]) -> None:
+        errors = []
+        while finalizers:
+            try:
+                finalizers.pop()()
+            except TEST_OUTCOME as e:
+                errors.append(e)
+        if len(errors) == 1:
+            exceptions.extend(errors)
+        elif errors:
+            exceptions.append(BaseExceptionGroup(f"errors while tearing down {node!r}", errors[::-1]))
+
+
+class _ThreadLocalFixtureDef(pytest.FixtureDef):
+    # A function-scoped FixtureDef caches its value and finalizers on itself, which would hand one test's
+    # fixture to another running at the same time; while items overlap both are kept per thread.
+    @property
+    def cached_result(self):
+        return getattr(self.__dict__["_thread_state"], "cached_result", None)
+
+    @cached_result.setter
+    def cached_result(self, value) -> None:
+        self.__dict__["_thread_state"].cached_result = value
+
+    @property
+    def _finalizers(self) -> List:
+        state = self.__dict__["_thread_state"]
+        if not hasattr(state, "finalizers"):
+            state.finalizers = []
+        return state.finalizers
+
+
+@contextlib.contextmanager
+def thread_local_fixtures(items: List[pytest.Item]) -> Iterator[None]:
+    fixturedefs = {
+        fixturedef
+        for item in items if getattr(item, "_fixtureinfo", None) is not None
+        for defs in item._fixtureinfo.name2fixturedefs.values()
+        for fixturedef in defs
+        if type(fixturedef) is pytest.FixtureDef and fixturedef.scope == "function"
+    }
+    for fixturedef in fixturedefs:
+        fixturedef.__dict__["_thread_state"] = threading.local()
+        fixturedef.__class__ = _ThreadLocalFixtureDef
+    try:
+        yield
+    finally:
+        for fixturedef in fixturedefs:
+            fixturedef.__class__ = pytest.FixtureDef
+            del fixturedef.__dict__["_thread_state"]
+
+
+@contextlib.contextmanager
+def shared_current_test_var() -> Iterator[None]:
+    # PYTEST_CURRENT_TEST is set and popped around every phase; overlapping phases would pop it twice.
+    update = runner._update_current_test_var
+    lock = threading.Lock()
+
+    def update_shared(item, when) -> None:
+        with lock:
+            if when is None:
+                os.environ.pop("PYTEST_CURRENT_TEST", None)
+            else:
+                update(item, when)
+
+    runner._update_current_test_var = update_shared
+    try:
+        yield
+    finally:
+        runner._update_current_test_var = update
+
+
+class _ThreadStream(io.TextIOBase):
+    # sys.stdout/sys.stderr stand-in: writes from a thread running a test go to that test's buffer.
+    def __init__(self, target, local: threading.local, index: int):
+        self._target = target
+        self._local = local
+        self._index = index
+
+    def write(self, text: str) -> int:
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            return self._target.write(text)
+        return buffers[self._index].write(text)
+
+    def flush(self) -> None:
+        self._target.flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self._target, name)
+
+
+class ConcurrentRunner:
+    # pytest plugin: runs the session's items on a thread pool of `concurrency` threads. Items marked
+    # `serial`, or using fixtures that patch process-wide state, run afterwards one at a time in the main
+    # thread. Reports are logged from the main thread as items finish, each with its own captured output.
+    def __init__(self, config: pytest.Config, concurrency: int):
+        self.config = config
+        self.concurrency = concurrency
+        self._local = threading.local()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session: pytest.Session) -> bool:
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            raise session.Interrupted(
+                f"{session.testsfailed} error{'s' if session.testsfailed != 1 else ''} during collection"
+            )
+        if session.config.option.collectonly:
+            return True
+
+        session._setupstate = ConcurrentSetupState(session.items)
+        concurrent = [item for item in session.items if not runs_serially(item)]
+        serial = [item for item in session.items if runs_serially(item)]
+        if concurrent:
+            with catch_warnings_for_item(self.config, ihook=self.config.hook, when="runtest", item=None):
+                with thread_local_fixtures(concurrent), shared_current_test_var(), self._thread_aware_reporting():
+                    self._run_concurrently(session, concurrent)
+            self._check_stop(session)
+        for item in serial:
+            item.config.hook.pytest_runtest_protocol(item=item, nextitem=None)
+            self._check_stop(session)
+        return True
+
+    def _run_concurrently(self, session: pytest.Session, items: List[pytest.Item]) -> None:
+        pending = iter(items)
+        running = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="pytest-concurrent") as pool:
+            while True:
+                while len(running) < self.concurrency and not (session.shouldfail or session.shouldstop):
+                    item = next(pending, None)
+                    if item is None:
+                        break
+                    running.add(pool.submit(self._run_item, item))
+                if not running:
+                    return
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._log(*future.result())
+
+    def _run_item(self, item: pytest.Item) -> Tuple[pytest.Item, List[pytest.TestReport]]:
+        # pytest_runtest_protocol is not called here: its warnings wrapper swaps process-wide filters,
+        # so only the per-test timeout it would install is applied directly.
+        timeout = _get_item_settings(item) if _get_item_settings is not None else None
+        timed = timeout is not None and timeout.timeout and not timeout.func_only
+        if timed:
+            item.config.hook.pytest_timeout_set_timer(item=item, settings=timeout)
+        try:
+            return item, runner.runtestprotocol(item, log=False, nextitem=None)
+        finally:
+            if timed:
+                item.config.hook.pytest_timeout_cancel_timer(item=item)
+
+    @staticmethod
+    def _log(item: pytest.Item, reports: List[pytest.TestReport]) -> None:
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+
+    @staticmethod
+    def _check_stop(session: pytest.Session) -> None:
+        if session.shouldfail:
+            raise session.Failed(session.shouldfail)
+        if session.shouldstop:
+            raise session.Interrupted(session.shouldstop)
+
+    @contextlib.contextmanager
+    def _thread_aware_reporting(self) -> Iterator[None]:
+        # pytest captures output and logs per phase through process-wide redirection; while items overlap
+        # both are routed per thread instead.
+        capman = self.config.pluginmanager.getplugin("capturemanager")
+        logging_plugin = self.config.pluginmanager.getplugin("logging-plugin")
+        streams = sys.stdout, sys.stderr
+        if capman is not None and capman.is_globally_capturing():
+            capman.item_capture = self._item_capture
+            sys.stdout = _ThreadStream(streams[0], self._local, 0)
+            sys.stderr = _ThreadStream(streams[1], self._local, 1)
+        if logging_plugin is not None:
+            logging_plugin._runtest_for = lambda item, when: self._item_logs(logging_plugin, item, when)
+        try:
+            yield
+        finally:
+            sys.stdout, sys.stderr = streams
+            if capman is not None:
+                capman.__dict__.pop("item_capture", None)
+            if logging_plugin is not None:
+                logging_plugin.__dict__.pop("_runtest_for", None)
+
+    @contextlib.contextmanager
+    def _item_capture(self, when: str, item: pytest.Item) -> Iterator[None]:
+        self._local.buffers = io.StringIO(), io.StringIO()
+        try:
+            yield
+        finally:
+            out, err = self._local.buffers
+            self._local.buffers = None
+            item.add_report_section(when, "stdout", out.getvalue())
+            item.add_report_section(when, "stderr", err.getvalue())
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _item_logs(logging_plugin, item: pytest.Item, when: str) -> Iterator[None]:
+        # Same as LoggingPlugin._runtest_for, with private handlers that only take this thread's records.
+        thread = threading.get_ident()
+        caplog_handler, report_handler = LogCaptureHandler(), LogCaptureHandler()
+        for handler in (caplog_handler, report_handler):
+            handler.setFormatter(logging_plugin.formatter)
+            handler.addFilter(lambda record: record.thread == thread)
+        with catching_logs(caplog_handler, level=logging_plugin.log_level), \
+                catching_logs(report_handler, level=logging_plugin.log_level):
+            item.stash[caplog_records_key][when] = caplog_handler.records
+            item.stash[caplog_handler_key] = caplog_handler
+            try:
+                yield
+            finally:
+                item.add_report_section(when, "log", report_handler.stream.getvalue().strip())
@@ -0,0 +1,394 @@
+import heapq
+import json
+import os
+import queue
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import pytest
+from src.utils.id_allocator import PREFIX_BITS, set_allocator
+
+DURATIONS_KEY = "petstore/durations"
+# Options that only make sense in the coordinator; a local worker gets the remaining command line.
+COORDINATOR_OPTIONS = (
+    "--dist-workers", "--dist-remote", "--dist-listen", "--junitxml", "--junit-xml", "--basetemp",
+    "--lfnf", "--last-failed-no-failures"
+)
+# Cacheprovider selections happen on the coordinator; workers run without the plugin and reject these.
+COORDINATOR_FLAGS = (
+    "--lf", "--last-failed", "--ff", "--failed-first", "--nf", "--new-first", "--sw", "--stepwise",
+    "--sw-skip", "--stepwise-skip", "--sw-reset", "--stepwise-reset", "--cache-clear"
+)
+DEFAULT_DURATION = 1.0
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise pytest.UsageError(f"Expected HOST:PORT, got {address!r}")
+    return host, int(port)
+
+
+class Channel:
+    # Newline-delimited JSON messages over a socket; sends may come from several threads.
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._reader = sock.makefile("rb")
+        self._lock = threading.Lock()
+
+    def send(self, message: dict) -> None:
+        data = json.dumps(message, default=str).encode() + b"\n"
+        with self._lock:
+            self.sock.sendall(data)
+
+    def recv(self) -> Optional[dict]:
+        try:
+            line = self._reader.readline()
+        except OSError:
+            return None
+        return json.loads(line) if line else None
+
+    def close(self) -> None:
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._reader.close()
+        self.sock.close()
+
+
+def partition(nodeids: List[str], durations: Dict[str, float], count: int) -> List[List[str]]:
+    # Longest-processing-time-first over test files: keeping a file on one worker keeps its module
+    # fixtures there, and the largest files are spread first. Within a file collection order is kept.
+    groups: Dict[str, List[str]] = {}
+    for nodeid in nodeids:
+        groups.setdefault(nodeid.split("::")[0], []).append(nodeid)
+    estimate = estimator(durations)
+    costs = sorted(((sum(map(estimate, group)), path) for path, group in groups.items()), reverse=True)
+    partitions: List[List[str]] = [[] for _ in range(count)]
+    loads = [(0.0, index) for index in range(count)]
+    for cost, path in costs:
+        load, index = heapq.heappop(loads)
+        partitions[index].extend(groups[path])
+        heapq.heappush(loads, (load + cost, index))
+    return partitions
+
+
+def estimator(durations: Dict[str, float]):
+    # Tests without history are assumed to take as long as a typical test that has some.
+    default = statistics.median(durations.values()) if durations else DEFAULT_DURATION
+    return lambda nodeid: durations.get(nodeid, default)
+
+
+class WorkQueue:
+    # One deque per expected worker. A worker takes from the front of its own deque and, once that is
+    # empty, steals the back half of the deque with the most estimated time left, so workers that got
+    # unlucky with their share stop being the long pole.
+    def __init__(self, partitions: List[List[str]], durations: Dict[str, float]):
+        self.deques: List[Deque[str]] = [deque(part) for part in partitions]
+        self.owners: List[Optional[str]] = [None] * len(self.deques)
+        self.estimate = estimator(durations)
+        self.steals = 0
+
+    def claim(self, worker: str) -> int:
+        for index, owner in enumerate(self.owners):
+            if owner is None:
+                self.owners[index] = worker
+                return index
+        self.deques.append(deque())
+        self.owners.append(worker)
+        return len(self.deques) - 1
+
+    def release(self, index: int, unfinished: List[str]) -> None:
+        # The deque of a lost worker stays behind for the others to steal from.
+        self.owners[index] = None
+        self.deques[index].extendleft(reversed(unfinished))
+
+    def next(self, index: int) -> Optional[str]:
+        own = self.deques[index]
+        if not own:
+            self._steal(own)
+        return own.popleft() if own else None
+
+    def _steal(self, own: Deque[str]) -> None:
+        remaining = [(sum(map(self.estimate, victim)), victim) for victim in self.deques if victim and victim is not own]
+        if not remaining:
+            return
+        _, victim = max(remaining, key=lambda entry: entry[0])
+        taken = [victim.pop() for _ in range((len(victim) + 1) // 2)]
+        own.extend(reversed(taken))
+        self.steals += 1
+
+    def __len__(self) -> int:
+        return sum(map(len, self.deques))
+
+
+class _RemoteWorker:
+    def __init__(self, channel: Channel):
+        self.channel = channel
+        self.name = "?"
+        self.index: Optional[int] = None
+        self.assigned: List[str] = []
+        self.running: Optional[str] = None
+        self.tests = 0
+        self.busy = 0.0
+        self.finished = False
+
+
+class Coordinator:
+    # pytest plugin for the coordinating process: it collects the suite, hands test ids to workers that
+    # connect over TCP, and turns the reports they stream back into this session's own reports, so the
+    # terminal summary, exit code, --lf cache and JUnit XML cover the whole run.
+    def __init__(self, config: pytest.Config, local_workers: int, remote_workers: int, listen: str):
+        self.config = config
+        self.local_workers = local_workers
+        self.remote_workers = remote_workers
+        self.listen = parse_address(listen)
+        self.run_id = int.from_bytes(os.urandom(4), "big") % ((1 << PREFIX_BITS) - 1) + 1
+        self.workers: List[_RemoteWorker] = []
+        self.processes: List[subprocess.Popen] = []
+        self.durations: Dict[str, float] = {}
+        self._events: "queue.Queue[Tuple[str, _RemoteWorker, Optional[dict]]]" = queue.Queue()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session: pytest.Session) -> bool:
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            raise session.Interrupted(
+                f"{session.testsfailed} error{'s' if session.testsfailed != 1 else ''} during collection"
+            )
+        if session.config.option.collectonly:
+            return True
+
+        self.items = {item.nodeid: item for item in session.items}
+        cache = getattr(self.config, "cache", None)
+        history = cache.get(DURATIONS_KEY, {}) if cache is not None else {}
+        count = max(1, self.local_workers + self.remote_workers)
+        self.queue = WorkQueue(partition(list(self.items), history, count), history)
+        server = socket.create_server(self.listen)
+        self.address = server.getsockname()[:2]
+        threading.Thread(target=self._accept, args=(server,), daemon=True).start()
+        try:
+            self._spawn_local_workers()
+            self._serve(session)
+        finally:
+            server.close()
+            self._stop_local_workers()
+            if cache is not None:
+                cache.set(DURATIONS_KEY, {**history, **self.durations})
+        return True
+
+    def _accept(self, server: socket.socket) -> None:
+        while True:
+            try:
+                sock, _ = server.accept()
+            except OSError:
+                return
+            worker = _RemoteWorker(Channel(sock))
+            threading.Thread(target=self._read, args=(worker,), daemon=True).start()
+
+    def _read(self, worker: _RemoteWorker) -> None:
+        # Messages of one worker are queued in order; the main thread handles all of them.
+        while True:
+            message = worker.channel.recv()
+            if message is None:
+                self._events.put(("closed", worker, None))
+                return
+            self._events.put(("message", worker, message))
+
+    def _spawn_local_workers(self) -> None:
+        args = worker_args(self.config.invocation_params.args)
+        host, port = self.address
+        basetemp = self.config.option.basetemp
+        for index in range(self.local_workers):
+            command = [sys.executable, "-m", "pytest", *args, "-p", "no:cacheprovider", "-qq",
+                       "--dist-connect", f"{host}:{port}"]
+            if basetemp:
+                # Every pytest process empties its basetemp on start, so workers cannot share one.
+                command.append(f"--basetemp={os.path.join(basetemp, f'worker-{index}')}")
+            env = dict(os.environ, PETSTORE_RUN_ID=str(self.run_id), PETSTORE_WORKER_ID=str(index))
+            self.processes.append(subprocess.Popen(
+                command, cwd=self.config.invocation_params.dir, env=env, stdout=subprocess.DEVNULL
+            ))
+
+    def _stop_local_workers(self) -> None:
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    def _serve(self, session: pytest.Session) -> None:
+        connected = False
+        while True:
+            active = [worker for worker in self.workers if not worker.finished]
+            if connected and not active and (not self.queue or self._stopping(session)):
+                return
+            if not active and self.processes and all(process.poll() is not None for process in self.processes) \
+                    and not self.remote_workers and self._events.empty():
+                raise session.Failed(f"All workers exited with {len(self.queue)} tests not run")
+            try:
+                kind, worker, message = self._events.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if kind == "closed":
+                self._lost(worker)
+            else:
+                connected = True
+                self._handle(session, worker, message)
+
+    @staticmethod
+    def _stopping(session: pytest.Session) -> bool:
+        return bool(session.shouldfail or session.shouldstop)
+
+    def _handle(self, session: pytest.Session, worker: _RemoteWorker, message: dict) -> None:
+        hook = self.config.hook
+        kind = message["type"]
+        if kind == "hello":
+            worker.name = message["name"]
+            # Workers collect without --lf, -k and the like, so they only need every test we selected.
+            missing = set(self.items).difference(message["nodeids"])
+            if missing:
+                worker.finished = True
+                error = f"{len(missing)} selected tests were not collected, e.g. {min(missing)}"
+                worker.channel.send({"type": "shutdown", "error": error})
+                self._write(f"rejected worker {worker.name}: {error}")
+                return
+            worker.index = self.queue.claim(worker.name)
+            self.workers.append(worker)
+            worker.channel.send({
+                "type": "welcome", "run_id": self.run_id, "worker_id": len(self.workers) - 1, "nodeids": list(self.items)
+            })
+        elif kind == "next":
+            nodeid = None if self._stopping(session) else self.queue.next(worker.index)
+            if nodeid is None:
+                worker.channel.send({"type": "shutdown"})
+            else:
+                worker.assigned.append(nodeid)
+                worker.channel.send({"type": "run", "nodeid": nodeid})
+        elif kind == "logstart":
+            worker.running = message["nodeid"]
+            hook.pytest_runtest_logstart(nodeid=message["nodeid"], location=tuple(message["location"]))
+        elif kind == "report":
+            report = hook.pytest_report_from_serializable(config=self.config, data=message["data"])
+            self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+            worker.busy += report.duration
+            hook.pytest_runtest_logreport(report=report)
+        elif kind == "logfinish":
+            nodeid = message["nodeid"]
+            hook.pytest_runtest_logfinish(nodeid=nodeid, location=tuple(message["location"]))
+            worker.assigned.remove(nodeid)
+            worker.running = None
+            worker.tests += 1
+        elif kind == "done":
+            worker.finished = True
+
+    def _lost(self, worker: _RemoteWorker) -> None:
+        if worker.index is None or (worker.finished and not worker.assigned):
+            worker.finished = True
+            return
+        worker.finished = True
+        if worker.running is not None:
+            # The test a worker died in is not retried: it may well be what killed it.
+            item = self.items[worker.running]
+            report = pytest.TestReport(
+                nodeid=item.nodeid, location=item.location, keywords={}, outcome="failed",
+                longrepr=f"worker {worker.name} exited while running this test", when="call"
+            )
+            self.config.hook.pytest_runtest_logreport(report=report)
+            self.config.hook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+            worker.assigned.remove(worker.running)
+            worker.running = None
+        self.queue.release(worker.index, worker.assigned)
+        worker.assigned = []
+
+    def _write(self, line: str) -> None:
+        reporter = self.config.pluginmanager.getplugin("terminalreporter")
+        if reporter is not None:
+            reporter.write_line(line)
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.workers:
+            return
+        terminalreporter.write_sep("-", f"{len(self.workers)} workers, {self.queue.steals} steals")
+        for index, worker in enumerate(self.workers):
+            terminalreporter.write_line(f"worker {index} {worker.name}: {worker.tests} tests, {worker.busy:.2f}s busy")
+
+
+def worker_args(args: Tuple[str, ...]) -> List[str]:
+    result = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+            continue
+        name = arg.split("=", 1)[0]
+        if name in COORDINATOR_OPTIONS:
+            skip = "=" not in arg
+            continue
+        if arg in COORDINATOR_FLAGS:
+            continue
+        result.append(arg)
+    return result
+
+
+class Worker:
+    # pytest plugin for a worker process: it collects the same suite, asks the coordinator for one test id
+    # at a time and streams every report back. The next test is fetched before the current one runs, so
+    # fixtures shared with it are kept instead of being torn down in between.
+    def __init__(self, config: pytest.Config, connect: str):
+        self.config = config
+        self.address = parse_address(connect)
+        self.channel: Optional[Channel] = None
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session: pytest.Session) -> bool:
+        if session.config.option.collectonly:
+            return True
+        items = {item.nodeid: item for item in session.items}
+        channel = Channel(socket.create_connection(self.address))
+        try:
+            name = f"{socket.gethostname()}:{os.getpid()}"
+            channel.send({"type": "hello", "name": name, "nodeids": list(items)})
+            welcome = channel.recv()
+            if welcome is None or welcome["type"] != "welcome":
+                raise session.Failed((welcome or {}).get("error", "coordinator closed the connection"))
+            # Ids of pets created by this worker's tests must not collide with other workers'.
+            os.environ["PETSTORE_RUN_ID"] = str(welcome["run_id"])
+            os.environ["PETSTORE_WORKER_ID"] = str(welcome["worker_id"])
+            set_allocator(None)
+            self.channel = channel
+            items = {nodeid: items[nodeid] for nodeid in welcome["nodeids"]}
+
+            def fetch() -> Optional[pytest.Item]:
+                channel.send({"type": "next"})
+                message = channel.recv()
+                return items[message["nodeid"]] if message and message["type"] == "run" else None
+
+            item = fetch()
+            while item is not None:
+                nextitem = fetch()
+                item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+                item = nextitem
+            channel.send({"type": "done"})
+        finally:
+            self.channel = None
+            channel.close()
+        return True
+
+    def pytest_runtest_logstart(self, nodeid: str, location) -> None:
+        if self.channel is not None:
+            self.channel.send({"type": "logstart", "nodeid": nodeid, "location": location})
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if self.channel is not None:
+            data = self.config.hook.pytest_report_to_serializable(config=self.config, report=report)
+            self.channel.send({"type": "report", "data": data})
+
+    def pytest_runtest_logfinish(self, nodeid: str, location) -> None:
+        if self.channel is not None:
+            self.channel.send({"type": "logfinish", "nodeid": nodeid, "location": location})
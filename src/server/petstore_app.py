@@ -0,0 +1,161 @@
+import json
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs
+from src.models.pet import STATUSES
+
+SYNTHETIC_ID_BASE = 8_000_000_000_000_000_000
+
+_PET_PATH = re.compile(r"^/pet/(?P<pet_id>[^/]+)$")
+
+StartResponse = Callable[[str, List[Tuple[str, str]]], None]
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class PetstoreApp:
+    def __init__(
+        self,
+        base_path: str = "/v2",
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        payload_size: int = 0,
+        seed: Optional[int] = None
+    ):
+        self.base_path = base_path.rstrip("/")
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.payload_size = payload_size
+        self.pets: Dict[int, dict] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, environ: dict, start_response: StartResponse) -> Iterable[bytes]:
+        status_code, body = self.handle(
+            environ["REQUEST_METHOD"],
+            environ.get("PATH_INFO", ""),
+            environ.get("QUERY_STRING", ""),
+            _read_body(environ)
+        )
+        headers = [("Content-Type", "application/json"), ("Content-Length", str(len(body)))]
+        start_response(f"{status_code} {REASONS.get(status_code, 'Unknown')}", headers)
+        return [body]
+
+    def handle(self, method: str, path: str, query: str, body: bytes) -> Tuple[int, bytes]:
+        self._inject_latency()
+        if self.error_rate and self._random.random() < self.error_rate:
+            return _error(self.error_status, "unknown", "something bad happened")
+
+        if self.base_path and path.startswith(self.base_path):
+            path = path[len(self.base_path):]
+        if path == "/pet":
+            if method == "POST":
+                return self._upsert(body, create=True)
+            if method == "PUT":
+                return self._upsert(body, create=False)
+            return _error(405, "unknown", None)
+        if path == "/pet/findByStatus" and method == "GET":
+            return self._find_by_status(parse_qs(query).get("status", []))
+        match = _PET_PATH.match(path)
+        if match and method in ("GET", "DELETE"):
+            try:
+                pet_id = int(match.group("pet_id"))
+            except ValueError:
+                return _error(404, "unknown", f"java.lang.NumberFormatException: For input string: \"{match.group('pet_id')}\"")
+            return self._get(pet_id) if method == "GET" else self._delete(pet_id)
+        return _error(404, "unknown", None)
+
+    def _inject_latency(self) -> None:
+        delay = self.latency
+        if self.latency_jitter:
+            delay += self._random.uniform(0, self.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _upsert(self, body: bytes, create: bool) -> Tuple[int, bytes]:
+        try:
+            pet = json.loads(body) if body else None
+        except ValueError:
+            pet = None
+        if not _is_valid_pet(pet):
+            return _error(500, "unknown", "something bad happened")
+        if pet.get("id") is None:
+            if not create:
+                return _error(400, "unknown", "Invalid ID supplied")
+            pet["id"] = self._random.randint(1, 2 ** 62)
+        pet.setdefault("photoUrls", [])
+        pet.setdefault("tags", [])
+        with self._lock:
+            self.pets[pet["id"]] = pet
+        return 200, _dumps(pet)
+
+    def _get(self, pet_id: int) -> Tuple[int, bytes]:
+        with self._lock:
+            pet = self.pets.get(pet_id)
+        if pet is None:
+            return _error(404, "error", "Pet not found", code=1)
+        return 200, _dumps(pet)
+
+    def _delete(self, pet_id: int) -> Tuple[int, bytes]:
+        with self._lock:
+            pet = self.pets.pop(pet_id, None)
+        if pet is None:
+            # The public Petstore answers a missing pet on DELETE with an empty 404.
+            return 404, b""
+        return 200, _dumps({"code": 200, "type": "unknown", "message": str(pet_id)})
+
+    def _find_by_status(self, values: List[str]) -> Tuple[int, bytes]:
+        statuses = {status for value in values for status in value.split(",")}
+        with self._lock:
+            pets = [pet for pet in self.pets.values() if pet.get("status") in statuses]
+        for status in sorted(statuses & set(STATUSES)):
+            first_id = SYNTHETIC_ID_BASE + STATUSES.index(status) * self.payload_size
+            pets.extend(synthetic_pet(first_id + i, status) for i in range(self.payload_size))
+        return 200, _dumps(pets)
+
+
+def synthetic_pet(pet_id: int, status: str) -> dict:
+    return {
+        "id": pet_id,
+        "category": {"id": pet_id % 10, "name": "Synthetic"},
+        "name": f"Synthetic_{pet_id}",
+        "photoUrls": [f"https://example.com/photo_{pet_id}.jpg"],
+        "tags": [{"id": 1, "name": "synthetic"}],
+        "status": status,
+    }
+
+
+def _is_valid_pet(pet) -> bool:
+    if not isinstance(pet, dict):
+        return False
+    if "id" in pet and pet["id"] is not None and (not isinstance(pet["id"], int) or isinstance(pet["id"], bool)):
+        return False
+    if "name" in pet and pet["name"] is not None and not isinstance(pet["name"], str):
+        return False
+    if "photoUrls" in pet and not isinstance(pet["photoUrls"], list):
+        return False
+    return True
+
+
+def _read_body(environ: dict) -> bytes:
+    try:
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    return environ["wsgi.input"].read(length) if length > 0 else b""
+
+
+def _dumps(data) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _error(status_code: int, error_type: str, message: Optional[str], code: int = None) -> Tuple[int, bytes]:
+    return status_code, _dumps({"code": status_code if code is None else code, "type": error_type, "message": message})
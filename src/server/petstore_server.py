@@ -0,0 +1,163 @@
+import argparse
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+from src.server.petstore_app import PetstoreApp
+
+
+class WSGIRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "LocalPetstore/1.0"
+    # Idle keep-alive connections hold a pool worker, so they are closed after this many seconds.
+    timeout = 5
+    disable_nagle_algorithm = True
+
+    def handle_one_request(self) -> None:
+        # The idle timeout applies while waiting for a request only; _dispatch lifts it for the response.
+        self.connection.settimeout(self.timeout)
+        super().handle_one_request()
+
+    def do_GET(self):
+        self._dispatch()
+
+    do_POST = do_PUT = do_DELETE = do_HEAD = do_GET
+
+    def _dispatch(self) -> None:
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        environ = {
+            "REQUEST_METHOD": self.command,
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "CONTENT_LENGTH": str(len(body)),
+            "CONTENT_TYPE": self.headers.get("Content-Type", ""),
+            "SERVER_NAME": self.server.server_address[0],
+            "SERVER_PORT": str(self.server.server_address[1]),
+            "SERVER_PROTOCOL": self.request_version,
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.url_scheme": "http",
+            "wsgi.version": (1, 0),
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        response = {}
+        written = []
+
+        def start_response(status: str, headers: list, exc_info=None) -> Callable[[bytes], None]:
+            response["status"], response["headers"] = status, headers
+            return written.append
+
+        chunks = b"".join(written + list(self.server.app(environ, start_response)))
+        code, _, reason = response["status"].partition(" ")
+        # sendall holds one deadline for the whole body, which would cut off a slow reader of a large response.
+        self.connection.settimeout(None)
+        self.send_response(int(code), reason)
+        for name, value in response["headers"]:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(chunks)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class ThreadPoolHTTPServer(HTTPServer):
+    request_queue_size = 1024
+    allow_reuse_address = True
+
+    def __init__(self, server_address, app: Callable, workers: int = 128):
+        super().__init__(server_address, WSGIRequestHandler)
+        self.app = app
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="petstore")
+
+    def process_request(self, request, client_address) -> None:
+        self._executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LocalPetstore:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, workers: int = 128, app: PetstoreApp = None, **options):
+        self.app = app or PetstoreApp(**options)
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self._server: Optional[ThreadPoolHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}{self.app.base_path}"
+
+    def start(self) -> "LocalPetstore":
+        self._server = ThreadPoolHTTPServer((self.host, self.port), self.app, self.workers)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-petstore", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self) -> "LocalPetstore":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Local in-memory Petstore stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=128, help="Request handler thread pool size")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed latency added to every response, seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="Extra random latency up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--payload-size", type=int, default=0, help="Synthetic pets added to every findByStatus result")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = LocalPetstore(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        payload_size=args.payload_size,
+        seed=args.seed
+    ).start()
+    print(f"Serving Petstore on {server.base_url}", flush=True)
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
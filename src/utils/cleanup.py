@@ -0,0 +1,140 @@
+import atexit
+import os
+import signal
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional
+from src.api.pet_api import PetApi, PetNotFoundError
+
+JOURNAL_SUFFIX = ".ids"
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class PetCleanup:
+    # Pets created by tests are tracked here and deleted in one concurrent batch at session end instead of
+    # inline by each test. Ids are also appended to a journal file named after the process, so pets of a
+    # session that died before its teardown (SIGKILL, os._exit, power loss) are deleted by the next session
+    # against the same base URL. Without a journal_dir tracking is in memory only.
+    def __init__(self, api: PetApi, journal_dir: Optional[str] = None, concurrency: int = None):
+        self.api = api
+        self.concurrency = concurrency
+        self._pending = {}
+        # Reentrant: the signal handler runs on the main thread, possibly while it holds them.
+        self._lock = threading.RLock()
+        self._cleanup_lock = threading.RLock()
+        self._previous_handlers = {}
+        self.journal = None
+        if journal_dir is not None:
+            Path(journal_dir).mkdir(parents=True, exist_ok=True)
+            self.journal = Path(journal_dir) / f"{os.getpid()}{JOURNAL_SUFFIX}"
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def track(self, pet_id: int) -> int:
+        self.track_many([pet_id])
+        return pet_id
+
+    def track_many(self, pet_ids: Iterable[int]) -> None:
+        pet_ids = [pet_id for pet_id in pet_ids if pet_id is not None]
+        with self._lock:
+            new = [pet_id for pet_id in pet_ids if pet_id not in self._pending]
+            self._pending.update(dict.fromkeys(new))
+            if new and self.journal is not None:
+                if not self.journal.exists():
+                    self.journal.write_text(self.api.client.base_url + "\n")
+                with self.journal.open("a") as journal:
+                    journal.write("".join(f"{pet_id}\n" for pet_id in new))
+
+    def recover(self) -> int:
+        # Adopts the journals of dead processes that ran against our base URL; their ids are deleted
+        # with ours. Another session racing for the same journal only costs a few 404s.
+        if self.journal is None:
+            return 0
+        recovered = 0
+        for path in self.journal.parent.glob(f"*{JOURNAL_SUFFIX}"):
+            if path == self.journal or not path.stem.isdigit() or _process_alive(int(path.stem)):
+                continue
+            try:
+                base_url, *ids = path.read_text().splitlines()
+            except (OSError, ValueError):
+                continue
+            if base_url != self.api.client.base_url:
+                continue
+            self.track_many(int(pet_id) for pet_id in ids if pet_id.isdigit())
+            path.unlink(missing_ok=True)
+            recovered += len(ids)
+        return recovered
+
+    def cleanup(self) -> List[int]:
+        # Deletes every tracked pet and returns the ids that could not be deleted; those stay tracked
+        # (and journaled) for a later call or session. Safe to call more than once and from several paths.
+        with self._cleanup_lock:
+            with self._lock:
+                pet_ids = list(self._pending)
+            if not pet_ids:
+                return []
+            try:
+                results = self.api.delete_pets(pet_ids, concurrency=self.concurrency)
+            except RuntimeError:
+                # Once the interpreter is shutting down (atexit) no new threads start; delete one by one.
+                results = [self._delete(pet_id) for pet_id in pet_ids]
+            with self._lock:
+                for pet_id, result in zip(pet_ids, results):
+                    if not isinstance(result, Exception) or isinstance(result, PetNotFoundError):
+                        self._pending.pop(pet_id, None)
+                remaining = list(self._pending)
+                self._rewrite_journal(remaining)
+            return remaining
+
+    def _delete(self, pet_id: int):
+        try:
+            return self.api.delete_pet(pet_id)
+        except Exception as e:
+            return e
+
+    def _rewrite_journal(self, pet_ids: List[int]) -> None:
+        if self.journal is None:
+            return
+        if not pet_ids:
+            self.journal.unlink(missing_ok=True)
+            return
+        temporary = self.journal.with_suffix(".tmp")
+        temporary.write_text(self.api.client.base_url + "\n" + "".join(f"{pet_id}\n" for pet_id in pet_ids))
+        os.replace(temporary, self.journal)
+
+    def install(self, signals: Iterable[int] = (signal.SIGTERM,)) -> None:
+        # Interpreter exit and termination signals clean up too. Signal handlers can only be set from the
+        # main thread; elsewhere the journal covers what atexit cannot.
+        atexit.register(self.cleanup)
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for signum in signals:
+            self._previous_handlers[signum] = signal.signal(signum, self._on_signal)
+
+    def uninstall(self) -> None:
+        atexit.unregister(self.cleanup)
+        for signum, handler in self._previous_handlers.items():
+            signal.signal(signum, handler)
+        self._previous_handlers.clear()
+
+    def _on_signal(self, signum: int, frame) -> None:
+        previous = self._previous_handlers.get(signum, signal.SIG_DFL)
+        try:
+            self.cleanup()
+        finally:
+            if callable(previous):
+                previous(signum, frame)
+            elif previous != signal.SIG_IGN:
+                # Die of the same signal as without us.
+                self.uninstall()
+                os.kill(os.getpid(), signum)
@@ -1,6 +1,15 @@
 import random
-from typing import Optional
-from src.models.pet import Pet, Category, Tag
+from array import array
+from collections.abc import Sequence
+from typing import Iterator, List, Optional, Union
+from src.contracts.validators import type_adapter
+from src.models.pet import STATUSES, Pet, Category, Tag
+from src.models.pet_batch import MATERIALIZE_CHUNK, PET_JSON, STATUS_JSON, named_json
+from src.utils.id_allocator import get_allocator, next_pet_id
+
+CATEGORIES = ((1, "Dogs"), (2, "Cats"), (3, "Birds"), (4, "Fish"))
+TAGS = ((1, "friendly"), (2, "cute"), (3, "trained"), (4, "young"))
+MAX_PHOTOS = 3
 
 
 def generate_pet(
@@ -12,11 +21,11 @@ def generate_pet(
     tags: Optional[list[Tag]] = None
 ) -> Pet:
     if pet_id is None:
-        pet_id = random.randint(1, 999999)
+        pet_id = next_pet_id()
     if name is None:
         name = f"Pet_{random.randint(1000, 9999)}"
     if status is None:
-        status = random.choice(["available", "pending", "sold"])
+        status = random.choice(STATUSES)
     if photo_urls is None:
         photo_urls = [f"https://example.com/photo_{i}.jpg" for i in range(random.randint(1, 3))]
 
@@ -30,6 +39,108 @@ def generate_pet(
     )
 
 
+def _byte_table(modulo: int, offset: int = 0) -> bytes:
+    # Maps random bytes onto small codes with bytes.translate, so whole columns are drawn at C speed.
+    return bytes(offset + value % modulo for value in range(256))
+
+
+def _random_codes(rng: random.Random, n: int, modulo: int, offset: int = 0) -> array:
+    return array("B", rng.randbytes(n).translate(_byte_table(modulo, offset)))
+
+
+# JSON fragments per column code for PET_JSON.
+_CATEGORY_JSON = [b"null"] + [named_json(category) for category in CATEGORIES]
+_TAGS_JSON = [
+    b"[" + b",".join(named_json(tag) for bit, tag in enumerate(TAGS) if mask >> bit & 1) + b"]" if mask else b"null"
+    for mask in range(1 << len(TAGS))
+]
+_PHOTOS_JSON = [
+    b",".join(b'"https://example.com/photo_%d.jpg"' % photo for photo in range(count)) for count in range(MAX_PHOTOS + 1)
+]
+
+
+class PetColumns(Sequence):
+    # Pets stored column by column; Pet objects are only built when items are accessed.
+    # Row i: category code 0 means no category, tag mask bit k selects TAGS[k].
+    def __init__(
+        self,
+        ids: array,
+        name_numbers: array,
+        statuses: array,
+        photo_counts: array,
+        categories: array,
+        tag_masks: array
+    ):
+        self.ids = ids
+        self.name_numbers = name_numbers
+        self.statuses = statuses
+        self.photo_counts = photo_counts
+        self.categories = categories
+        self.tag_masks = tag_masks
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Pet, List[Pet]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._materialize(start, stop)
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("pet index out of range")
+        return type_adapter(Pet).validate_json(next(self.iter_json(index, index + 1)))
+
+    def __iter__(self) -> Iterator[Pet]:
+        for start in range(0, len(self), MATERIALIZE_CHUNK):
+            yield from self._materialize(start, min(start + MATERIALIZE_CHUNK, len(self)))
+
+    def _materialize(self, start: int, stop: int) -> List[Pet]:
+        # pydantic-core builds nested models from JSON faster than model_construct does from Python values.
+        return type_adapter(List[Pet]).validate_json(self.to_json(start, stop))
+
+    def iter_json(self, start: int = 0, stop: Optional[int] = None) -> Iterator[bytes]:
+        # One request body per pet, equal to pydantic_core.to_json(pet) without building the Pet.
+        rows = slice(start, stop)
+        for pet_id, number, status, photo_count, category, mask in zip(
+            self.ids[rows], self.name_numbers[rows], self.statuses[rows],
+            self.photo_counts[rows], self.categories[rows], self.tag_masks[rows]
+        ):
+            yield PET_JSON % (
+                pet_id, _CATEGORY_JSON[category], b'"Pet_%d"' % number, _PHOTOS_JSON[photo_count], _TAGS_JSON[mask],
+                STATUS_JSON[status]
+            )
+
+    def to_json(self, start: int = 0, stop: Optional[int] = None) -> bytes:
+        return b"[" + b",".join(self.iter_json(start, stop)) + b"]"
+
+
+def generate_pets(n: int, seed: Optional[int] = None, status: Optional[str] = None, start_id: Optional[int] = None) -> PetColumns:
+    # Without a seed the stream is drawn from the global random state, so seeding it (as cassette runs do) still
+    # reproduces the same pets.
+    rng = random.Random(random.getrandbits(64) if seed is None else seed)
+    if start_id is None:
+        start_id = get_allocator().reserve(n).start
+    name_numbers = array("H")
+    name_numbers.frombytes(rng.randbytes(2 * n))
+    # 0..65535 folded onto generate_pet's Pet_1000..Pet_9999 range
+    name_numbers = array("H", (1000 + number % 9000 for number in name_numbers))
+    if status is None:
+        statuses = _random_codes(rng, n, len(STATUSES))
+    else:
+        statuses = array("B", bytes([STATUSES.index(status)]) * n)
+    return PetColumns(
+        ids=array("q", range(start_id, start_id + n)),
+        name_numbers=name_numbers,
+        statuses=statuses,
+        photo_counts=_random_codes(rng, n, MAX_PHOTOS, offset=1),
+        categories=_random_codes(rng, n, len(CATEGORIES) + 1),
+        tag_masks=_random_codes(rng, n, 1 << len(TAGS))
+    )
+
+
 def generate_invalid_pet_payload() -> dict:
     return {
         "invalid_field": "value",
@@ -0,0 +1,86 @@
+import os
+import re
+import threading
+from typing import Optional
+
+# id = run prefix | worker | sequence, 62 bits in total: positive in int64 and below the local
+# stand-in's synthetic ids. Prefix 0 is never used, so allocated ids cannot meet legacy 1..999999 ones.
+PREFIX_BITS = 24
+WORKER_BITS = 10
+SEQUENCE_BITS = 28
+BLOCK_SIZE = 4096
+
+
+def run_prefix() -> int:
+    # Processes of one distributed run share PETSTORE_RUN_ID and differ by worker; anything else gets a random prefix.
+    run_id = os.environ.get("PETSTORE_RUN_ID")
+    if run_id:
+        return int(run_id) % ((1 << PREFIX_BITS) - 1) + 1
+    return int.from_bytes(os.urandom(4), "big") % ((1 << PREFIX_BITS) - 1) + 1
+
+
+def worker_index() -> int:
+    worker = os.environ.get("PETSTORE_WORKER_ID") or os.environ.get("PYTEST_XDIST_WORKER", "")
+    match = re.search(r"\d+", worker)
+    return int(match.group()) % (1 << WORKER_BITS) if match else 0
+
+
+class IdAllocator:
+    # Threads take ids from private blocks; the lock is only touched once per BLOCK_SIZE ids.
+    def __init__(self, prefix: Optional[int] = None, worker: Optional[int] = None, block_size: int = BLOCK_SIZE):
+        self.prefix = run_prefix() if prefix is None else prefix
+        self.worker = worker_index() if worker is None else worker
+        if not 0 < self.prefix < 1 << PREFIX_BITS:
+            raise ValueError(f"ID prefix must be between 1 and {(1 << PREFIX_BITS) - 1}, got {self.prefix}")
+        if not 0 <= self.worker < 1 << WORKER_BITS:
+            raise ValueError(f"Worker index must be between 0 and {(1 << WORKER_BITS) - 1}, got {self.worker}")
+        self.block_size = block_size
+        self._base = (self.prefix << (WORKER_BITS + SEQUENCE_BITS)) | (self.worker << SEQUENCE_BITS)
+        self._next_sequence = 1
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def next_id(self) -> int:
+        try:
+            return next(self._local.ids)
+        except (AttributeError, StopIteration):
+            self._local.ids = iter(self.reserve(self.block_size))
+            return next(self._local.ids)
+
+    def reserve(self, count: int) -> range:
+        with self._lock:
+            start = self._next_sequence
+            if start + count > 1 << SEQUENCE_BITS:
+                raise RuntimeError(f"ID space of prefix {self.prefix}, worker {self.worker} is exhausted")
+            self._next_sequence = start + count
+        return range(self._base | start, (self._base | start) + count)
+
+    def owns(self, pet_id: int) -> bool:
+        return pet_id >> SEQUENCE_BITS == self._base >> SEQUENCE_BITS
+
+
+_allocator: Optional[IdAllocator] = None
+_allocator_lock = threading.Lock()
+
+
+def get_allocator() -> IdAllocator:
+    global _allocator
+    if _allocator is None:
+        with _allocator_lock:
+            if _allocator is None:
+                _allocator = IdAllocator()
+    return _allocator
+
+
+def set_allocator(allocator: Optional[IdAllocator]) -> None:
+    global _allocator
+    _allocator = allocator
+
+
+if hasattr(os, "register_at_fork"):
+    # A forked child must not keep handing out its parent's sequence.
+    os.register_at_fork(after_in_child=lambda: set_allocator(None))
+
+
+def next_pet_id() -> int:
+    return get_allocator().next_id()
@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+from src.api.async_pet_api import AsyncPetApi
+from src.api.pet_api import ApiError, PetNotFoundError
+from src.http.async_client import AsyncHttpClient
+from src.server.petstore_server import LocalPetstore
+from src.utils.data_factory import generate_pet
+
+
+def test_async_create_get_update_find_delete_flow():
+    async def scenario(base_url: str) -> None:
+        async with AsyncHttpClient(base_url) as client:
+            api = AsyncPetApi(client)
+            pet = generate_pet(status="available")
+            created = await api.create_pet(pet)
+            assert created == pet
+
+            assert (await api.get_pet(pet.id)) == pet
+
+            updated = await api.update_pet(generate_pet(pet_id=pet.id, name="AsyncUpdated", status="sold"))
+            assert updated.name == "AsyncUpdated"
+            assert any(found.id == pet.id for found in await api.find_by_status("sold"))
+            assert all(found.id != pet.id for found in await api.find_by_status("available"))
+
+            assert (await api.delete_pet(pet.id)).code == 200
+            with pytest.raises(PetNotFoundError) as error:
+                await api.get_pet(pet.id)
+            assert error.value.response.status_code == 404
+
+    with LocalPetstore() as server:
+        asyncio.run(scenario(server.base_url))
+
+
+def test_async_error_responses_raise_api_error():
+    async def scenario(base_url: str) -> None:
+        async with AsyncHttpClient(base_url) as client:
+            with pytest.raises(ApiError) as error:
+                await AsyncPetApi(client).find_by_status("sold")
+            assert error.value.response.status_code == 503
+            assert error.value.error_response.message == "something bad happened"
+
+    with LocalPetstore(error_rate=1.0, error_status=503) as server:
+        asyncio.run(scenario(server.base_url))
@@ -0,0 +1,90 @@
+import pytest
+from src.api.pet_api import PetApi, PetNotFoundError
+from src.http.cassette import Cassette, CassetteMissError, match_key, RECORD, REPLAY
+from src.http.client import HttpClient
+from src.http.response import ResponseContext
+from src.http.transport import Transport, WSGITransport
+from src.server.petstore_server import PetstoreApp
+from src.utils.data_factory import generate_pet
+
+
+def make_response(status_code: int, content: bytes) -> ResponseContext:
+    return ResponseContext(
+        method="GET",
+        url="https://petstore.swagger.io/v2/pet/1",
+        status_code=status_code,
+        headers={"Content-Type": "application/json"},
+        content=content,
+        elapsed=0.1
+    )
+
+
+def test_match_key_normalizes_params_and_body():
+    assert match_key("get", "/pet/findByStatus", {"status": "sold", "a": 1}) == \
+        match_key("GET", "/pet/findByStatus", {"a": "1", "status": "sold"})
+    assert match_key("POST", "/pet", content=b'{"id": 1, "name": "x"}') == \
+        match_key("POST", "/pet", content=b'{"name":"x","id":1}')
+    assert match_key("GET", "/pet/1") != match_key("GET", "/pet/2")
+
+
+def test_cassette_record_and_replay_in_order(tmp_path):
+    path = str(tmp_path / "pets.cassette")
+    with Cassette(path, RECORD) as cassette:
+        cassette.record("/pet/1", None, None, make_response(200, b'{"id": 1}'))
+        cassette.record("/pet/1", None, None, make_response(404, b""))
+
+    with Cassette(path, REPLAY) as cassette:
+        assert len(cassette) == 2
+        first = cassette.replay("GET", "/pet/1")
+        assert first.status_code == 200
+        assert first.json() == {"id": 1}
+        assert first.headers.get("content-type") == "application/json"
+        assert cassette.replay("GET", "/pet/1").status_code == 404
+        assert cassette.replay("GET", "/pet/1").status_code == 404
+        with pytest.raises(CassetteMissError):
+            cassette.replay("GET", "/pet/2")
+
+
+def test_cassette_ignores_torn_tail_record(tmp_path):
+    path = tmp_path / "pets.cassette"
+    with Cassette(str(path), RECORD) as cassette:
+        cassette.record("/pet/1", None, None, make_response(200, b'{"id": 1}'))
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 10)
+
+    with Cassette(str(path), REPLAY) as cassette:
+        assert len(cassette) == 1
+
+
+class OfflineTransport(Transport):
+    def send(self, *args, **kwargs):
+        raise AssertionError("replay must not reach the transport")
+
+
+def record_session(path: str, pet) -> None:
+    with HttpClient("http://petstore.local/v2", cassette=Cassette(path, RECORD), transport=WSGITransport(PetstoreApp())) as client:
+        api = PetApi(client)
+        created = api.create_pet(pet)
+        api.get_pet(created.id)
+        api.delete_pet(created.id)
+        with pytest.raises(PetNotFoundError):
+            api.get_pet(created.id)
+        client.cassette.close()
+
+
+def test_http_client_records_then_replays_latest_recording(tmp_path):
+    path = str(tmp_path / "pets.cassette")
+    fresh = generate_pet(pet_id=7, name="Fresh")
+    record_session(path, generate_pet(pet_id=7, name="Stale"))
+    record_session(path, fresh)
+
+    with HttpClient("http://petstore.local/v2", cassette=Cassette(path, REPLAY), transport=OfflineTransport()) as client:
+        api = PetApi(client)
+        assert len(client.cassette) == 4
+        assert api.create_pet(fresh).name == "Fresh"
+        assert api.get_pet(7).name == "Fresh"
+        api.delete_pet(7)
+        with pytest.raises(PetNotFoundError):
+            api.get_pet(7)
+        with pytest.raises(CassetteMissError):
+            api.get_pet(8)
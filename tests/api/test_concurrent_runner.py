@@ -0,0 +1,149 @@
+import pytest
+
+pytest_plugins = ["pytester"]
+
+CONFTEST = """
+from src.runner.concurrency import ConcurrentRunner
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "serial: run alone")
+    config.pluginmanager.register(ConcurrentRunner(config, 4), "concurrent-runner")
+"""
+
+
+@pytest.fixture
+def suite(pytester: pytest.Pytester, monkeypatch, request) -> pytest.Pytester:
+    # Subprocess runs: an in-process run would nest inside this session's own output capture.
+    monkeypatch.setenv("PYTHONPATH", str(request.config.rootpath))
+    pytester.makeconftest(CONFTEST)
+    return pytester
+
+
+def test_tests_overlap_up_to_the_parallelism_cap(suite: pytest.Pytester):
+    suite.makepyfile("""
+        import threading
+        import pytest
+
+        barrier = threading.Barrier(4, timeout=10)
+
+        @pytest.mark.parametrize("n", range(8))
+        def test_waits_for_three_others(n):
+            barrier.wait()
+    """)
+    suite.runpytest_subprocess("-p", "no:cacheprovider").assert_outcomes(passed=8)
+
+
+def test_serial_tests_run_alone_after_concurrent_ones(suite: pytest.Pytester):
+    suite.makepyfile("""
+        import threading
+        import time
+        import pytest
+
+        running = []
+        order = []
+        lock = threading.Lock()
+
+        def enter(name):
+            with lock:
+                running.append(name)
+                order.append(name)
+            time.sleep(0.05)
+            with lock:
+                alone = running == [name]
+                running.remove(name)
+            return alone
+
+        @pytest.mark.parametrize("n", range(6))
+        def test_concurrent(n):
+            enter(n)
+
+        @pytest.mark.serial
+        def test_serial():
+            assert enter("serial")
+            assert order[-1] == "serial" and len(order) == 7
+
+        def test_monkeypatch_implies_serial(monkeypatch):
+            monkeypatch.setattr(time, "sleep", time.sleep)
+            assert enter("patched")
+    """)
+    suite.runpytest_subprocess("-p", "no:cacheprovider").assert_outcomes(passed=8)
+
+
+def test_output_and_failures_stay_with_their_test(suite: pytest.Pytester):
+    suite.makepyfile("""
+        import logging
+        import threading
+        import pytest
+
+        barrier = threading.Barrier(3, timeout=10)
+
+        @pytest.mark.parametrize("name", ["alpha", "beta", "gamma"])
+        def test_prints(name):
+            barrier.wait()
+            for _ in range(50):
+                print(f"out-{name}")
+                logging.getLogger("suite").warning(f"log-{name}")
+            assert name != "beta"
+    """)
+    result = suite.runpytest_subprocess("-p", "no:cacheprovider", "-rA")
+    result.assert_outcomes(passed=2, failed=1)
+    failure = result.stdout.str().split("test_prints[beta] _")[1].split("PASSES")[0]
+    assert "out-beta" in failure and "log-beta" in failure
+    assert "out-alpha" not in failure and "log-gamma" not in failure
+
+
+def test_fixtures_are_per_test_and_shared_scopes_tear_down_once(suite: pytest.Pytester):
+    suite.makepyfile("""
+        import threading
+        import pytest
+
+        barrier = threading.Barrier(4, timeout=10)
+
+        def record(event):
+            with open("events.txt", "a") as events:
+                events.write(f"{event}\\n")
+
+        @pytest.fixture(scope="module")
+        def shared():
+            record("module-setup")
+            yield object()
+            record("module-teardown")
+
+        @pytest.fixture
+        def own():
+            value = object()
+            yield value
+            record(f"own-{id(value)}")
+
+        @pytest.mark.parametrize("n", range(4))
+        def test_uses_fixtures(n, shared, own, request):
+            barrier.wait()
+            assert request.getfixturevalue("own") is own
+
+        @pytest.mark.serial
+        def test_serial_uses_shared(shared):
+            pass
+    """)
+    suite.runpytest_subprocess("-p", "no:cacheprovider").assert_outcomes(passed=5)
+    events = (suite.path / "events.txt").read_text().split()
+    assert events.count("module-setup") == events.count("module-teardown") == 1
+    assert events[-1] == "module-teardown"
+    assert len({event for event in events if event.startswith("own-")}) == 4
+
+
+def test_exitfirst_stops_dispatching(suite: pytest.Pytester):
+    suite.makepyfile("""
+        import pytest
+
+        import time
+
+        @pytest.mark.parametrize("n", range(40))
+        def test_fails(n):
+            time.sleep(0.02)
+            assert n > 0
+    """)
+    result = suite.runpytest_subprocess("-p", "no:cacheprovider", "-x")
+    outcomes = result.parseoutcomes()
+    assert outcomes["failed"] == 1
+    assert outcomes.get("passed", 0) < 20
@@ -0,0 +1,51 @@
+import pytest
+from src.api.pet_api import PetApi
+from src.contracts.validators import parse_json_as, ContractViolationError
+from src.http.response import ResponseContext
+from src.models.pet import Pet
+
+PET_JSON = b'{"id": 1, "name": "Rex", "photoUrls": ["https://example.com/1.jpg"], "status": "available"}'
+
+
+def make_response(content: bytes, status_code: int = 200, content_type: str = "application/json") -> ResponseContext:
+    return ResponseContext(
+        method="GET",
+        url="https://petstore.swagger.io/v2/pet/1",
+        status_code=status_code,
+        headers={"Content-Type": content_type},
+        content=content,
+        elapsed=0.01
+    )
+
+
+def test_parse_json_as_validates_raw_bytes():
+    pet = parse_json_as(Pet, make_response(PET_JSON))
+    assert isinstance(pet, Pet)
+    assert pet.name == "Rex"
+
+
+def test_parse_json_as_reports_contract_violation():
+    with pytest.raises(ContractViolationError) as exc_info:
+        parse_json_as(Pet, make_response(b'{"id": "1", "name": "Rex", "photoUrls": []}'))
+    message = str(exc_info.value)
+    assert message.startswith("Contract violation: Pet validation failed")
+    assert "URL: GET https://petstore.swagger.io/v2/pet/1" in message
+    assert "'loc': ('id',)" in message
+
+
+def test_parse_json_as_rejects_invalid_json_and_content_type():
+    with pytest.raises(ContractViolationError, match="Failed to parse response as JSON"):
+        parse_json_as(Pet, make_response(b"<html>"))
+    with pytest.raises(ContractViolationError, match="Expected JSON Content-Type"):
+        parse_json_as(Pet, make_response(PET_JSON, content_type="text/html"))
+
+
+def test_pet_list_validation_from_bytes():
+    api = PetApi(validation="full")
+    pets = api._parse_pet_list(make_response(b"[" + PET_JSON + b"," + PET_JSON + b"]"))
+    assert [pet.id for pet in pets] == [1, 1]
+
+    with pytest.raises(ContractViolationError, match="Expected list of pets, got: <class 'dict'>"):
+        api._parse_pet_list(make_response(PET_JSON))
+    with pytest.raises(ContractViolationError, match="One or more pets in list failed validation"):
+        api._parse_pet_list(make_response(b'[{"id": 1}]'))
@@ -0,0 +1,44 @@
+import json
+import random
+from pydantic_core import to_json
+from src.models.pet import Pet
+from src.utils.data_factory import CATEGORIES, STATUSES, generate_pets
+
+
+def test_generate_pets_is_seeded_and_lazy():
+    pets = generate_pets(1000, seed=7)
+    assert len(pets) == 1000
+    assert list(pets.ids) == list(range(pets.ids[0], pets.ids[0] + 1000))
+    again = generate_pets(1000, seed=7)
+    assert again.statuses == pets.statuses and again.tag_masks == pets.tag_masks
+    assert again.ids[0] >= pets.ids[-1] + 1
+    assert generate_pets(1000, seed=8).statuses != pets.statuses
+
+    pet = pets[-1]
+    assert isinstance(pet, Pet)
+    assert pet.status in STATUSES
+    assert 1 <= len(pet.photoUrls) <= 3
+    assert pet.category is None or (pet.category.id, pet.category.name) in CATEGORIES
+    assert pets[10:13] == [pets[10], pets[11], pets[12]]
+
+
+def test_generate_pets_follows_global_seed_without_explicit_seed():
+    random.seed("cassette-test")
+    first = generate_pets(10)
+    random.seed("cassette-test")
+    assert generate_pets(10).name_numbers == first.name_numbers
+
+
+def test_generate_pets_status_and_distribution():
+    assert {pet.status for pet in generate_pets(50, seed=1, status="sold")} == {"sold"}
+    statuses = generate_pets(30000, seed=1).statuses
+    counts = [statuses.count(code) for code in range(len(STATUSES))]
+    assert all(9000 < count < 11000 for count in counts)
+
+
+def test_json_output_matches_pydantic_serialization():
+    pets = generate_pets(200, seed=3, start_id=100)
+    bodies = list(pets.iter_json())
+    assert bodies == [to_json(pet) for pet in pets]
+    assert [item["id"] for item in json.loads(pets.to_json())] == list(range(100, 300))
+    assert pets.to_json(5, 7) == b"[" + bodies[5] + b"," + bodies[6] + b"]"
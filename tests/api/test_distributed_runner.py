@@ -0,0 +1,107 @@
+import json
+import pytest
+from src.runner.distributed import WorkQueue, partition, worker_args
+
+pytest_plugins = ["pytester"]
+
+CONFTEST = """
+from src.runner.distributed import Coordinator, Worker
+
+
+def pytest_addoption(parser):
+    parser.addoption("--dist-workers", type=int, default=0)
+    parser.addoption("--dist-connect", default=None)
+
+
+def pytest_configure(config):
+    if config.getoption("--dist-connect"):
+        config.pluginmanager.register(Worker(config, config.getoption("--dist-connect")), "dist-worker")
+    elif config.getoption("--dist-workers"):
+        config.pluginmanager.register(Coordinator(config, config.getoption("--dist-workers"), 0, "127.0.0.1:0"))
+"""
+
+SUITE = """
+import os
+import time
+import pytest
+
+
+@pytest.mark.parametrize("n", range(6))
+def test_slow(n):
+    time.sleep(0.2)
+    with open("workers.txt", "a") as workers:
+        workers.write(os.environ["PETSTORE_WORKER_ID"] + "\\n")
+
+
+def test_fails():
+    print("output-of-failing-test")
+    assert False
+"""
+
+
+def test_partition_spreads_files_by_historical_duration():
+    nodeids = [f"a.py::t{i}" for i in range(4)] + ["b.py::slow", "c.py::t0", "c.py::t1"]
+    durations = {"b.py::slow": 10.0, "a.py::t0": 1.0, "a.py::t1": 1.0, "a.py::t2": 1.0, "a.py::t3": 1.0}
+    parts = partition(nodeids, durations, 2)
+    assert sorted(map(len, parts)) == [1, 6]
+    assert ["b.py::slow"] in parts
+    assert [nodeid for part in parts for nodeid in part if nodeid.startswith("a.py")] == nodeids[:4]
+
+
+def test_idle_worker_steals_back_half_of_the_busiest_deque():
+    queue = WorkQueue([["a", "b", "c", "d"], ["e"], []], {"a": 1, "b": 1, "c": 1, "d": 1, "e": 1})
+    first, second, third = queue.claim("w0"), queue.claim("w1"), queue.claim("w2")
+    assert queue.next(third) == "c"
+    assert list(queue.deques[first]) == ["a", "b"] and list(queue.deques[third]) == ["d"]
+    assert queue.next(second) == "e" and queue.next(second) == "b"
+    assert queue.steals == 2
+
+    queue.release(third, ["c"])
+    assert queue.claim("w3") == third and list(queue.deques[third]) == ["c", "d"]
+    assert len(queue) == 3
+
+
+def test_worker_args_drop_coordinator_options():
+    args = ("tests/api", "--dist-workers", "4", "--dist-listen=0.0.0.0:5000", "--junitxml", "out.xml", "-x")
+    assert worker_args(args) == ["tests/api", "-x"]
+    args = ("tests/api", "--lf", "--lfnf", "none", "--sw", "-k", "pet", "--cache-clear", "--ff")
+    assert worker_args(args) == ["tests/api", "-k", "pet"]
+
+
+@pytest.fixture
+def suite(pytester: pytest.Pytester, monkeypatch, request) -> pytest.Pytester:
+    monkeypatch.setenv("PYTHONPATH", str(request.config.rootpath))
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(test_suite=SUITE)
+    return pytester
+
+
+def test_workers_share_the_suite_and_coordinator_merges_reports(suite: pytest.Pytester):
+    result = suite.runpytest_subprocess("--dist-workers", "3", "-rf")
+    result.assert_outcomes(passed=6, failed=1)
+    result.stdout.fnmatch_lines(["*output-of-failing-test*", "*3 workers*", "worker 0 *: * tests, *s busy"])
+    workers = (suite.path / "workers.txt").read_text().split()
+    assert len(workers) == 6 and len(set(workers)) > 1
+
+    durations = json.loads((suite.path / ".pytest_cache" / "v" / "petstore" / "durations").read_text())
+    assert durations["test_suite.py::test_slow[0]"] >= 0.2
+
+
+def test_crashed_worker_fails_its_test_and_others_continue(suite: pytest.Pytester):
+    suite.makepyfile(test_crash="""
+        import os
+
+        def test_crash():
+            os._exit(3)
+    """)
+    result = suite.runpytest_subprocess("--dist-workers", "2")
+    result.assert_outcomes(passed=6, failed=2)
+    result.stdout.fnmatch_lines(["*exited while running this test*"])
+
+
+def test_last_failed_run_hands_out_only_the_coordinators_selection(suite: pytest.Pytester):
+    suite.runpytest_subprocess("--dist-workers", "2").assert_outcomes(passed=6, failed=1)
+    result = suite.runpytest_subprocess("--dist-workers", "2", "--lf")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*2 workers*"])
+    assert len((suite.path / "workers.txt").read_text().split()) == 6
@@ -0,0 +1,94 @@
+import time
+import pytest
+from src.http.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+from src.http.client import HttpClient
+from src.http.transport import WSGITransport
+from src.http.endpoints import endpoint_key, path_template
+from src.http.retry import NO_RETRY, RetryPolicy, parse_retry_after
+from src.server.petstore_server import PetstoreApp
+
+
+def test_path_template_replaces_ids():
+    assert path_template("/pet/12345") == "/pet/{id}"
+    assert path_template("/pet/findByStatus?status=sold") == "/pet/findByStatus"
+    assert endpoint_key("get", "/pet/1") == "GET /pet/{id}"
+
+
+def test_retry_policy_is_idempotency_aware():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.should_retry_status("GET", 503, attempt=0)
+    assert not policy.should_retry_status("POST", 503, attempt=0)
+    assert not policy.should_retry_status("GET", 404, attempt=0)
+    assert not policy.should_retry_status("GET", 503, attempt=2)
+    assert policy.should_retry_error("POST", ConnectionError(), attempt=0, request_sent=False)
+    assert not policy.should_retry_error("POST", ConnectionError(), attempt=0, request_sent=True)
+
+
+def test_retry_policy_backoff_and_retry_after():
+    policy = RetryPolicy(backoff_factor=1.0, backoff_max=5.0, jitter=0.0)
+    assert [policy.backoff(attempt) for attempt in range(4)] == [1.0, 2.0, 4.0, 5.0]
+    assert policy.backoff(0, retry_after="3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+def test_circuit_breaker_opens_and_recovers():
+    breaker = CircuitBreaker("GET /pet/{id}", failure_threshold=2, reset_timeout=0.05)
+    breaker.record_status(503)
+    assert breaker.state == CLOSED
+    breaker.record_status(503)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_status(200)
+    assert breaker.state == CLOSED
+
+
+class FailingOnceTransport(WSGITransport):
+    def __init__(self, app, error: Exception):
+        super().__init__(app)
+        self.error = error
+
+    def send(self, *args, **kwargs):
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+        return super().send(*args, **kwargs)
+
+
+def test_unclassified_error_releases_half_open_probe():
+    breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=0.05)
+    transport = FailingOnceTransport(PetstoreApp(), ValueError("not a network error"))
+    with HttpClient("http://petstore.local/v2", retry_policy=NO_RETRY, circuit_breakers=breakers, transport=transport) as client:
+        breaker = breakers.get("GET /pet/findByStatus")
+        breaker.record_failure()
+        time.sleep(0.06)
+        with pytest.raises(ValueError):
+            client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+        assert breaker.state == HALF_OPEN
+        assert client.request("GET", "/pet/findByStatus", params={"status": "sold"}).status_code == 200
+        assert breaker.state == CLOSED
+
+
+def test_retries_are_opt_in_and_failures_count_toward_the_breaker():
+    app, calls = PetstoreApp(error_rate=1.0, error_status=500), []
+
+    def counting_app(environ, start_response):
+        calls.append(environ["REQUEST_METHOD"])
+        return app(environ, start_response)
+
+    breakers = CircuitBreakerRegistry(failure_threshold=5)
+    with HttpClient("http://petstore.local/v2", circuit_breakers=breakers, transport=WSGITransport(counting_app)) as client:
+        assert client.request("DELETE", "/pet/1").status_code == 500
+        assert calls == ["DELETE"]
+        assert breakers.get("DELETE /pet/{id}").failures == 1
+        client.retry_policy = RetryPolicy(max_retries=2, backoff_factor=0.0)
+        assert client.request("DELETE", "/pet/1").status_code == 500
+        assert len(calls) == 4
+        assert breakers.get("DELETE /pet/{id}").failures == 4
@@ -0,0 +1,61 @@
+import threading
+import pytest
+from src.utils import id_allocator
+from src.utils.data_factory import generate_pet, generate_pets
+from src.utils.id_allocator import PREFIX_BITS, SEQUENCE_BITS, WORKER_BITS, IdAllocator
+
+
+def test_ids_are_unique_across_threads():
+    allocator = IdAllocator(block_size=64)
+    results = [[] for _ in range(8)]
+
+    def take(bucket):
+        bucket.extend(allocator.next_id() for _ in range(1000))
+
+    threads = [threading.Thread(target=take, args=(bucket,)) for bucket in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ids = [pet_id for bucket in results for pet_id in bucket]
+    assert len(set(ids)) == 8000
+    assert all(allocator.owns(pet_id) for pet_id in ids)
+
+
+def test_workers_and_runs_get_disjoint_ranges():
+    first, second = IdAllocator(prefix=5, worker=0), IdAllocator(prefix=5, worker=1)
+    other_run = IdAllocator(prefix=6, worker=0)
+    ids = [first.next_id(), second.next_id(), other_run.next_id()]
+    assert len(set(ids)) == 3
+    assert not first.owns(ids[1]) and not first.owns(ids[2])
+    assert max(IdAllocator(prefix=(1 << PREFIX_BITS) - 1, worker=(1 << WORKER_BITS) - 1).reserve(10)) < 1 << 62
+
+
+def test_reserve_is_contiguous_and_bounded():
+    allocator = IdAllocator(prefix=1, worker=0)
+    block = allocator.reserve(100)
+    assert list(block) == list(range(block.start, block.start + 100))
+    assert allocator.reserve(1).start == block.stop
+    with pytest.raises(RuntimeError, match="exhausted"):
+        allocator.reserve(1 << SEQUENCE_BITS)
+    with pytest.raises(ValueError):
+        IdAllocator(prefix=0)
+
+
+def test_environment_selects_prefix_and_worker(monkeypatch):
+    monkeypatch.setenv("PETSTORE_RUN_ID", "41")
+    monkeypatch.setenv("PETSTORE_WORKER_ID", "worker-3")
+    allocator = IdAllocator()
+    assert (allocator.prefix, allocator.worker) == (42, 3)
+    monkeypatch.delenv("PETSTORE_WORKER_ID")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw7")
+    assert IdAllocator().worker == 7
+
+
+def test_factories_draw_from_shared_allocator(monkeypatch):
+    allocator = IdAllocator(prefix=9, worker=2)
+    monkeypatch.setattr(id_allocator, "_allocator", allocator)
+    pets = generate_pets(50)
+    single = generate_pet()
+    assert all(allocator.owns(pet_id) for pet_id in pets.ids)
+    assert allocator.owns(single.id) and single.id not in pets.ids
@@ -0,0 +1,27 @@
+import pytest
+from src.http.codec import JsonCodec, available_codecs, get_codec
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_codec_round_trip(name: str):
+    codec = get_codec(name)
+    payload = {"id": 1, "name": "Café", "photoUrls": ["a"], "tags": None}
+    encoded = codec.dumps(payload)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(memoryview(encoded)) == payload
+
+
+def test_codec_falls_back_to_stdlib():
+    assert "json" in available_codecs()
+    assert isinstance(get_codec("auto"), JsonCodec)
+    assert get_codec("auto").name == available_codecs()[0]
+
+
+def test_codec_rejects_invalid_json():
+    with pytest.raises(ValueError):
+        get_codec().loads(b"{not json")
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        get_codec("yaml")
@@ -0,0 +1,26 @@
+import pytest
+from src.http.json_stream import iter_json_array, JsonStreamError
+
+
+def test_iter_json_array_across_chunk_boundaries():
+    chunks = [b'[1', b'2, 3', b'4,"a', b'b", {"x":', b' [1]}, true, nu', b'll]']
+    assert list(iter_json_array(chunks)) == [12, 34, "ab", {"x": [1]}, True, None]
+
+
+def test_iter_json_array_split_multibyte_character():
+    encoded = '["café"]'.encode("utf-8")
+    split_at = encoded.index(b"\xc3") + 1
+    assert list(iter_json_array([encoded[:split_at], encoded[split_at:]])) == ["café"]
+
+
+def test_iter_json_array_stops_early():
+    chunks = iter([b"[1,", b"2,", b"3]"])
+    items = iter_json_array(chunks)
+    assert next(items) == 1
+    assert next(chunks) == b"2,"
+
+
+@pytest.mark.parametrize("chunks", [[b"{}"], [b"[1,"], [b""], [b"[1 2]"], [b"[,1]"], [b"[1,]"]])
+def test_iter_json_array_rejects_malformed_input(chunks):
+    with pytest.raises(JsonStreamError):
+        list(iter_json_array(chunks))
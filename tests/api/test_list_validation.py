@@ -0,0 +1,59 @@
+import json
+import pytest
+from src.api.pet_api import PetApi
+from src.contracts.validators import ContractViolationError
+from src.http.response import ResponseContext
+
+
+def make_response(items: list) -> ResponseContext:
+    return ResponseContext(
+        method="GET",
+        url="https://petstore.swagger.io/v2/pet/findByStatus",
+        status_code=200,
+        headers={"Content-Type": "application/json"},
+        content=json.dumps(items).encode("utf-8")
+    )
+
+
+def pet_list(size: int, malformed_every: int = 0) -> list:
+    items = []
+    for pet_id in range(size):
+        item = {"id": pet_id, "name": f"pet-{pet_id}", "photoUrls": [], "status": "sold"}
+        if malformed_every and pet_id % malformed_every == 0:
+            item["status"] = "lost"
+            if pet_id % (malformed_every * 2) == 0:
+                del item["name"]
+        items.append(item)
+    return items
+
+
+def test_valid_list_is_validated_whole():
+    response = make_response(pet_list(1000))
+    pets = PetApi(validation="full")._parse_pet_list(response)
+    assert [pet.id for pet in pets] == list(range(1000))
+    assert pets[1].name == "pet-1"
+    assert tuple(response.validation) == ("full", 1000, 1000)
+
+
+def test_every_invalid_item_is_reported():
+    with pytest.raises(ContractViolationError) as error:
+        PetApi(validation="full")._parse_pet_list(make_response(pet_list(1000, malformed_every=10)))
+
+    item_errors = error.value.item_errors
+    assert [item.index for item in item_errors] == list(range(0, 1000, 10))
+    assert [item.id for item in item_errors] == list(range(0, 1000, 10))
+    assert {error["loc"] for error in item_errors[0].errors} == {("name",), ("status",)}
+    assert error.value.summary == {"literal_error": 100, "missing": 50}
+    message = str(error.value)
+    assert message.startswith("Contract violation: One or more pets in list failed validation: 100 of 1000 invalid")
+    assert "90 more in item_errors" in message
+
+
+def test_invalid_list_is_not_decoded_twice(monkeypatch):
+    response = make_response(pet_list(20, malformed_every=10)[:-1] + ["not a pet"])
+    monkeypatch.setattr(ResponseContext, "json", lambda self: pytest.fail("body decoded a second time"))
+    with pytest.raises(ContractViolationError) as error:
+        PetApi(validation="full")._parse_pet_list(response)
+    assert [(item.index, item.id) for item in error.value.item_errors] == [(0, 0), (10, 10), (19, None)]
+    assert "3 of 20 invalid" in str(error.value)
+
@@ -0,0 +1,66 @@
+import pytest
+from src.api.pet_api import PetApi
+from src.http.client import HttpClient
+from src.http.retry import NO_RETRY
+from src.http.transport import WSGITransport
+from src.load.histogram import Histogram
+from src.load.runner import LoadRunner, build_phases, parse_mix, schedule
+from src.server.petstore_server import PetstoreApp
+
+
+def test_histogram_percentiles_within_precision():
+    histogram = Histogram(significant_figures=3)
+    for value in range(1, 100_001):
+        histogram.record(value)
+    assert histogram.count == 100_000
+    assert histogram.min == 1
+    assert histogram.max == 100_000
+    for percentile in (50.0, 90.0, 99.0, 99.9):
+        expected = 100_000 * percentile / 100
+        assert abs(histogram.percentile(percentile) - expected) / expected < 0.001
+
+
+def test_histogram_merge():
+    first, second = Histogram(), Histogram()
+    first.record(10)
+    second.record(1_000_000)
+    first.merge(second)
+    assert first.count == 2
+    assert first.max == 1_000_000
+    assert first.percentile(100.0) >= 999_000
+
+
+def test_open_loop_schedule_follows_ramp_and_steady_rate():
+    offsets = list(schedule(build_phases(rate=100.0, duration=2.0, ramp_up=1.0)))
+    ramp = [offset for offset in offsets if offset < 1.0]
+    steady = [offset for offset in offsets if offset >= 1.0]
+    assert 40 <= len(ramp) <= 60
+    assert len(steady) == 200
+    assert offsets == sorted(offsets)
+
+
+def test_parse_mix_rejects_unknown_operations():
+    assert parse_mix("get=3,create=1") == {"get": 3.0, "create": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("patch=1")
+
+
+def test_load_runner_reports_per_operation(pet_api: PetApi):
+    runner = LoadRunner(pet_api, parse_mix("create=1,get=1,find=1"), workers=8, seed=7)
+    wall_time = runner.run(build_phases(rate=50.0, duration=0.5))
+    report = runner.report(wall_time)
+    runner.cleanup()
+    assert report["requests"] == 25
+    assert set(report["operations"]) <= {"create", "get", "find"}
+    assert all(operation["latency_ms"]["p50"] > 0 for operation in report["operations"].values())
+
+
+def test_failed_fallback_creates_count_as_create_errors():
+    app = PetstoreApp(error_rate=1.0, error_status=503)
+    with HttpClient("http://petstore.local/v2", retry_policy=NO_RETRY, transport=WSGITransport(app)) as client:
+        runner = LoadRunner(PetApi(client), parse_mix("get=1,delete=1"), workers=16, seed=7)
+        runner.run(build_phases(rate=400.0, duration=0.5))
+    report = runner.report(1.0)
+    assert set(report["operations"]) == {"create"}
+    assert report["operations"]["create"]["count"] == 200
+    assert sum(report["operations"]["create"]["errors"].values()) == 200
@@ -0,0 +1,54 @@
+import socket
+import time
+from src.api.pet_api import PetApi, ApiError
+from src.http.client import HttpClient
+from src.http.retry import NO_RETRY
+from src.server.petstore_server import LocalPetstore, WSGIRequestHandler
+from src.utils.data_factory import generate_pet
+
+
+def test_local_petstore_serves_pet_api():
+    with LocalPetstore() as server, HttpClient(server.base_url) as client:
+        api = PetApi(client)
+        created = api.create_pet(generate_pet(pet_id=42, status="pending"))
+        assert api.get_pet(42) == created
+        assert [pet.id for pet in api.find_by_status("pending")] == [42]
+        assert api.delete_pet(42).message == "42"
+        assert server.app.pets == {}
+
+
+def test_local_petstore_payload_size_injection():
+    with LocalPetstore(payload_size=250) as server, HttpClient(server.base_url) as client:
+        pets = PetApi(client).find_by_status("sold")
+        assert len(pets) == 250
+        assert all(pet.status == "sold" for pet in pets)
+
+
+def test_slow_reader_gets_the_whole_body(monkeypatch):
+    monkeypatch.setattr(WSGIRequestHandler, "timeout", 0.2)
+    with LocalPetstore(payload_size=20000) as server:
+        with socket.create_connection((server.host, server.port)) as connection:
+            connection.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
+            connection.sendall(b"GET /v2/pet/findByStatus?status=sold HTTP/1.1\r\nHost: petstore\r\n\r\n")
+            received = bytearray(connection.recv(4096))
+            time.sleep(0.6)
+            head, _, body = bytes(received).partition(b"\r\n\r\n")
+            length = int(next(line.split(b":")[1] for line in head.split(b"\r\n") if line.lower().startswith(b"content-length")))
+            while len(body) < length:
+                chunk = connection.recv(65536)
+                assert chunk, f"connection closed after {len(body)} of {length} bytes"
+                body += chunk
+
+
+def test_local_petstore_error_rate_injection():
+    with LocalPetstore(error_rate=1.0, error_status=503) as server:
+        client = HttpClient(server.base_url, retry_policy=NO_RETRY)
+        try:
+            PetApi(client).get_pet(1)
+        except ApiError as e:
+            assert e.response.status_code == 503
+            assert e.error_response.message == "something bad happened"
+        else:
+            raise AssertionError("Expected injected 503")
+        finally:
+            client.close()
@@ -0,0 +1,81 @@
+import json
+import pytest
+from src.api.pet_api import PetApi, PetNotFoundError
+from src.http.cassette import Cassette, CassetteMissError, RECORD, REPLAY
+from src.http.client import HttpClient
+from src.http.transport import WSGITransport
+from src.metrics.instrumentation import instrument_client, instrument_pet_api
+from src.metrics.registry import MetricsRegistry
+from src.server.petstore_server import PetstoreApp
+from src.utils.data_factory import generate_pet
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("method", "status"))
+    latency = registry.histogram("latency_seconds", "Latency", ("method",), buckets=(0.1, 1.0))
+    requests.inc(method="GET", status=200)
+    requests.inc(method="GET", status=200)
+    latency.observe(0.05, method="GET")
+    latency.observe(0.5, method="GET")
+
+    text = registry.to_prometheus()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{method="GET",status="200"} 2.0' in text
+    assert 'latency_seconds_bucket{method="GET",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{method="GET",le="+Inf"} 2' in text
+    assert 'latency_seconds_count{method="GET"} 2' in text
+    assert json.loads(registry.to_json())["requests_total"]["samples"][0]["value"] == 2.0
+
+
+def test_registry_rejects_conflicting_registration():
+    registry = MetricsRegistry()
+    assert registry.counter("calls", "Calls", ("method",)) is registry.counter("calls", "Calls", ("method",))
+    with pytest.raises(ValueError):
+        registry.gauge("calls", "Calls", ("method",))
+
+
+def test_instrumented_client_records_requests_and_errors(isolated_client: HttpClient):
+    registry = MetricsRegistry()
+    instrument_client(isolated_client, registry)
+    api = PetApi(isolated_client)
+    instrument_pet_api(api, registry)
+
+    created = api.create_pet(generate_pet())
+    api.get_pet(created.id)
+    api.delete_pet(created.id)
+    with pytest.raises(PetNotFoundError):
+        api.get_pet(created.id)
+
+    requests_total = registry.get("petstore_http_requests_total")
+    assert requests_total.value(method="GET", path="/pet/{id}", status=200) == 1
+    assert requests_total.value(method="GET", path="/pet/{id}", status=404) == 1
+    assert registry.get("petstore_http_in_flight_requests").value(method="GET", path="/pet/{id}") == 0
+    errors = registry.get("petstore_errors_total")
+    assert errors.value(method="GET", path="/pet/{id}", status=404, exception="PetNotFoundError") == 1
+    assert "petstore_api_call_duration_seconds_bucket" in registry.to_prometheus()
+
+
+def test_cassette_miss_and_streamed_requests_are_counted(tmp_path):
+    registry = MetricsRegistry()
+    path = str(tmp_path / "empty.cassette")
+    Cassette(path, RECORD).close()
+    with HttpClient("http://petstore.local/v2", cassette=Cassette(path, REPLAY)) as client:
+        instrument_client(client, registry)
+        with pytest.raises(CassetteMissError):
+            client.request("GET", "/pet/1")
+
+    app = PetstoreApp()
+    with HttpClient("http://petstore.local/v2", transport=WSGITransport(app)) as client:
+        instrument_client(client, registry)
+        api = PetApi(client)
+        created = api.create_pet(generate_pet(status="pending"))
+        assert created.id in [pet.id for pet in api.iter_by_status("pending")]
+
+    in_flight = registry.get("petstore_http_in_flight_requests")
+    assert in_flight.value(method="GET", path="/pet/{id}") == 0
+    assert in_flight.value(method="GET", path="/pet/findByStatus") == 0
+    errors = registry.get("petstore_errors_total")
+    assert errors.value(method="GET", path="/pet/{id}", status="", exception="CassetteMissError") == 1
+    requests_total = registry.get("petstore_http_requests_total")
+    assert requests_total.value(method="GET", path="/pet/findByStatus", status=200) == 1
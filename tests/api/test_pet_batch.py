@@ -0,0 +1,61 @@
+import pytest
+from pydantic_core import to_json
+from src.models.pet import Category, Pet, Tag
+from src.models.pet_batch import PetBatch
+from src.utils.data_factory import generate_pets
+
+
+@pytest.fixture(scope="module")
+def pets():
+    pets = generate_pets(3000, seed=5, start_id=1)[:]
+    pets.append(Pet(id=2 ** 62, name='quote " and ünicode', photoUrls=[], tags=[], category=Category(), status=None))
+    pets.append(Pet(id=7, name="Rex", photoUrls=["a", "a"], tags=[Tag(id=9)], category=Category(id=8, name="Lizards")))
+    return pets
+
+
+def test_round_trip_preserves_every_field(pets):
+    batch = PetBatch.from_pets(pets)
+    assert len(batch) == len(pets)
+    assert batch.to_pets() == pets
+    assert [to_json(pet) for pet in batch] == [to_json(pet) for pet in pets]
+    assert batch[-2] == pets[-2] and batch[10:20:3] == pets[10:20:3]
+    with pytest.raises(IndexError):
+        batch[len(pets)]
+
+
+def test_tables_intern_repeated_values(pets):
+    batch = PetBatch.from_pets(pets)
+    assert len(batch.url_table) == 4
+    assert len(batch.tag_table) == 5
+    assert len(batch.name_table) < len(pets)
+    assert batch.column_bytes < 64 * len(pets)
+
+
+@pytest.mark.parametrize("filters, keep", [
+    ({"status": "sold"}, lambda pet: pet.status == "sold"),
+    ({"category": "Cats"}, lambda pet: pet.category is not None and pet.category.name == "Cats"),
+    ({"category": 8}, lambda pet: pet.category is not None and pet.category.id == 8),
+    ({"tag": "cute"}, lambda pet: any(tag.name == "cute" for tag in pet.tags or ())),
+    ({"status": "pending", "category": 2, "tag": 3},
+     lambda pet: pet.status == "pending" and pet.category is not None and pet.category.id == 2
+     and any(tag.id == 3 for tag in pet.tags or ())),
+])
+def test_filters_match_list_comprehension(pets, filters, keep):
+    selected = PetBatch.from_pets(pets).filter(**filters)
+    assert selected.to_pets() == [pet for pet in pets if keep(pet)]
+
+
+def test_filters_accept_several_values_and_compose(pets):
+    batch = PetBatch.from_pets(pets)
+    assert list(batch.with_status("sold", None).ids) == [pet.id for pet in pets if pet.status in ("sold", None)]
+    assert list(batch.with_tag("cute").with_tag("young").ids) == [
+        pet.id for pet in pets if {"cute", "young"} <= {tag.name for tag in pet.tags or ()}
+    ]
+    assert len(batch.in_category("Unknown")) == 0
+
+
+def test_take_handles_empty_and_single_rows(pets):
+    batch = PetBatch.from_pets(pets)
+    assert batch.take([]).to_pets() == []
+    assert batch.take([len(pets) - 1]).to_pets() == [pets[-1]]
+    assert batch.take([3, 1]).with_tag(*range(10)).to_pets() == [pet for pet in (pets[3], pets[1]) if pet.tags]
@@ -0,0 +1,38 @@
+from src.api.pet_api import PetApi, PetNotFoundError
+from src.models.pet import Pet
+from src.models.api_response import ApiResponse
+from src.utils.cleanup import PetCleanup
+from src.utils.data_factory import generate_pet
+
+
+def test_bulk_create_get_delete_preserves_order(pet_api: PetApi, pet_cleanup: PetCleanup):
+    pets = [generate_pet() for _ in range(10)]
+    pet_cleanup.track_many(p.id for p in pets)
+
+    created = pet_api.create_pets(pets, concurrency=4)
+    assert [p.id for p in created] == [p.id for p in pets]
+
+    retrieved = pet_api.get_pets([p.id for p in pets], concurrency=4)
+    assert all(isinstance(p, Pet) for p in retrieved)
+    assert [p.id for p in retrieved] == [p.id for p in pets]
+
+    updated = pet_api.update_pets(
+        [generate_pet(pet_id=p.id, name="BulkUpdated") for p in pets], concurrency=4
+    )
+    assert all(p.name == "BulkUpdated" for p in updated)
+
+    deleted = pet_api.delete_pets([p.id for p in pets], concurrency=4)
+    assert all(isinstance(r, ApiResponse) for r in deleted)
+
+
+def test_bulk_get_returns_exceptions_per_item(pet_api: PetApi, pet_cleanup: PetCleanup):
+    pet = pet_api.create_pet(generate_pet())
+    pet_cleanup.track(pet.id)
+    results = pet_api.get_pets([999999999999, pet.id])
+    assert isinstance(results[0], PetNotFoundError)
+    assert isinstance(results[1], Pet)
+    assert results[1].id == pet.id
+
+
+def test_bulk_with_empty_input(pet_api: PetApi):
+    assert pet_api.create_pets([]) == []
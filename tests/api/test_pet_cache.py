@@ -0,0 +1,48 @@
+import time
+from src.api.cache import TTLCache, MISSING
+from src.api.cached_pet_api import CachedPetApi
+from src.http.client import HttpClient
+from src.utils.cleanup import PetCleanup
+from src.utils.data_factory import generate_pet
+
+
+def test_ttl_cache_lru_eviction_and_expiry():
+    cache = TTLCache(maxsize=2, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.stats.evictions == 1
+
+    time.sleep(0.06)
+    assert cache.get("a") is MISSING
+    assert cache.stats.expirations == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+
+
+def test_cached_get_pet_and_write_invalidation(http_client: HttpClient, pet_cleanup: PetCleanup):
+    api = CachedPetApi(http_client)
+    created = api.create_pet(generate_pet(status="available"))
+    pet_cleanup.track(created.id)
+    first = api.get_pet(created.id)
+    assert api.get_pet(created.id) is first
+    assert api.cache.stats.hits == 1
+
+    updated = api.update_pet(generate_pet(pet_id=created.id, name="CachedUpdated", status="sold"))
+    assert api.get_pet(created.id).name == updated.name
+    assert any(pet.id == created.id for pet in api.find_by_status("sold"))
+
+    api.delete_pet(created.id)
+    assert api.cache.peek(("pet", created.id)) is MISSING
+    assert api.cache.peek(("status", "sold")) is MISSING
+
+
+def test_cache_bypass_hits_server(http_client: HttpClient, pet_cleanup: PetCleanup):
+    api = CachedPetApi(http_client, bypass=True)
+    created = api.create_pet(generate_pet())
+    pet_cleanup.track(created.id)
+    api.get_pet(created.id)
+    api.get_pet(created.id)
+    assert len(api.cache) == 0
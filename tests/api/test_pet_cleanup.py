@@ -0,0 +1,126 @@
+import signal
+import subprocess
+import sys
+import pytest
+from src.api.pet_api import PetApi, PetNotFoundError
+from src.http.client import HttpClient
+from src.http.retry import NO_RETRY
+from src.server.petstore_server import LocalPetstore
+from src.utils.cleanup import PetCleanup
+from src.utils.data_factory import generate_pet
+
+CHILD = """
+import os, sys, time
+from src.api.pet_api import PetApi
+from src.http.client import HttpClient
+from src.utils.cleanup import PetCleanup
+from src.utils.data_factory import generate_pet
+
+api = PetApi(HttpClient(sys.argv[1]))
+cleanup = PetCleanup(api, sys.argv[2])
+cleanup.install()
+print(cleanup.track(api.create_pet(generate_pet()).id), flush=True)
+# Crash only once the parent has seen the pet.
+sys.stdin.readline()
+if sys.argv[3] == "kill":
+    os.kill(os.getpid(), 9)
+elif sys.argv[3] == "raise":
+    raise RuntimeError("test crashed")
+time.sleep(30)
+"""
+
+
+@pytest.fixture
+def server():
+    with LocalPetstore() as server:
+        yield server
+
+
+@pytest.fixture
+def api(server: LocalPetstore):
+    with HttpClient(server.base_url) as client:
+        yield PetApi(client)
+
+
+def exists(api: PetApi, pet_id: int) -> bool:
+    try:
+        api.get_pet(pet_id)
+    except PetNotFoundError:
+        return False
+    return True
+
+
+def start_child(server: LocalPetstore, journal_dir, mode: str, request) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-c", CHILD, server.base_url, str(journal_dir), mode],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=request.config.rootpath
+    )
+
+
+def test_cleanup_deletes_tracked_pets_once(api: PetApi, tmp_path):
+    cleanup = PetCleanup(api, tmp_path, concurrency=4)
+    pet_ids = [api.create_pet(generate_pet()).id for _ in range(10)]
+    cleanup.track_many(pet_ids)
+    cleanup.track(pet_ids[0])
+    api.delete_pet(pet_ids[1])
+    assert len(cleanup) == 10
+    assert cleanup.journal.read_text().splitlines()[1:] == [str(pet_id) for pet_id in pet_ids]
+
+    assert cleanup.cleanup() == []
+    assert not any(exists(api, pet_id) for pet_id in pet_ids)
+    assert not cleanup.journal.exists()
+    assert cleanup.cleanup() == []
+
+
+def test_failed_deletes_stay_tracked_and_journaled(tmp_path):
+    with LocalPetstore(error_rate=1.0, error_status=503) as server:
+        with HttpClient(server.base_url, retry_policy=NO_RETRY) as client:
+            cleanup = PetCleanup(PetApi(client), tmp_path)
+            cleanup.track_many([1, 2])
+            assert sorted(cleanup.cleanup()) == [1, 2]
+            assert len(cleanup) == 2
+            assert cleanup.journal.read_text().splitlines() == [server.base_url, "1", "2"]
+
+
+def test_recover_adopts_journals_of_dead_processes(api: PetApi, tmp_path):
+    pet_ids = [api.create_pet(generate_pet()).id for _ in range(3)]
+    dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    orphan = tmp_path / f"{dead.stdout.strip()}.ids"
+    orphan.write_text(api.client.base_url + "\n" + "".join(f"{pet_id}\n" for pet_id in pet_ids))
+    elsewhere = tmp_path / f"{int(dead.stdout) + 1}.ids"
+    elsewhere.write_text("http://elsewhere.invalid/v2\n7\n")
+
+    cleanup = PetCleanup(api, tmp_path)
+    assert cleanup.recover() == 3
+    assert not orphan.exists() and elsewhere.exists()
+    assert cleanup.cleanup() == []
+    assert not any(exists(api, pet_id) for pet_id in pet_ids)
+
+
+@pytest.mark.parametrize("mode", ["raise", "term"])
+def test_crashing_process_still_cleans_up(server: LocalPetstore, api: PetApi, tmp_path, mode, request):
+    child = start_child(server, tmp_path, mode, request)
+    pet_id = int(child.stdout.readline())
+    assert exists(api, pet_id)
+    child.stdin.write("crash\n")
+    child.stdin.flush()
+    if mode == "term":
+        child.send_signal(signal.SIGTERM)
+        assert child.wait(timeout=10) == -signal.SIGTERM
+    else:
+        assert child.wait(timeout=10) == 1
+    assert not exists(api, pet_id)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_killed_process_is_cleaned_up_by_next_session(server: LocalPetstore, api: PetApi, tmp_path, request):
+    child = start_child(server, tmp_path, "kill", request)
+    pet_id = int(child.stdout.readline())
+    child.stdin.close()
+    assert child.wait(timeout=10) == -signal.SIGKILL
+    assert exists(api, pet_id)
+
+    cleanup = PetCleanup(api, tmp_path)
+    assert cleanup.recover() == 1
+    assert cleanup.cleanup() == []
+    assert not exists(api, pet_id)
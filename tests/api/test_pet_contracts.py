@@ -5,57 +5,53 @@ from src.models.pet import Pet
 from src.models.api_response import ApiResponse
 from src.utils.data_factory import generate_pet
 from src.http.client import HttpClient
+from src.utils.cleanup import PetCleanup
 
 
-def test_get_pet_contract_compliance(pet_api: PetApi):
+def test_get_pet_contract_compliance(http_client: HttpClient, pet_api: PetApi, pet_cleanup: PetCleanup):
     pet = generate_pet()
     created = pet_api.create_pet(pet)
+    pet_cleanup.track(created.id)
     
-    try:
-        response = HttpClient().request("GET", f"/pet/{created.id}")
-        assert response.status_code == 200
-        
-        parsed = parse_json_as(Pet, response)
-        assert isinstance(parsed, Pet)
-        assert parsed.id == created.id
-    finally:
-        pet_api.delete_pet(created.id)
+    response = http_client.request("GET", f"/pet/{created.id}")
+    assert response.status_code == 200
+    
+    parsed = parse_json_as(Pet, response)
+    assert isinstance(parsed, Pet)
+    assert parsed.id == created.id
 
 
-def test_create_pet_contract_compliance(pet_api: PetApi):
+def test_create_pet_contract_compliance(http_client: HttpClient, pet_cleanup: PetCleanup):
     pet = generate_pet()
     
-    response = HttpClient().request("POST", "/pet", json=pet.model_dump())
+    response = http_client.request("POST", "/pet", json=pet.model_dump())
+    pet_cleanup.track(pet.id)
     assert response.status_code == 200
     
     parsed = parse_json_as(Pet, response)
     assert isinstance(parsed, Pet)
     assert parsed.id == pet.id
-    
-    pet_api.delete_pet(parsed.id)
 
 
-def test_update_pet_contract_compliance(pet_api: PetApi):
+def test_update_pet_contract_compliance(http_client: HttpClient, pet_api: PetApi, pet_cleanup: PetCleanup):
     pet = generate_pet()
     created = pet_api.create_pet(pet)
+    pet_cleanup.track(created.id)
     
-    try:
-        updated_pet = generate_pet(pet_id=created.id, name="Updated")
-        response = HttpClient().request("PUT", "/pet", json=updated_pet.model_dump())
-        assert response.status_code == 200
-        
-        parsed = parse_json_as(Pet, response)
-        assert isinstance(parsed, Pet)
-        assert parsed.id == created.id
-    finally:
-        pet_api.delete_pet(created.id)
+    updated_pet = generate_pet(pet_id=created.id, name="Updated")
+    response = http_client.request("PUT", "/pet", json=updated_pet.model_dump())
+    assert response.status_code == 200
+    
+    parsed = parse_json_as(Pet, response)
+    assert isinstance(parsed, Pet)
+    assert parsed.id == created.id
 
 
-def test_delete_pet_contract_compliance(pet_api: PetApi):
+def test_delete_pet_contract_compliance(http_client: HttpClient, pet_api: PetApi):
     pet = generate_pet()
     created = pet_api.create_pet(pet)
     
-    response = HttpClient().request("DELETE", f"/pet/{created.id}")
+    response = http_client.request("DELETE", f"/pet/{created.id}")
     assert response.status_code == 200
     
     parsed = parse_json_as(ApiResponse, response)
@@ -63,22 +59,20 @@ def test_delete_pet_contract_compliance(pet_api: PetApi):
     assert parsed.code == 200
 
 
-def test_find_by_status_contract_compliance(pet_api: PetApi):
+def test_find_by_status_contract_compliance(http_client: HttpClient, pet_api: PetApi, pet_cleanup: PetCleanup):
     pet = generate_pet(status="available")
     created = pet_api.create_pet(pet)
+    pet_cleanup.track(created.id)
     
-    try:
-        response = HttpClient().request("GET", "/pet/findByStatus", params={"status": "available"})
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert isinstance(data, list)
-        
-        for item in data[:5]:
-            parsed = Pet.model_validate(item)
-            assert isinstance(parsed, Pet)
-    finally:
-        pet_api.delete_pet(created.id)
+    response = http_client.request("GET", "/pet/findByStatus", params={"status": "available"})
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert isinstance(data, list)
+    
+    for item in data[:5]:
+        parsed = Pet.model_validate(item)
+        assert isinstance(parsed, Pet)
 
 
 def test_pet_model_strictness():
@@ -3,6 +3,7 @@ from src.api.pet_api import PetApi, PetNotFoundError, ApiError
 from src.contracts.validators import ContractViolationError
 from src.utils.data_factory import generate_pet, generate_invalid_pet_payload, generate_empty_pet_payload
 from src.http.client import HttpClient
+from src.utils.cleanup import PetCleanup
 
 
 def test_get_nonexistent_pet(pet_api: PetApi):
@@ -20,11 +21,10 @@ def test_delete_nonexistent_pet(pet_api: PetApi):
         pass
 
 
-def test_create_pet_with_invalid_payload(pet_api: PetApi):
-    client = HttpClient()
+def test_create_pet_with_invalid_payload(http_client: HttpClient):
     invalid_payload = generate_invalid_pet_payload()
     
-    response = client.request("POST", "/pet", json=invalid_payload)
+    response = http_client.request("POST", "/pet", json=invalid_payload)
     
     if response.status_code in (400, 500):
         try:
@@ -43,11 +43,10 @@ def test_create_pet_with_invalid_payload(pet_api: PetApi):
             pytest.fail(f"API returned 200 but response doesn't match Pet contract: {e}")
 
 
-def test_create_pet_with_empty_payload(pet_api: PetApi):
-    client = HttpClient()
+def test_create_pet_with_empty_payload(http_client: HttpClient):
     empty_payload = generate_empty_pet_payload()
     
-    response = client.request("POST", "/pet", json=empty_payload)
+    response = http_client.request("POST", "/pet", json=empty_payload)
     
     if response.status_code in (400, 500):
         try:
@@ -63,12 +62,11 @@ def test_create_pet_with_empty_payload(pet_api: PetApi):
             parse_json_as(Pet, response)
 
 
-def test_update_pet_without_id(pet_api: PetApi):
-    client = HttpClient()
+def test_update_pet_without_id(http_client: HttpClient):
     pet_data = generate_pet().model_dump()
     del pet_data["id"]
     
-    response = client.request("PUT", "/pet", json=pet_data)
+    response = http_client.request("PUT", "/pet", json=pet_data)
     
     if response.status_code in (400, 404, 500):
         try:
@@ -87,10 +85,12 @@ def test_update_pet_without_id(pet_api: PetApi):
             pytest.fail(f"API returned 200 but response doesn't match Pet contract: {e}")
 
 
-def test_update_nonexistent_pet(pet_api: PetApi):
+def test_update_nonexistent_pet(http_client: HttpClient, pet_cleanup: PetCleanup):
     pet = generate_pet(pet_id=999999999)
     
-    response = HttpClient().request("PUT", "/pet", json=pet.model_dump())
+    response = http_client.request("PUT", "/pet", json=pet.model_dump())
+    # Some servers upsert on PUT.
+    pet_cleanup.track(pet.id)
     
     if response.status_code == 404:
         try:
@@ -101,9 +101,8 @@ def test_update_nonexistent_pet(pet_api: PetApi):
             pass
 
 
-def test_find_by_status_invalid_status(pet_api: PetApi):
-    client = HttpClient()
-    response = client.request("GET", "/pet/findByStatus", params={"status": "invalid_status"})
+def test_find_by_status_invalid_status(http_client: HttpClient):
+    response = http_client.request("GET", "/pet/findByStatus", params={"status": "invalid_status"})
     
     if response.status_code == 400:
         try:
@@ -1,5 +1,6 @@
 import pytest
 from src.api.pet_api import PetApi, PetNotFoundError
+from src.utils.cleanup import PetCleanup
 from src.utils.data_factory import generate_pet
 
 
@@ -28,7 +29,7 @@ def test_create_get_update_delete_flow(pet_api: PetApi):
         pet_api.get_pet(pet.id)
 
 
-def test_create_pet_with_all_fields(pet_api: PetApi):
+def test_create_pet_with_all_fields(pet_api: PetApi, pet_cleanup: PetCleanup):
     from src.models.pet import Category, Tag
     
     category = Category(id=1, name="Dogs")
@@ -41,20 +42,19 @@ def test_create_pet_with_all_fields(pet_api: PetApi):
     )
     
     created = pet_api.create_pet(pet)
+    pet_cleanup.track(created.id)
     assert created.category is not None
     assert created.category.name == "Dogs"
     assert created.tags is not None
     assert len(created.tags) == 2
 
 
-def test_find_by_status(pet_api: PetApi):
+def test_find_by_status(pet_api: PetApi, pet_cleanup: PetCleanup):
     pet = generate_pet(status="available")
     created = pet_api.create_pet(pet)
+    pet_cleanup.track(created.id)
     
-    try:
-        pets = pet_api.find_by_status("available")
-        assert len(pets) > 0
-        assert any(p.id == created.id for p in pets)
-    finally:
-        pet_api.delete_pet(created.id)
+    pets = pet_api.find_by_status("available")
+    assert len(pets) > 0
+    assert any(p.id == created.id for p in pets)
 
@@ -0,0 +1,100 @@
+import multiprocessing
+import time
+import pytest
+from src.http.circuit_breaker import CLOSED, CircuitBreakerRegistry
+from src.http.client import HttpClient
+from src.http.rate_limit import FileTokenBucket, RateLimitExceeded, RateLimiterRegistry, TokenBucket
+from src.http.retry import NO_RETRY
+from src.http.transport import WSGITransport
+from src.server.petstore_server import LocalPetstore, PetstoreApp
+
+# Assertions on wait times need the CPU to themselves.
+pytestmark = pytest.mark.serial
+
+
+def _drain(path: str, count: int) -> None:
+    bucket = FileTokenBucket("GET /pet/{id}", rate=20.0, path=path, burst=1)
+    for _ in range(count):
+        bucket.acquire()
+    bucket.close()
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    bucket = TokenBucket("GET /pet/{id}", rate=50.0, burst=2)
+    started = time.monotonic()
+    waits = [bucket.acquire() for _ in range(7)]
+    assert waits[:2] == [0.0, 0.0]
+    assert all(wait > 0 for wait in waits[2:])
+    assert time.monotonic() - started >= 5 / 50.0 * 0.9
+
+
+def test_token_bucket_fail_fast():
+    bucket = TokenBucket("GET /pet/{id}", rate=1.0, burst=1, blocking=False)
+    assert bucket.acquire() == 0.0
+    with pytest.raises(RateLimitExceeded) as error:
+        bucket.acquire()
+    assert error.value.endpoint == "GET /pet/{id}"
+    assert 0 < error.value.retry_in <= 1.0
+    with pytest.raises(RateLimitExceeded):
+        bucket.acquire(block=True, timeout=0.01)
+
+
+def test_registry_falls_back_to_shared_bucket():
+    registry = RateLimiterRegistry({"GET /pet/{id}": 5.0, "*": 1.0})
+    assert registry.get("GET /pet/{id}").rate == 5.0
+    assert registry.get("POST /pet") is registry.get("DELETE /pet/{id}")
+    assert RateLimiterRegistry({}).get("POST /pet") is None
+
+
+def test_file_bucket_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / "pet.bucket")
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_drain, args=(path, 5)) for _ in range(2)]
+    started = time.time()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+    # 10 tokens at 20/s with a burst of 1 cannot be handed out in under ~0.45s in total.
+    assert all(worker.exitcode == 0 for worker in workers)
+    assert time.time() - started >= 0.4
+
+
+def test_rate_limit_wait_is_reported_separately():
+    limiters = RateLimiterRegistry({"*": 20.0}, burst=1)
+    with LocalPetstore() as server, HttpClient(server.base_url, rate_limiters=limiters) as client:
+        client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+        response = client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+    assert response.timings.rate_limit_wait > 0.02
+    # The local stand-in answers in about a millisecond, so a total that included the wait would exceed it.
+    assert response.timings.total < response.timings.rate_limit_wait
+
+
+def test_rate_limited_request_does_not_take_the_half_open_probe():
+    breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=0.05)
+    limiters = RateLimiterRegistry({"*": 4.0}, burst=1, blocking=False)
+    transport = WSGITransport(PetstoreApp())
+    with HttpClient(
+        "http://petstore.local/v2", retry_policy=NO_RETRY, circuit_breakers=breakers, rate_limiters=limiters, transport=transport
+    ) as client:
+        breaker = breakers.get("GET /pet/findByStatus")
+        breaker.record_failure()
+        limiters.get("GET /pet/findByStatus").acquire()
+        time.sleep(0.06)
+        with pytest.raises(RateLimitExceeded):
+            client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+        time.sleep(0.25)
+        assert client.request("GET", "/pet/findByStatus", params={"status": "sold"}).status_code == 200
+        assert breaker.state == CLOSED
+
+
+def test_closing_the_client_closes_file_buckets(tmp_path):
+    limiters = RateLimiterRegistry({"*": 100.0}, directory=str(tmp_path))
+    with LocalPetstore() as server, HttpClient(server.base_url, rate_limiters=limiters) as client:
+        client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+        bucket = limiters.get("GET /pet/findByStatus")
+        assert bucket._fd is not None
+    assert bucket._fd is None
+    # A closed registry opens fresh buckets when used again.
+    assert limiters.get("GET /pet/findByStatus") is not bucket
+    limiters.close()
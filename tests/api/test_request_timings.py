@@ -0,0 +1,70 @@
+import socket
+import pytest
+from src.api.pet_api import PetApi
+from src.config.settings import settings
+from src.http.client import HttpClient
+from src.http.transport import create_transport
+from src.server.petstore_server import LocalPetstore
+from src.utils.cleanup import PetCleanup
+from src.utils.data_factory import generate_pet
+
+pytestmark = pytest.mark.skipif(settings.cassette_mode == "replay", reason="Replayed responses have no network timings")
+
+
+def test_timings_are_recorded_per_phase(isolated_client: HttpClient, pet_cleanup: PetCleanup):
+    api = PetApi(isolated_client)
+    parsed = []
+    isolated_client.add_hook("parsed", parsed.append)
+
+    created = api.create_pet(generate_pet())
+    pet_cleanup.track(created.id)
+    response = parsed[-1]
+    timings = response.timings
+    assert timings.ttfb > 0
+    assert timings.download >= 0
+    assert timings.validation > 0
+    assert timings.total >= timings.ttfb
+    assert response.json()["id"] == created.id
+    assert timings.decode is not None
+
+
+def test_reused_connection_skips_connect_phases():
+    # A pool of its own: on the shared one a concurrent test may hold the connection we want reused.
+    with HttpClient() as client:
+        if not client.transport.measures_connection:
+            pytest.skip(f"The {client.transport.name} transport does not measure connection phases")
+        client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+        response = client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+    assert response.timings.dns == 0.0
+    assert response.timings.connect == 0.0
+
+
+def test_hooks_fire_in_order(isolated_client: HttpClient):
+    events = []
+    isolated_client.add_hook("request", lambda method, url: events.append("request"))
+    isolated_client.add_hook("response", lambda response: events.append("response"))
+    isolated_client.add_hook("parsed", lambda response: events.append("parsed"))
+    PetApi(isolated_client).find_by_status("pending")
+    assert events == ["request", "response", "parsed"]
+
+    with pytest.raises(ValueError):
+        isolated_client.add_hook("unknown", print)
+
+
+@pytest.mark.parametrize("name", ["requests", "urllib3"])
+def test_connect_falls_back_to_later_resolved_addresses(name: str, monkeypatch):
+    # A dual-stack name whose first address refuses connections, like an unreachable IPv6 one.
+    getaddrinfo = socket.getaddrinfo
+
+    def resolve(host, port, *args, **kwargs):
+        if host != "petstore.test":
+            return getaddrinfo(host, port, *args, **kwargs)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port)) for address in ("127.0.0.2", "127.0.0.1")]
+
+    monkeypatch.setattr(socket, "getaddrinfo", resolve)
+    with LocalPetstore() as server, create_transport(name) as transport:
+        with HttpClient(f"http://petstore.test:{server.port}/v2", transport=transport) as client:
+            response = client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+    assert response.status_code == 200
+    assert response.timings.dns > 0
+    assert response.timings.connect > 0
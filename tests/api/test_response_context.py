@@ -0,0 +1,43 @@
+import pickle
+import pytest
+from src.http.response import ResponseContext
+
+
+def make_response(content: bytes, content_type: str = "application/json") -> ResponseContext:
+    return ResponseContext(
+        method="GET",
+        url="https://example.com/pet/1",
+        status_code=200,
+        headers={"Content-Type": content_type},
+        content=content,
+        elapsed=0.01
+    )
+
+
+def test_response_context_is_lazy_and_memoized():
+    response = make_response(b'{"id": 1, "name": "Rex"}')
+    assert isinstance(response.content, memoryview)
+    assert response.headers.get("content-type") == "application/json"
+
+    data = response.json()
+    assert data == {"id": 1, "name": "Rex"}
+    assert response.json() is data
+    assert response.text == '{"id": 1, "name": "Rex"}'
+
+
+def test_response_context_decodes_with_declared_charset():
+    response = make_response("\"caf\xe9\"".encode("latin-1"), "application/json; charset=ISO-8859-1")
+    assert response.text == "\"caf\xe9\""
+
+
+def test_response_context_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        make_response(b"").json()
+
+
+def test_response_context_has_no_instance_dict_and_pickles():
+    response = make_response(b"[]")
+    assert not hasattr(response, "__dict__")
+    restored = pickle.loads(pickle.dumps(response))
+    assert restored.json() == []
+    assert restored.headers.get("CONTENT-TYPE") == "application/json"
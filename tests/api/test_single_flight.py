@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.api.async_pet_api import AsyncPetApi
+from src.api.pet_api import PetApi
+from src.http.async_client import AsyncHttpClient
+from src.http.client import HttpClient
+from src.http.single_flight import SingleFlight, flight_key
+from src.server.petstore_server import LocalPetstore
+from src.utils.data_factory import generate_pet
+
+
+def test_flight_key_only_covers_idempotent_reads():
+    assert flight_key("GET", "/pet/1", {"b": 2, "a": 1}) == flight_key("GET", "/pet/1", {"a": 1, "b": 2})
+    assert flight_key("GET", "/pet/1", headers={"X-Trace": "1"}) != flight_key("GET", "/pet/1")
+    assert flight_key("POST", "/pet") is None
+
+
+def test_single_flight_shares_errors_with_followers():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def failing_call():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", failing_call)
+        started.wait(5)
+        follower = executor.submit(flight.do, "key", failing_call)
+        while flight.merged == 0:
+            time.sleep(0.001)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+    assert flight.merged == 1
+
+
+def test_concurrent_get_pet_calls_share_one_request():
+    with LocalPetstore(latency=0.2) as server, HttpClient(server.base_url, single_flight=True) as client:
+        api = PetApi(client)
+        created = api.create_pet(generate_pet())
+        sent = []
+        client.add_hook("request", lambda method, url: sent.append(url))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            pets = list(executor.map(lambda _: api.get_pet(created.id), range(8)))
+
+        assert all(pet == created for pet in pets)
+        assert len(sent) == 1
+        assert client.single_flight.merged == 7
+
+
+def test_concurrent_async_reads_share_one_request():
+    async def scenario(base_url: str):
+        async with AsyncHttpClient(base_url, single_flight=True) as client:
+            api = AsyncPetApi(client)
+            await api.create_pet(generate_pet(status="pending"))
+            results = await asyncio.gather(*(api.find_by_status("pending") for _ in range(8)))
+            return results, client.single_flight.merged
+
+    with LocalPetstore(latency=0.2) as server:
+        results, merged = asyncio.run(scenario(server.base_url))
+    assert merged == 7
+    assert all(result == results[0] for result in results)
@@ -0,0 +1,115 @@
+import asyncio
+import socket
+import pytest
+import requests
+from src.api.pet_api import PetApi, PetNotFoundError
+from src.http.circuit_breaker import CircuitBreakerRegistry
+from src.http.client import HttpClient
+from src.http.retry import NO_RETRY, RetryPolicy
+from src.http.transport import ASGITransport, WSGITransport, create_transport
+from src.server.petstore_app import PetstoreApp
+from src.server.petstore_server import LocalPetstore
+from src.utils.data_factory import generate_pet
+
+NETWORK_TRANSPORTS = ["requests", "urllib3", "httpx", "http2"]
+
+
+class PetstoreASGIApp:
+    def __init__(self, app: PetstoreApp):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        status, payload = self.app.handle(scope["method"], scope["path"], scope["query_string"].decode(), body)
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": payload})
+
+
+def exercise(api: PetApi) -> None:
+    created = api.create_pet(generate_pet(status="pending"))
+    assert api.get_pet(created.id) == created
+    assert created.id in [pet.id for pet in api.find_by_status("pending")]
+    assert [pet.id for pet in api.iter_by_status("pending", chunk_size=7)] == [pet.id for pet in api.find_by_status("pending")]
+    api.delete_pet(created.id)
+    with pytest.raises(PetNotFoundError):
+        api.get_pet(created.id)
+
+
+@pytest.mark.parametrize("name", NETWORK_TRANSPORTS)
+def test_network_transports_share_response_context(name: str):
+    try:
+        transport = create_transport(name)
+    except ImportError as e:
+        pytest.skip(str(e))
+    with transport, LocalPetstore() as server, HttpClient(server.base_url, transport=transport) as client:
+        exercise(PetApi(client))
+        response = client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+        assert response.headers["content-type"] == "application/json"
+        assert response.timings.ttfb > 0
+
+
+def test_wsgi_transport_calls_app_without_sockets():
+    app = PetstoreApp()
+    with HttpClient("http://petstore.local/v2", transport=WSGITransport(app)) as client:
+        exercise(PetApi(client))
+        response = client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+    assert response.timings.dns is None
+    assert response.timings.ttfb > 0
+
+
+def test_asgi_transport_calls_app_without_sockets():
+    app = PetstoreApp()
+    with ASGITransport(PetstoreASGIApp(app)) as transport, HttpClient("http://petstore.local/v2", transport=transport) as client:
+        exercise(PetApi(client))
+    assert app.pets == {}
+
+
+class SlowOnceASGIApp(PetstoreASGIApp):
+    delay = 1.0
+
+    async def __call__(self, scope, receive, send):
+        delay, self.delay = self.delay, 0.0
+        await asyncio.sleep(delay)
+        await super().__call__(scope, receive, send)
+
+
+def test_asgi_timeout_is_retried_and_counted_like_network_timeouts():
+    app, breakers = SlowOnceASGIApp(PetstoreApp()), CircuitBreakerRegistry(failure_threshold=5)
+    retry_once = RetryPolicy(max_retries=1, backoff_factor=0.0)
+    with ASGITransport(app) as transport:
+        with HttpClient("http://petstore.local/v2", timeout=0.1, retry_policy=NO_RETRY, circuit_breakers=breakers, transport=transport) as client:
+            with pytest.raises(requests.Timeout):
+                client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+            assert breakers.get("GET /pet/findByStatus").failures == 1
+        app.delay = 1.0
+        with HttpClient("http://petstore.local/v2", timeout=0.1, retry_policy=retry_once, transport=transport) as client:
+            response = client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+            assert (response.status_code, response.retries) == (200, 1)
+
+
+@pytest.mark.parametrize("name", ["requests", "urllib3", "httpx"])
+def test_refused_connection_is_reported_as_not_sent(name: str):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    with create_transport(name) as transport, HttpClient(f"http://127.0.0.1:{port}/v2", retry_policy=NO_RETRY, transport=transport) as client:
+        with pytest.raises(requests.ConnectionError) as error:
+            client.request("POST", "/pet", content=b"{}")
+        assert not client.transport.was_sent(error.value)
+
+
+def test_closing_a_client_leaves_a_shared_transport_open():
+    try:
+        transport = create_transport("httpx")
+    except ImportError as e:
+        pytest.skip(str(e))
+    with transport, LocalPetstore() as server:
+        with HttpClient(server.base_url, transport=transport) as client:
+            client.request("GET", "/pet/findByStatus", params={"status": "sold"})
+        with HttpClient(server.base_url, transport=transport) as client:
+            assert client.request("GET", "/pet/findByStatus", params={"status": "sold"}).status_code == 200
@@ -0,0 +1,118 @@
+import json
+from itertools import islice
+import pytest
+from src.api.pet_api import PetApi
+from src.contracts.modes import ValidationMode
+from src.contracts.validators import ContractViolationError, compiled_validator, parse_json_as
+from src.http.client import HttpClient
+from src.http.response import ResponseContext
+from src.http.transport import WSGITransport
+from src.models.pet import Category, Pet, Tag
+from src.server.petstore_app import PetstoreApp
+
+
+def make_response(body, content_type: str = "application/json") -> ResponseContext:
+    return ResponseContext(
+        method="GET",
+        url="https://petstore.swagger.io/v2/pet/findByStatus",
+        status_code=200,
+        headers={"Content-Type": content_type},
+        content=json.dumps(body).encode("utf-8")
+    )
+
+
+def pet_dict(pet_id: int, **fields) -> dict:
+    return {"id": pet_id, "name": f"pet-{pet_id}", "photoUrls": [], "status": "sold", **fields}
+
+
+def test_parse_validation_modes():
+    assert str(ValidationMode.parse("full")) == "full"
+    assert str(ValidationMode.parse("sampled(0.25)")) == "sampled(0.25)"
+    assert str(ValidationMode.parse("first-100")) == "first-100"
+    assert str(ValidationMode.parse("off-but-structural")) == "off-but-structural"
+    with pytest.raises(ValueError):
+        ValidationMode.parse("sampled(2)")
+    with pytest.raises(ValueError):
+        ValidationMode.parse("sometimes")
+
+
+def test_first_n_validates_only_the_first_objects_of_each_response():
+    mode = ValidationMode.parse("first-3")
+    assert mode.plan(2) == [True, True]
+    assert mode.plan(4) == [True, True, True, False]
+    assert mode.plan(1) == [True]
+    assert list(islice(mode.iter_plan(), 5)) == [True, True, True, False, False]
+    assert list(islice(mode.iter_plan(), 2)) == [True, True]
+
+
+def test_structural_mode_builds_nested_models_without_validation():
+    data = pet_dict(1, category={"id": 1, "name": "Dogs"}, tags=[{"id": 2, "name": "cute"}])
+    pet = compiled_validator(Pet).construct(data)
+    assert isinstance(pet.category, Category)
+    assert isinstance(pet.tags[0], Tag)
+    assert pet == Pet.model_validate(data)
+
+    response = make_response(pet_dict(1, status="lost"))
+    assert parse_json_as(Pet, response, ValidationMode.parse("off-but-structural")).status == "lost"
+    assert tuple(response.validation) == ("off-but-structural", 0, 1)
+    with pytest.raises(ContractViolationError, match="Expected Pet object"):
+        parse_json_as(Pet, make_response([]), ValidationMode.parse("off-but-structural"))
+    with pytest.raises(ContractViolationError, match="Expected JSON Content-Type"):
+        parse_json_as(Pet, make_response({}, "text/html"), ValidationMode.parse("off-but-structural"))
+
+
+def test_list_modes_record_what_was_checked():
+    body = [pet_dict(pet_id) for pet_id in range(100)] + [pet_dict(100, status="lost")]
+    api = PetApi(HttpClient("http://petstore.local/v2", transport=WSGITransport(PetstoreApp())), validation="first-10")
+
+    response = make_response(body)
+    pets = api._parse_pet_list(response)
+    assert len(pets) == 101
+    assert tuple(response.validation) == ("first-10", 10, 101)
+
+    api.validation = ValidationMode.parse("sampled(1)")
+    with pytest.raises(ContractViolationError) as error:
+        api._parse_pet_list(make_response(body))
+    assert [(item.index, item.id) for item in error.value.item_errors] == [(100, 100)]
+    assert error.value.item_errors[0].errors[0]["loc"] == ("status",)
+
+    api.validation = ValidationMode("sampled", rate=0.5, seed=1)
+    response = make_response(body[:100])
+    api._parse_pet_list(response)
+    assert 20 < response.validation.checked < 80
+
+
+@pytest.mark.parametrize("mode", ["full", "off-but-structural", "sampled(0.5)", "first-10"])
+def test_every_list_mode_checks_the_content_type(mode):
+    def html_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/html")])
+        return [json.dumps([pet_dict(1)]).encode("utf-8")]
+
+    api = PetApi(HttpClient("http://petstore.local/v2", transport=WSGITransport(html_app)), validation=mode)
+    with pytest.raises(ContractViolationError, match="Expected JSON Content-Type"):
+        api._parse_pet_list(make_response([pet_dict(1)], "text/html"))
+    with pytest.raises(ContractViolationError, match="Expected JSON Content-Type"):
+        next(api.iter_by_status("sold"))
+
+
+def test_pet_api_records_mode_on_each_response():
+    app = PetstoreApp(payload_size=50)
+    with HttpClient("http://petstore.local/v2", transport=WSGITransport(app)) as client:
+        parsed = []
+        client.add_hook("parsed", parsed.append)
+        api = PetApi(client, validation="off-but-structural")
+        assert len(api.find_by_status("sold")) == 50
+        assert tuple(parsed[-1].validation) == ("off-but-structural", 0, 50)
+        assert len(list(api.iter_by_status("sold"))) == 50
+        assert tuple(parsed[-1].validation) == ("off-but-structural", 0, 50)
+
+        api = PetApi(client, validation="first-10")
+        for _ in range(2):
+            assert len(list(api.iter_by_status("sold"))) == 50
+            assert tuple(parsed[-1].validation) == ("first-10", 10, 50)
+            assert parsed[-1].timings.validation > 0
+        assert len(list(islice(api.iter_by_status("sold"), 5))) == 5
+        assert tuple(parsed[-1].validation) == ("first-10", 5, 5)
+
+        PetApi(client, validation="full").find_by_status("sold")
+        assert tuple(parsed[-1].validation) == ("full", 50, 50)
@@ -1,14 +1,179 @@
+import random
+import warnings
 import pytest
 from src.api.pet_api import PetApi
+from src.config.settings import settings
 from src.http.client import HttpClient
+from src.http.transport import TRANSPORTS, create_transport
+from src.metrics.registry import registry
+from src.runner.concurrency import ConcurrentRunner
+from src.runner.distributed import Coordinator, Worker
+from src.server.petstore_server import LocalPetstore
+from src.utils.cleanup import PetCleanup
+from src.utils.id_allocator import PREFIX_BITS, IdAllocator, set_allocator
 
 
-@pytest.fixture
-def http_client():
-    return HttpClient()
+def pytest_addoption(parser):
+    parser.addoption(
+        "--cassette-mode",
+        action="store",
+        default=settings.cassette_mode,
+        choices=["off", "record", "replay"],
+        help="Record API exchanges to a cassette, or replay them without network"
+    )
+    parser.addoption(
+        "--cassette",
+        action="store",
+        default=settings.cassette_path,
+        help="Cassette file used by --cassette-mode"
+    )
+    parser.addoption(
+        "--local-petstore",
+        action="store_true",
+        default=False,
+        help="Run API tests against an in-process Petstore stand-in instead of settings.base_url"
+    )
+    parser.addoption(
+        "--transport",
+        action="store",
+        default=settings.transport,
+        choices=sorted(TRANSPORTS),
+        help="HTTP backend used by HttpClient"
+    )
+    parser.addoption(
+        "--validation-mode",
+        action="store",
+        default=settings.validation_mode,
+        help="Contract validation mode for PetApi: full, sampled(rate), first-N or off-but-structural"
+    )
+    parser.addoption(
+        "--concurrency",
+        action="store",
+        type=int,
+        default=1,
+        help="Run tests on this many threads in one process; tests marked serial run afterwards one at a time"
+    )
+    parser.addoption(
+        "--dist-workers",
+        action="store",
+        type=int,
+        default=0,
+        help="Coordinate a distributed run and start this many worker processes on this machine"
+    )
+    parser.addoption(
+        "--dist-remote",
+        action="store",
+        type=int,
+        default=0,
+        help="Coordinate a distributed run and plan for this many workers started elsewhere with --dist-connect"
+    )
+    parser.addoption(
+        "--dist-listen",
+        action="store",
+        default="127.0.0.1:0",
+        help="HOST:PORT the coordinator accepts workers on; use 0.0.0.0 and a fixed port for remote workers"
+    )
+    parser.addoption(
+        "--dist-connect",
+        action="store",
+        default=None,
+        help="Run as a worker of the coordinator at HOST:PORT"
+    )
+    parser.addoption(
+        "--metrics-dir",
+        action="store",
+        default=None,
+        help="Collect request metrics and write metrics.prom and metrics.json to this directory at session end"
+    )
 
 
-@pytest.fixture
+def pytest_configure(config):
+    settings.cassette_mode = config.getoption("--cassette-mode")
+    settings.cassette_path = config.getoption("--cassette")
+    settings.transport = config.getoption("--transport")
+    settings.validation_mode = config.getoption("--validation-mode")
+    settings.metrics_enabled = config.getoption("--metrics-dir") is not None
+    concurrency = config.getoption("--concurrency")
+    distributed = config.getoption("--dist-workers") or config.getoption("--dist-remote") or config.getoption("--dist-connect")
+    if (concurrency > 1 or distributed) and (settings.cassette_mode != "off" or config.getoption("usepdb")):
+        raise pytest.UsageError("--concurrency and --dist-* options cannot be combined with --cassette-mode or --pdb")
+    if concurrency > 1:
+        if distributed:
+            raise pytest.UsageError("--concurrency cannot be combined with --dist-* options")
+        config.pluginmanager.register(ConcurrentRunner(config, concurrency), "concurrent-runner")
+    if config.getoption("--dist-connect"):
+        config.pluginmanager.register(Worker(config, config.getoption("--dist-connect")), "dist-worker")
+    elif distributed:
+        config.pluginmanager.register(Coordinator(
+            config, config.getoption("--dist-workers"), config.getoption("--dist-remote"), config.getoption("--dist-listen")
+        ), "dist-coordinator")
+    if config.getoption("--local-petstore"):
+        config.local_petstore = LocalPetstore().start()
+        settings.base_url = config.local_petstore.base_url
+
+
+def pytest_sessionfinish(session):
+    metrics_dir = session.config.getoption("--metrics-dir")
+    if metrics_dir is not None:
+        registry.export(metrics_dir)
+
+
+def pytest_unconfigure(config):
+    local_petstore = getattr(config, "local_petstore", None)
+    if local_petstore is not None:
+        local_petstore.stop()
+
+
+@pytest.fixture(autouse=True)
+def deterministic_test_data(request):
+    # Recorded request bodies must match on replay, so generated pets and their ids are seeded per test.
+    if settings.cassette_mode != "off":
+        random.seed(request.node.nodeid)
+        set_allocator(IdAllocator(prefix=random.randrange(1, 1 << PREFIX_BITS), worker=0))
+
+
+@pytest.fixture(scope="session")
+def http_transport(request):
+    # One connection pool for the whole session, sized so --concurrency threads do not queue for it.
+    with create_transport(
+        pool_connections=settings.pool_connections,
+        pool_maxsize=max(settings.pool_maxsize, request.config.getoption("--concurrency")),
+        pool_block=settings.pool_block,
+        keepalive_timeout=settings.keepalive_timeout
+    ) as transport:
+        yield transport
+
+
+@pytest.fixture(scope="session")
+def http_client(http_transport):
+    # Shared by every test; tests that add hooks or instrument a client use isolated_client instead.
+    return HttpClient(transport=http_transport)
+
+
+@pytest.fixture(scope="session")
 def pet_api(http_client):
     return PetApi(http_client)
 
+
+@pytest.fixture
+def isolated_client(http_transport):
+    # A client of its own (hooks, metrics, circuit breakers) on the session's connection pool.
+    return HttpClient(transport=http_transport)
+
+
+@pytest.fixture(scope="session")
+def pet_cleanup(request, pet_api):
+    # Tests track the pets they create and leave them; all of them are deleted concurrently at session end.
+    # The journal lets a later session delete what a killed one left behind. A local stand-in dies with the
+    # session and replayed cassettes have no server, so neither needs it.
+    journaled = settings.cassette_mode == "off" and not request.config.getoption("--local-petstore")
+    cleanup = PetCleanup(pet_api, settings.cleanup_dir if journaled else None, settings.cleanup_concurrency)
+    cleanup.recover()
+    cleanup.install()
+    yield cleanup
+    try:
+        remaining = cleanup.cleanup()
+    finally:
+        cleanup.uninstall()
+    if remaining:
+        warnings.warn(f"{len(remaining)} pets created by tests could not be deleted: {remaining[:10]}")